@@ -0,0 +1,285 @@
+import statistics
+import threading
+from array import array
+from datetime import date, datetime
+from types import SimpleNamespace
+
+try:
+    import numpy as np
+except ImportError:  # Optional: the stdlib array path gives the same results, just slower
+    np = None
+
+from core import STATUSES, resolve_date
+
+# Funnel flags: a row keeps the furthest stage it ever reached, not just its current status
+RESPONDED, INTERVIEWED, ACCEPTED = 1, 2, 4
+STAGE_FLAGS = {
+    "Applied": 0,
+    "Interview": RESPONDED | INTERVIEWED,
+    "Accepted": RESPONDED | INTERVIEWED | ACCEPTED,
+    "Rejected": RESPONDED,
+}
+STATUS_CODES = {name: code for code, name in enumerate(STATUSES)}
+
+
+class Columns:
+    """Array-backed columns over the live rows of a log, one slot per row:
+    applied day (ordinal), status code, funnel flags, day of first response
+    (-1 if none) and company code. Kept current per insert, status change,
+    edit and delete, like the store's StatsView; a deleted row's slot is
+    taken over by the last one, so the columns never have gaps. Applying a
+    change twice leaves them as applying it once."""
+
+    def __init__(self, rows, events, today):
+        self.today = today  # Dates without a year are resolved against it
+        self.positions = {}  # ID -> slot
+        self.ids = []  # Slot -> ID
+        self.companies = []
+        self.company_codes = {}  # Lowercased company name -> code
+        self.applied = array('i')
+        self.status = array('b')
+        self.flags = array('b')
+        self.response = array('i')
+        self.company = array('i')
+        for row in rows:
+            self.add(row)
+        for row_id, old, new, stamp in events:
+            position = self.positions.get(row_id)
+            if position is None:
+                continue
+            try:
+                day = datetime.fromisoformat(stamp).date()
+            except ValueError:
+                day = None
+            self._reached(position, new, day)
+
+    @property
+    def size(self):
+        return len(self.ids)
+
+    def _day(self, day_month):
+        try:
+            return resolve_date(day_month, self.today).toordinal()
+        except ValueError:
+            return self.today.toordinal()
+
+    def _company(self, name):
+        key = name.strip().lower()
+        if key not in self.company_codes:
+            self.company_codes[key] = len(self.companies)
+            self.companies.append(name.strip())
+        return self.company_codes[key]
+
+    def _reached(self, position, status, day):
+        self.flags[position] |= STAGE_FLAGS.get(status, 0)
+        if self.response[position] < 0 and status != "Applied" and day is not None:
+            self.response[position] = day.toordinal()
+
+    def add(self, row):
+        if row[0] in self.positions:
+            self.edit(row)
+            return
+        self.positions[row[0]] = len(self.ids)
+        self.ids.append(row[0])
+        self.applied.append(self._day(row[1]))
+        self.status.append(STATUS_CODES.get(row[4], 0))
+        self.flags.append(STAGE_FLAGS.get(row[4], 0))
+        self.response.append(-1)
+        self.company.append(self._company(row[2]))
+
+    def edit(self, row):
+        position = self.positions.get(row[0])
+        if position is not None:
+            self.applied[position] = self._day(row[1])
+            self.company[position] = self._company(row[2])
+
+    def change_status(self, row_id, status, day):
+        position = self.positions.get(row_id)
+        if position is not None:
+            self.status[position] = STATUS_CODES.get(status, 0)
+            self._reached(position, status, day)
+
+    def remove(self, row_id):
+        position = self.positions.pop(row_id, None)
+        if position is None:
+            return
+        for column in (self.applied, self.status, self.flags, self.response, self.company):
+            column[position] = column[-1]
+            column.pop()
+        moved = self.ids.pop()
+        if moved != row_id:
+            self.ids[position] = moved
+            self.positions[moved] = position
+
+    def frozen(self):
+        """A copy of the columns as they are now, for summarize() to work on
+        outside the store lock: numpy arrays if numpy is installed"""
+        if np is not None:
+            copy = {name: np.array(getattr(self, name), dtype=dtype) for name, dtype in
+                    (('applied', np.int32), ('status', np.int8), ('flags', np.int8),
+                     ('response', np.int32), ('company', np.int32))}
+        else:
+            copy = {name: array(getattr(self, name).typecode, getattr(self, name))
+                    for name in ('applied', 'status', 'flags', 'response', 'company')}
+        return SimpleNamespace(size=self.size, companies=list(self.companies), **copy)
+
+
+def rate(part, whole):
+    return round(part / whole * 100, 1) if whole else 0.0
+
+
+def summarize(columns, top_companies=50):
+    """Funnel, time to response, weekly cohorts and per-company response rates"""
+    if np is not None:
+        return _summarize_numpy(columns, top_companies)
+    return _summarize_array(columns, top_companies)
+
+
+def _report(total, responded, interviewed, accepted, current, response_days,
+            week_starts, week_counts, company_counts, companies, top_companies):
+    cohorts = []
+    for start, (applied, resp, interviews) in zip(week_starts, week_counts):
+        if applied:
+            cohorts.append({"week": date.fromordinal(start).isoformat(), "applied": applied,
+                            "responded": resp, "interviews": interviews,
+                            "response_rate": rate(resp, applied)})
+    # A company whose rows were all deleted or renamed keeps its code, with no rows
+    ranked = sorted((item for item in company_counts if item[1]), key=lambda item: (-item[1], companies[item[0]].lower()))
+    return {
+        "total": total,
+        "current": current,
+        "funnel": [
+            {"stage": "Applied", "count": total, "rate": 100.0 if total else 0.0},
+            {"stage": "Responded", "count": responded, "rate": rate(responded, total)},
+            {"stage": "Interview", "count": interviewed, "rate": rate(interviewed, total)},
+            {"stage": "Accepted", "count": accepted, "rate": rate(accepted, total)},
+        ],
+        "median_days_to_response": response_days,
+        "weekly_cohorts": cohorts,
+        "companies": [{"company": companies[code], "applied": applied, "responded": resp,
+                       "response_rate": rate(resp, applied)}
+                      for code, applied, resp in ranked[:top_companies]],
+    }
+
+
+def _summarize_numpy(columns, top_companies):
+    total = columns.size
+    responded_mask = (columns.flags & RESPONDED) != 0
+    interviewed_mask = (columns.flags & INTERVIEWED) != 0
+    current = np.bincount(columns.status, minlength=len(STATUSES)) if total else [0] * len(STATUSES)
+
+    answered = columns.response >= 0
+    waits = np.maximum(columns.response[answered] - columns.applied[answered], 0)
+    median = float(np.median(waits)) if waits.size else None
+
+    week_starts, week_counts = [], []
+    if total:
+        monday = int(columns.applied.min()) - date.fromordinal(int(columns.applied.min())).weekday()
+        week = (columns.applied - monday) // 7
+        weeks = int(week.max()) + 1
+        applied = np.bincount(week, minlength=weeks)
+        resp = np.bincount(week, weights=responded_mask, minlength=weeks).astype(int)
+        interviews = np.bincount(week, weights=interviewed_mask, minlength=weeks).astype(int)
+        week_starts = [monday + 7 * i for i in range(weeks)]
+        week_counts = zip(applied.tolist(), resp.tolist(), interviews.tolist())
+
+    company_counts = []
+    if total:
+        per_company = np.bincount(columns.company, minlength=len(columns.companies))
+        per_company_resp = np.bincount(columns.company, weights=responded_mask,
+                                       minlength=len(columns.companies)).astype(int)
+        company_counts = list(zip(range(len(columns.companies)), per_company.tolist(), per_company_resp.tolist()))
+
+    return _report(total, int(responded_mask.sum()), int(interviewed_mask.sum()),
+                   int(((columns.flags & ACCEPTED) != 0).sum()),
+                   dict(zip(STATUSES, (int(c) for c in current))), median,
+                   week_starts, week_counts, company_counts, columns.companies, top_companies)
+
+
+def _summarize_array(columns, top_companies):
+    total = columns.size
+    current = [0] * len(STATUSES)
+    responded = interviewed = accepted = 0
+    waits = []
+    monday = 0
+    weeks = {}
+    per_company = [0] * len(columns.companies)
+    per_company_resp = [0] * len(columns.companies)
+    if total:
+        first = min(columns.applied)
+        monday = first - date.fromordinal(first).weekday()
+    for applied, status, flags, response, company in zip(columns.applied, columns.status, columns.flags,
+                                                         columns.response, columns.company):
+        current[status] += 1
+        was_responded = flags & RESPONDED != 0
+        responded += was_responded
+        interviewed += flags & INTERVIEWED != 0
+        accepted += flags & ACCEPTED != 0
+        if response >= 0:
+            waits.append(max(response - applied, 0))
+        counts = weeks.setdefault((applied - monday) // 7, [0, 0, 0])
+        counts[0] += 1
+        counts[1] += was_responded
+        counts[2] += flags & INTERVIEWED != 0
+        per_company[company] += 1
+        per_company_resp[company] += was_responded
+    week_range = range(max(weeks) + 1) if weeks else range(0)
+    return _report(total, responded, interviewed, accepted, dict(zip(STATUSES, current)),
+                   float(statistics.median(waits)) if waits else None,
+                   [monday + 7 * i for i in week_range],
+                   [tuple(weeks.get(i, (0, 0, 0))) for i in week_range],
+                   list(zip(range(len(columns.companies)), per_company, per_company_resp)),
+                   columns.companies, top_companies)
+
+
+class Analytics:
+    """Analytics for one store. The columns follow the store's events, so
+    they're only rebuilt from the log when another process wrote to it or
+    the day changed; summaries are cached until the next change."""
+
+    def __init__(self, store):
+        self.store = store
+        self.lock = threading.Lock()  # One summary at a time
+        self.columns = None  # Built on first use
+        self.seen = None  # Store version the columns reflect
+        self.updates = 0  # Events applied to the columns, so a cached summary never misses one
+        self.cached_version = None
+        self.frozen = None  # Copy of the columns the cached summaries were computed from
+        self.results = {}
+        store.listeners.append(self._on_event)
+
+    def _on_event(self, event):
+        with self.store.lock:
+            if self.columns is None:
+                return
+            if event['type'] == 'insert':
+                self.columns.add(event['row'])
+            elif event['type'] == 'status':
+                self.columns.change_status(event['id'], event['status'], date.today())
+            elif event['type'] == 'edit':
+                self.columns.edit(event['row'])
+            elif event['type'] == 'delete':
+                self.columns.remove(event['id'])
+            self.seen = self.store.version
+            self.updates += 1
+
+    def summary(self, top_companies=50, today=None):
+        today = today or date.today()
+        with self.lock:
+            with self.store.lock:
+                # Picks up other processes' writes first, so the key covers them
+                version = self.store.current_version()
+                if self.columns is None or version != self.seen or self.columns.today != today:
+                    rows = self.store.read()[::-1]  # Oldest first: a company keeps its first spelling
+                    self.columns = Columns(rows, self.store.status_events(), today)
+                    self.seen = version
+                key = (version, self.updates, today)
+                if key != self.cached_version:
+                    self.frozen = self.columns.frozen()
+                    self.cached_version = key
+                    self.results = {}
+            if top_companies not in self.results:
+                result = summarize(self.frozen, top_companies)
+                result["engine"] = "numpy" if np is not None else "array"
+                self.results[top_companies] = result
+            return self.results[top_companies]
@@ -0,0 +1,110 @@
+CHUNK_BITS = 16  # Each container covers 65536 consecutive IDs
+
+
+def popcount(value):
+    return bin(value).count('1')
+
+
+class Bitmap:
+    """Compressed set of non-negative integers (row IDs), roaring style: IDs are
+    split into chunks of 65536, and each non-empty chunk is one Python int used
+    as a bitset. Empty chunks take no space, and AND/OR/AND NOT work a whole
+    chunk at a time."""
+
+    __slots__ = ('chunks',)
+
+    def __init__(self, values=()):
+        self.chunks = {}  # Chunk number -> bitset of the low 16 bits
+        for value in values:
+            self.add(value)
+
+    def add(self, value):
+        value = int(value)
+        key = value >> CHUNK_BITS
+        self.chunks[key] = self.chunks.get(key, 0) | (1 << (value & 0xFFFF))
+
+    def discard(self, value):
+        value = int(value)
+        key = value >> CHUNK_BITS
+        bits = self.chunks.get(key, 0) & ~(1 << (value & 0xFFFF))
+        if bits:
+            self.chunks[key] = bits
+        else:
+            self.chunks.pop(key, None)
+
+    def __contains__(self, value):
+        value = int(value)
+        return bool(self.chunks.get(value >> CHUNK_BITS, 0) >> (value & 0xFFFF) & 1)
+
+    def __len__(self):
+        return sum(popcount(bits) for bits in self.chunks.values())
+
+    def __bool__(self):
+        return bool(self.chunks)
+
+    def __iter__(self):
+        """IDs in ascending order"""
+        for key in sorted(self.chunks):
+            bits, base = self.chunks[key], key << CHUNK_BITS
+            while bits:
+                low = bits & -bits
+                yield base + low.bit_length() - 1
+                bits ^= low
+
+    def __reversed__(self):
+        for key in sorted(self.chunks, reverse=True):
+            bits, base = self.chunks[key], key << CHUNK_BITS
+            while bits:
+                high = bits.bit_length() - 1
+                yield base + high
+                bits ^= 1 << high
+
+    def __and__(self, other):
+        result = Bitmap()
+        small, large = sorted((self.chunks, other.chunks), key=len)
+        for key, bits in small.items():
+            both = bits & large.get(key, 0)
+            if both:
+                result.chunks[key] = both
+        return result
+
+    def __or__(self, other):
+        result = Bitmap()
+        result.chunks = dict(self.chunks)
+        for key, bits in other.chunks.items():
+            result.chunks[key] = result.chunks.get(key, 0) | bits
+        return result
+
+    def __sub__(self, other):
+        result = Bitmap()
+        for key, bits in self.chunks.items():
+            rest = bits & ~other.chunks.get(key, 0)
+            if rest:
+                result.chunks[key] = rest
+        return result
+
+    def __eq__(self, other):
+        return isinstance(other, Bitmap) and self.chunks == other.chunks
+
+    @classmethod
+    def union(cls, bitmaps):
+        result = cls()
+        for bitmap in bitmaps:
+            for key, bits in bitmap.chunks.items():
+                result.chunks[key] = result.chunks.get(key, 0) | bits
+        return result
+
+    def to_state(self):
+        """JSON-ready: chunk number -> [lowest set bit, bitset shifted down to
+        it as hex], so a run of IDs costs its own length, not the chunk's"""
+        state = {}
+        for key, bits in self.chunks.items():
+            low = (bits & -bits).bit_length() - 1
+            state[str(key)] = [low, format(bits >> low, 'x')]
+        return state
+
+    @classmethod
+    def from_state(cls, state):
+        bitmap = cls()
+        bitmap.chunks = {int(key): int(bits, 16) << low for key, (low, bits) in state.items()}
+        return bitmap
@@ -0,0 +1,178 @@
+import math
+import re
+import threading
+from collections import Counter, defaultdict
+
+# Dropped from the end of a name before comparing: "Google LLC" is "google"
+LEGAL_SUFFIXES = {"inc", "llc", "ltd", "limited", "corp", "corporation", "co", "company",
+                  "gmbh", "plc", "ag", "sa", "bv", "pvt", "private"}
+MIN_SIMILARITY = 0.5  # Dice coefficient over trigrams before two names are compared at all
+MAX_POSTINGS = 500  # Names sharing a trigram before it's treated as a stop-gram and never probed
+
+
+def normalize(name):
+    """Lowercase words without punctuation or a trailing legal suffix"""
+    words = re.findall(r'[a-z0-9]+', name.lower())
+    while len(words) > 1 and words[-1] in LEGAL_SUFFIXES:
+        words.pop()
+    return " ".join(words)
+
+
+def trigrams(key):
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def max_distance(key):
+    """Typos allowed in a name this long; none for short names, where one letter
+    usually means a different company"""
+    if len(key) < 5:
+        return 0
+    return 1 if len(key) < 9 else 2
+
+
+def bounded_distance(a, b, limit):
+    """Levenshtein distance between a and b, computed only within `limit` of the
+    diagonal; returns limit + 1 as soon as it must be larger than limit"""
+    far = limit + 1
+    if abs(len(a) - len(b)) > limit:
+        return far
+    previous = [j if j <= limit else far for j in range(len(b) + 1)]
+    for i, char in enumerate(a, 1):
+        current = [far] * (len(b) + 1)
+        current[0] = min(i, far)
+        low, high = max(1, i - limit), min(len(b), i + limit)
+        for j in range(low, high + 1):
+            cost = 0 if char == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost, far)
+        if min(current[low - 1:high + 1]) > limit:
+            return far
+        previous = current
+    return previous[len(b)]
+
+
+class TrigramIndex:
+    """Prefix-filtered inverted index from trigram to normalized names.
+
+    Each name's trigrams are ordered rarest first across all names, and only
+    the first few of them are indexed and probed: a name within max_edits
+    typos of another keeps all but 3 per typo of its trigrams, and one whose
+    Dice coefficient reaches min_similarity keeps a fixed share of them, so
+    two names that pass both tests always share one of those first few. A
+    length filter drops names too long or short to pass before anything is
+    compared (postings are kept per name length), and a trigram carried by
+    more than MAX_POSTINGS names is never probed. Finding near-duplicates of
+    a name thus visits a handful of short, rare postings instead of every
+    name sharing a common trigram with it."""
+
+    def __init__(self, keys=(), min_similarity=MIN_SIMILARITY, max_edits=max_distance):
+        self.min_similarity = min_similarity
+        self.max_edits = max_edits
+        self.grams = {key: trigrams(key) for key in keys}
+        frequency = Counter(gram for grams in self.grams.values() for gram in grams)
+        self.prefixes = {}
+        self.postings = defaultdict(list)  # (trigram, name length) -> names
+        for key, grams in self.grams.items():
+            ordered = sorted(grams, key=lambda gram: (frequency[gram], gram))
+            prefix = [gram for gram in ordered[:self._prefix_length(key, len(grams))]
+                      if frequency[gram] <= MAX_POSTINGS]
+            self.prefixes[key] = prefix
+            for gram in prefix:
+                self.postings[gram, len(key)].append(key)
+
+    def _prefix_length(self, key, size):
+        # Trigrams a match must share with key, at the least: all but 3 per
+        # typo, and size * t / (2 - t) for the Dice coefficient whatever the
+        # other name's size (the length filter in candidates() rules out the rest)
+        t = self.min_similarity
+        overlap = max(size - 3 * self.max_edits(key), math.ceil(size * t / (2 - t)))
+        return size - overlap + 1
+
+    def candidates(self, key):
+        """Names within key's max_edits in length whose trigram Dice
+        coefficient with key is at least min_similarity"""
+        grams = self.grams[key]
+        t = self.min_similarity
+        edits = self.max_edits(key)
+        low, high = len(grams) * t / (2 - t), len(grams) * (2 - t) / t
+        seen = {key}
+        result = []
+        for gram in self.prefixes[key]:
+            # Postings are split by name length, so only names of a length
+            # within reach are ever visited
+            for length in range(len(key) - edits, len(key) + edits + 1):
+                for other in self.postings.get((gram, length), ()):
+                    if other in seen:
+                        continue
+                    seen.add(other)
+                    other_grams = self.grams[other]
+                    if low <= len(other_grams) <= high and \
+                            2 * len(grams & other_grams) >= t * (len(grams) + len(other_grams)):
+                        result.append(other)
+        return result
+
+
+def cluster_companies(spellings):
+    """Group spellings of the same company. `spellings` maps each company name
+    as typed to its number of entries. Returns groups of two or more spellings,
+    biggest first, each with the most used spelling as its canonical name."""
+    by_key = defaultdict(Counter)
+    for name, count in spellings.items():
+        key = normalize(name)
+        if key:
+            by_key[key][name] += count
+    # Names under five letters never match anything (see max_distance)
+    index = TrigramIndex(key for key in by_key if max_distance(key))
+    parent = {key: key for key in by_key}
+
+    def find(key):
+        while parent[key] != key:
+            parent[key] = parent[parent[key]]
+            key = parent[key]
+        return key
+
+    for key in index.grams:
+        for other in index.candidates(key):
+            limit = min(max_distance(key), max_distance(other))
+            if limit and find(key) != find(other) and bounded_distance(key, other, limit) <= limit:
+                parent[find(other)] = find(key)
+
+    groups = defaultdict(Counter)
+    key_totals = {}  # Spelling -> entries under its normalized name, all spellings together
+    for key, names in by_key.items():
+        groups[find(key)].update(names)
+        for name in names:
+            key_totals[name] = sum(names.values())
+    result = []
+    for names in groups.values():
+        if len(names) < 2:
+            continue
+        # Most used first; on a tie prefer the most used normalized name (so
+        # "Google" beats a one-off "Gogle"), then a capitalized, shorter spelling
+        ranked = sorted(names.items(), key=lambda item: (-item[1], -key_totals[item[0]], item[0].islower(),
+                                                         len(item[0]), item[0]))
+        result.append({
+            "canonical": ranked[0][0],
+            "count": sum(names.values()),
+            "names": [{"name": name, "count": count} for name, count in ranked],
+        })
+    result.sort(key=lambda group: (-group["count"], group["canonical"].lower()))
+    return result
+
+
+class CompanyClusters:
+    """Company groups for one store, recomputed only when the log has changed"""
+
+    def __init__(self, store):
+        self.store = store
+        self.lock = threading.Lock()
+        self.cached_version = None
+        self.groups = []
+
+    def get(self):
+        with self.lock:
+            version = self.store.current_version()
+            if version != self.cached_version:
+                self.groups = cluster_companies(self.store.company_counts())
+                self.cached_version = version
+            return self.groups
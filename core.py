@@ -0,0 +1,1475 @@
+import csv
+import io
+import json
+import locale
+import logging
+import os
+import re
+import threading
+import time
+import zlib
+from collections import Counter
+from datetime import date, datetime, timedelta
+
+from bitmaps import Bitmap
+from durable import (BlockSums, WatchedFile, append_durably, atomic_write, complete_size, durable_replace,
+                     exclusive_lock, fsync_file, recover_tail_once, temp_file)
+
+HEADER = ["ID", "Date", "Company Name", "Applied Job Link", "Status"]  # Every row has these, in this order
+STATUSES = ["Applied", "Interview", "Accepted", "Rejected"]
+DATE_FORMAT = "%d-%m"
+DEFAULT_API_BASE = "http://localhost:8000"
+PROFILES_DIR = "profiles"
+PROFILE_NAME = re.compile(r'^[A-Za-z0-9_-]{1,64}$')
+COMPACT_RATIO = 0.3  # Dead records / all records on disk before the journal is folded in
+SNAPSHOT_FORMAT = 3  # Bump whenever the snapshot layout changes; older snapshots are rebuilt
+SNAPSHOT_BLOCK = 4096  # Tail bytes of each file checksummed to tell appends from rewrites
+SNAPSHOT_LAG = 1000  # Records replayed on top of the snapshot before it is rewritten
+RENDER_INTERVAL = 1.0  # Seconds between report renders while writes keep coming in
+TEXT_ENCODING = locale.getpreferredencoding(False)  # What the CSV files are read with in text mode
+
+
+class Schema:
+    """The log's columns: HEADER, then optional columns added over time, each
+    with a default. Kept in <name>.schema.json with a version that goes up
+    with every column added. Adding a column rewrites nothing: rows written
+    before it are shorter and read back padded with the defaults, and the
+    next compaction writes them out in full."""
+
+    def __init__(self, path):
+        self.path = path
+        self.version = 0
+        self.optional = []  # [name, default] per optional column, in order
+        self.file = WatchedFile(path)
+        self.load()
+
+    def load(self):
+        self.file.seen()
+        if self.file.signature is None:
+            self.version, self.optional = 0, []
+        else:
+            with open(self.path, 'r', encoding='utf-8') as file:
+                data = json.load(file)
+            self.version, self.optional = data['version'], data['columns']
+        self.columns = HEADER + [name for name, default in self.optional]
+        self.defaults = [""] * len(HEADER) + [default for name, default in self.optional]
+
+    def changed(self):
+        """Whether another process has added a column since we last loaded"""
+        return self.file.changed()
+
+    def pad(self, row):
+        """A copy of row with any columns it predates filled in with their defaults"""
+        if len(row) >= len(self.defaults):
+            return list(row)
+        return list(row) + self.defaults[len(row):]
+
+    def position(self, name):
+        try:
+            return self.columns.index(name)
+        except ValueError:
+            raise ValueError(f"Unknown column {name!r}, expected one of {', '.join(self.columns)}") from None
+
+    def add(self, name, default=""):
+        name = name.strip()
+        if not name or name in self.columns:
+            raise ValueError(f"Column {name!r} is empty or already exists")
+        data = {'version': self.version + 1, 'columns': self.optional + [[name, default]]}
+        replaced = self.file.rewrite(lambda file: json.dump(data, file), encoding='utf-8')
+        self.load()
+        if not replaced:
+            raise ValueError(f"Another process changed the columns while {name!r} was being added; try again")
+
+
+class LogStore:
+    """CSV-backed application log.
+
+    New entries are appended to the CSV. Edits and deletes are appended to a
+    journal next to it as overwrite ('put') and tombstone ('del') records.
+    Status changes are appended to an event log (id, old, new, timestamp)
+    that is never rewritten, so it doubles as the status history.
+
+    Everything is resolved on read through an in-memory ID index, which maps
+    each ID to where its latest version sits on disk, and a StatsView of
+    running counters is kept alongside it. Rows themselves are cached as
+    they're read. Once enough records are dead (superseded or deleted), a
+    background compaction folds the journal and the newer events back into
+    the CSV, newest entries first, and moves the events checkpoint so startup
+    only replays what came after.
+
+    The index and the StatsView are saved to a snapshot file together with the
+    size, mtime and a tail checksum of each file. Startup loads the snapshot
+    and replays only records appended since, without reading a single row;
+    rows are read from disk when first asked for, all in one pass when every
+    row is wanted. The same catch-up applies when another process appends
+    while we're running. A file that was rewritten rather than appended to
+    means a full rebuild.
+
+    Rows may be shorter than the Schema when they predate an optional column;
+    every row handed out is padded to the full width.
+
+    Appends are a single fsynced write, and files are only ever rewritten by
+    renaming a fsynced temp file over them (see durable.py). A crash can
+    therefore only leave a torn last line, which _verify_tail moves aside on
+    the first load in the next process after reading just the end of each
+    file. Later loads take a line without a newline for another process's
+    append in progress and read up to the line before it."""
+
+    def __init__(self, csv_file="data_log.csv", compact_ratio=COMPACT_RATIO, background=True):
+        self.csv_file = csv_file
+        base = os.path.splitext(csv_file)[0]
+        self.journal_file = base + ".journal.csv"
+        self.events_file = base + ".events.csv"
+        # Byte offset into the event log up to which the CSV already reflects statuses
+        self.checkpoint_file = base + ".checkpoint.json"
+        self.snapshot_file = base + ".snapshot.json"
+        self.compact_lock_file = base + ".compact.lock"  # Held by whichever process is compacting
+        self.schema = Schema(base + ".schema.json")
+        self.sums = BlockSums(base + ".sums.json")  # Off until `verify` turns it on
+        self.compact_ratio = compact_ratio
+        self.background = background  # Compact on a worker thread instead of inline
+        self.lock = threading.RLock()
+        self.version = 0  # Bumped on every write
+        # Called with an event dict after each change, from whichever thread made it
+        self.listeners = []
+        # ID -> byte offset of its latest version in the CSV, or ~offset in the
+        # journal, oldest first; loaded on first use
+        self.index = None
+        self.rows = {}  # ID -> row, for the rows read so far; complete after a rebuild
+        # ID -> status for rows whose status changed after their row was last
+        # written out, so a row read back from disk gets its current one
+        self.changed_status = {}
+        self.next_id = 1  # Never reused, even after deletes
+        self.base_records = 0
+        self.journal_records = 0
+        self.pending_events = 0  # Status events newer than the checkpoint
+        self.checkpoint = 0  # Events offset the index was built against
+        self.view = StatsView()
+        self.signature = None  # Size/mtime of the three files as of our last read or write
+        self.files = None  # The same plus a tail checksum, to resume reading where we left off
+        self.compacting = None  # IDs touched while a compaction is running
+        self.loads = 0  # Full loads so far; a compaction that saw one happen is stale
+        self.snapshot_pending = False
+        self.snapshot_lock = threading.Lock()  # One snapshot write at a time
+        self.snapshot_version = -1  # Store version of the last snapshot written
+
+    def initialize(self):
+        """Create the CSV file with its header if it doesn't exist yet"""
+        with self.lock:
+            if not os.path.exists(self.csv_file):
+                with atomic_write(self.csv_file, newline='') as file:
+                    csv.writer(file).writerow(self.schema.columns)
+                self.sums.update([self.csv_file])
+                self.index = None
+
+    def _signature(self):
+        stats = []
+        for path in (self.csv_file, self.journal_file, self.events_file):
+            try:
+                stat = os.stat(path)
+                stats.append((stat.st_size, stat.st_mtime_ns))
+            except FileNotFoundError:
+                stats.append(None)
+        return tuple(stats)
+
+    def _file_states(self):
+        """[size, mtime, crc32 of the last block] per file, None for missing files.
+        The size stops short of a last line still being written, so reading
+        resumes at its start once it's complete."""
+        states = []
+        for path in (self.csv_file, self.journal_file, self.events_file):
+            try:
+                with open(path, 'rb') as file:
+                    stat = os.fstat(file.fileno())
+                    size = complete_size(file, stat.st_size)
+                    file.seek(max(size - SNAPSHOT_BLOCK, 0))
+                    states.append([size, stat.st_mtime_ns, zlib.crc32(file.read(min(size, SNAPSHOT_BLOCK)))])
+            except FileNotFoundError:
+                states.append(None)
+        return states
+
+    def _resume_offsets(self, states):
+        """Byte offsets to resume reading each file from, given its state when we
+        last read it; None if any file was rewritten rather than appended to"""
+        offsets = []
+        for path, state in zip((self.csv_file, self.journal_file, self.events_file), states):
+            if state is None:
+                offsets.append(0)  # Created since; read it all
+                continue
+            size, mtime, crc = state
+            try:
+                with open(path, 'rb') as file:
+                    current = os.fstat(file.fileno())
+                    if current.st_size == size and current.st_mtime_ns == mtime:
+                        offsets.append(size)
+                        continue
+                    if current.st_size <= size:
+                        return None  # Appends only ever grow a file
+                    file.seek(max(size - SNAPSHOT_BLOCK, 0))
+                    if zlib.crc32(file.read(min(size, SNAPSHOT_BLOCK))) != crc:
+                        return None
+            except FileNotFoundError:
+                return None
+            offsets.append(size)
+        return offsets
+
+    def _load(self):
+        """Load the snapshot and catch up on what was appended since, or rebuild
+        from the files if there is no usable snapshot"""
+        self._verify_tail()
+        self.loads += 1
+        replayed = self._load_snapshot()
+        if replayed is None:
+            self._rebuild()
+        self._synced()
+        if replayed is None or replayed > SNAPSHOT_LAG:
+            self._save_snapshot_later()
+
+    def _verify_tail(self):
+        """Crash check on load, reading only the end of each file: on the first
+        load in this process, cut off a torn last record (see
+        durable.recover_tail_once) and, with checksums on, check the last
+        checksummed block. A hand-edited last line without a newline is left
+        in place if it's a whole record."""
+        checks = ((self.csv_file, valid_row),
+                  (self.journal_file, lambda record: valid_row(record[1:]) if record[0] == 'put'
+                   else len(record) == 2 and record[1].isdigit()),
+                  (self.events_file, lambda event: len(event) == 4 and event[2] in STATUSES
+                   and len(event[3]) == len('2000-01-01T00:00:00')))
+
+        def whole(check):
+            def complete(line):
+                records = list(csv.reader(io.StringIO(line.decode(TEXT_ENCODING, 'replace'), newline='')))
+                return len(records) == 1 and bool(records[0]) and check(records[0])
+            return complete
+
+        cut = [path for path, check in checks if recover_tail_once(path, whole(check))]
+        if cut:
+            self.sums.update(cut)
+        for problem in self.sums.verify_tail([path for path, check in checks]):
+            logging.error(f"Checksum mismatch: {problem}")
+
+    def data_files(self):
+        """The files the checksums cover: the CSV, the journal and the event log"""
+        return [self.csv_file, self.journal_file, self.events_file]
+
+    def _synced(self):
+        self.signature = self._signature()
+        self.files = self._file_states()
+        self.version += 1  # Whatever was cached against the old contents is stale
+
+    def _rebuild(self):
+        index = {}
+        rows = {}
+        high = 0
+        self.base_records = self.journal_records = 0
+        for offset, row in self._read_records(self.csv_file):
+            if offset == 0:
+                continue  # Header
+            if row and valid_row(row):
+                index[row[0]] = offset
+                rows[row[0]] = row
+                self.base_records += 1
+            elif row:
+                logging.warning(f"Skipping malformed row in {self.csv_file}: {row}")
+        for offset, record in self._read_records(self.journal_file):
+            if not record:
+                continue
+            self.journal_records += 1
+            if record[0] == 'put' and valid_row(record[1:]):
+                index[record[1]] = ~offset
+                rows[record[1]] = record[1:]
+            elif record[0] == 'del':
+                index.pop(record[1], None)
+                rows.pop(record[1], None)
+                high = max(high, int(record[1]))
+            elif record[0] == 'next':
+                high = max(high, int(record[1]) - 1)
+        self.pending_events = 0
+        self.changed_status = {}
+        self.checkpoint = self._checkpoint()
+        for row_id, old, new, stamp in self._read_events(self.checkpoint):
+            self.pending_events += 1
+            if row_id in rows:
+                rows[row_id][4] = new
+                self.changed_status[row_id] = new
+        ids = sorted(index, key=int)
+        self.index = {row_id: index[row_id] for row_id in ids}
+        self.rows = rows
+        self.next_id = max([high] + [int(row_id) for row_id in ids[-1:]]) + 1
+        self.view = StatsView(rows[row_id] for row_id in ids)
+
+    def _load_snapshot(self):
+        """Returns how many records were replayed on top of it, or None if it's unusable"""
+        try:
+            with open(self.snapshot_file, 'r', encoding='utf-8') as file:
+                data = json.load(file)
+        except FileNotFoundError:
+            return None
+        except ValueError as e:
+            logging.warning(f"Ignoring unreadable snapshot {self.snapshot_file}: {e}")
+            return None
+        try:
+            if data['format'] != SNAPSHOT_FORMAT or data['checkpoint'] != self._checkpoint():
+                return None
+            offsets = self._resume_offsets(data['files'])
+            if offsets is None:
+                return None
+            if len(data['ids']) != len(data['locations']):
+                raise ValueError("IDs and locations don't line up")
+            self.index = dict(zip(data['ids'], data['locations']))
+            self.rows = {}
+            self.changed_status = data['statuses']
+            self.next_id = data['next_id']
+            self.base_records, self.journal_records, self.pending_events = data['records']
+            self.checkpoint = data['checkpoint']
+            self.view = StatsView.from_state(data['view'])
+        except (KeyError, TypeError, ValueError) as e:
+            logging.warning(f"Ignoring malformed snapshot {self.snapshot_file}: {e}")
+            self.index = None
+            return None
+        return self._catch_up(offsets)
+
+    def _catch_up(self, offsets):
+        """Replay records appended to the CSV, journal and event log past the given
+        offsets, the same way _rebuild reads them; returns how many there were"""
+        csv_offset, journal_offset, events_offset = offsets
+        index = self.index
+        order = {'last': int(next(reversed(index))) if index else 0, 'sorted': True}
+        high = self.next_id - 1
+        count = 0
+
+        def touched(row_id):
+            # What another process wrote during a compaction goes into its new journal
+            if self.compacting is not None:
+                self.compacting.add(row_id)
+
+        def put(row, location):
+            if row[0] in index:
+                self.view.remove(self._row(row[0]))
+                del index[row[0]]
+            touched(row[0])
+            index[row[0]] = location
+            self.rows[row[0]] = row
+            self.view.add(row)
+            # Rows go to the end of the index, which stays oldest first only if
+            # each one is newer than everything before it
+            if int(row[0]) < order['last']:
+                order['sorted'] = False
+            order['last'] = max(order['last'], int(row[0]))
+
+        for offset, row in self._read_records(self.csv_file, csv_offset):
+            if row and row[0] != HEADER[0] and valid_row(row):
+                put(row, offset)
+                self.base_records += 1
+                high = max(high, int(row[0]))
+                count += 1
+        for offset, record in self._read_records(self.journal_file, journal_offset):
+            if not record:
+                continue
+            self.journal_records += 1
+            count += 1
+            if record[0] == 'put' and valid_row(record[1:]):
+                put(record[1:], ~offset)
+            elif record[0] == 'del':
+                if record[1] in index:
+                    self.view.remove(self._row(record[1]))
+                    del index[record[1]]
+                    self.rows.pop(record[1], None)
+                    self.changed_status.pop(record[1], None)
+                    touched(record[1])
+                high = max(high, int(record[1]))
+            elif record[0] == 'next':
+                high = max(high, int(record[1]) - 1)
+        for row_id, old, new, stamp in self._read_events(events_offset):
+            self.pending_events += 1
+            count += 1
+            if row_id in index:
+                touched(row_id)
+                row = self._row(row_id)
+                self.view.change_status(row[4], new, row_id)
+                row[4] = new
+                self.changed_status[row_id] = new
+        if not order['sorted']:
+            self.index = {row_id: index[row_id] for row_id in sorted(index, key=int)}
+        self.next_id = max(high, order['last']) + 1
+        return count
+
+    def _row(self, row_id):
+        """The row with this ID as stored (not padded), read from disk if only
+        the index has it; None if there's no such row. Call with the lock held."""
+        row = self.rows.get(row_id)
+        if row is not None:
+            return row
+        location = self.index.get(row_id)
+        if location is None:
+            return None
+        path, offset = (self.csv_file, location) if location >= 0 else (self.journal_file, ~location)
+        with open(path, 'rb') as file:
+            record = next(read_records(file, offset), (None, []))[1]
+        row = record if location >= 0 else record[1:]
+        if not valid_row(row) or row[0] != row_id:
+            raise ValueError(f"{path} doesn't hold row {row_id} at byte {offset} as indexed; "
+                             f"delete {self.snapshot_file} to rebuild the index")
+        row[4] = self.changed_status.get(row_id, row[4])
+        self.rows[row_id] = row
+        return row
+
+    def _load_rows(self):
+        """Read every row only the index has, in one pass over the CSV and the journal"""
+        if len(self.rows) == len(self.index):
+            return
+        for path, journal in ((self.csv_file, False), (self.journal_file, True)):
+            for offset, record in self._read_records(path):
+                row = record[1:] if journal else record
+                if row and row[0] not in self.rows and self.index.get(row[0]) == (~offset if journal else offset):
+                    row[4] = self.changed_status.get(row[0], row[4])
+                    self.rows[row[0]] = row
+
+    def companies(self):
+        """Lowercased company name -> IDs, from the view; after a snapshot load
+        it's built from the rows the first time it's needed"""
+        with self.lock:
+            self._ensure_loaded()
+            if self.view.companies is None:
+                self._load_rows()
+                self.view.index_companies(self.rows[row_id] for row_id in self.index)
+            return self.view.companies
+
+    def save_snapshot(self):
+        """Write the ID index and the counters out so the next start doesn't
+        rebuild them. Only copying them is done under the store lock."""
+        with self.lock:
+            self.snapshot_pending = False
+            self._ensure_loaded()
+            version = self.version
+            data = {
+                'format': SNAPSHOT_FORMAT,
+                'files': self.files,
+                'checkpoint': self.checkpoint,
+                'next_id': self.next_id,
+                'records': [self.base_records, self.journal_records, self.pending_events],
+                'view': self.view.state(),
+                'ids': list(self.index),
+                'locations': list(self.index.values()),
+                'statuses': dict(self.changed_status),
+            }
+        with self.snapshot_lock:
+            if version < self.snapshot_version:
+                return  # A newer one was written while we were copying
+            try:
+                with atomic_write(self.snapshot_file, encoding='utf-8') as file:
+                    json.dump(data, file, separators=(',', ':'))
+                self.snapshot_version = version
+            except OSError as e:
+                logging.error(f"Error writing snapshot {self.snapshot_file}: {e}")
+
+    def _save_snapshot_later(self):
+        if self.snapshot_pending:
+            return
+        self.snapshot_pending = True
+        if self.background:
+            # Not a daemon, like the compactor, so the snapshot is never cut short
+            threading.Thread(target=self.save_snapshot, name="snapshot").start()
+        else:
+            self.save_snapshot()
+
+    def _checkpoint(self):
+        if not os.path.exists(self.checkpoint_file):
+            return 0
+        with open(self.checkpoint_file, 'r', encoding='utf-8') as file:
+            return json.load(file)['events_offset']
+
+    def _read_events(self, offset=0):
+        """Status events from a byte offset onwards, as (id, old, new, timestamp)"""
+        if not os.path.exists(self.events_file):
+            return []
+        with open(self.events_file, 'rb') as file:
+            file.seek(offset)
+            data = file.read()
+        # Up to the last newline: anything after it is still being written
+        text = data[:data.rfind(b'\n') + 1].decode('utf-8')
+        return [tuple(event) for event in csv.reader(io.StringIO(text, newline='')) if len(event) == 4]
+
+    def _read_records(self, path, offset=0):
+        """(byte offset, record) for the CSV records of the CSV or the journal
+        from a byte offset onwards"""
+        if not os.path.exists(path):
+            return
+        with open(path, 'rb') as file:
+            yield from read_records(file, offset)
+
+    def status_events(self):
+        """Every status change in the log, oldest first, as (id, old, new, timestamp)"""
+        with self.lock:
+            return self._read_events()
+
+    def history(self, row_id):
+        """Every status change of one row, oldest first"""
+        row_id = str(row_id)
+        events = self.status_events()
+        return [{"old": old, "status": new, "at": stamp}
+                for event_id, old, new, stamp in events if event_id == row_id]
+
+    def _ensure_loaded(self):
+        if self.schema.changed():
+            self.schema.load()
+            self.version += 1
+        # Another process (the CLI, a sync) may have written since we last looked
+        if self.index is None:
+            self._load()
+        elif self._signature() != self.signature:
+            offsets = self._resume_offsets(self.files)
+            if offsets is None or self._checkpoint() != self.checkpoint:
+                self._load()
+            else:
+                # Appended to: replay just the new records
+                self._catch_up(offsets)
+                self._synced()
+
+    def current_version(self):
+        """The version counter, after picking up writes made by other processes"""
+        with self.lock:
+            self._ensure_loaded()
+            return self.version
+
+    def file_states(self):
+        """Where the CSV, the journal and the event log end as of now, to
+        pass to changes_since() later"""
+        with self.lock:
+            self._ensure_loaded()
+            return [list(state) if state else None for state in self.files]
+
+    def changes_since(self, states):
+        """IDs of the rows added, edited, deleted or given a new status since
+        the files were at `states` (from file_states()), read from what was
+        appended to them since; None if they were rewritten (compacted) in
+        between, when only comparing every row tells what changed"""
+        with self.lock:
+            self._ensure_loaded()
+            offsets = self._resume_offsets(states)
+            if offsets is None:
+                return None
+            csv_offset, journal_offset, events_offset = offsets
+            ids = set()
+            for offset, row in self._read_records(self.csv_file, csv_offset):
+                if row and row[0] != HEADER[0]:
+                    ids.add(row[0])
+            for offset, record in self._read_records(self.journal_file, journal_offset):
+                if len(record) > 1 and record[0] in ('put', 'del'):
+                    ids.add(record[1])
+            for row_id, old, new, stamp in self._read_events(events_offset):
+                ids.add(row_id)
+            return ids
+
+    def read(self):
+        """Return all data rows (without the header), newest first"""
+        with self.lock:
+            self._ensure_loaded()
+            self._load_rows()
+            return [self.schema.pad(self.rows[row_id]) for row_id in reversed(self.index)]
+
+    def _append(self, path, records, header=None):
+        """Append CSV records in one fsynced write, so a crash leaves either all
+        of them or a torn last line for _verify_tail to clean up. Returns the
+        byte offset each record landed at."""
+        lines = csv_lines(records)
+        if header and not os.path.exists(path):
+            lines.insert(0, csv_lines([header])[0])
+        offset = append_durably(path, b"".join(lines))
+        self.sums.update([path])
+        offsets = []
+        for line in lines:
+            offsets.append(offset)
+            offset += len(line)
+        return offsets[len(offsets) - len(records):]
+
+    def _changed(self, row_ids, base=0, journal=0, events=0):
+        self.base_records += base
+        self.journal_records += journal
+        self.pending_events += events
+        self.signature = self._signature()
+        self.files = self._file_states()
+        self.version += 1
+        if self.compacting is not None:
+            self.compacting.update(row_ids)
+        self._maybe_compact()
+
+    def _journal(self, records):
+        for record, offset in zip(records, self._append(self.journal_file, records)):
+            if record[0] == 'put':
+                self.index[record[1]] = ~offset
+        self._changed([record[1] for record in records], journal=len(records))
+
+    def _record_statuses(self, changes):
+        """Append (id, old, new) status changes to the event log; the caller has
+        already updated the index and the stats view"""
+        stamp = datetime.now().isoformat(timespec='seconds')
+        self._append(self.events_file, [[row_id, old, new, stamp] for row_id, old, new in changes])
+        self._changed([row_id for row_id, old, new in changes], events=len(changes))
+
+    def _notify(self, event):
+        for listener in list(self.listeners):
+            try:
+                listener(event)
+            except Exception as e:
+                logging.error(f"Error in store listener: {e}")
+
+    def add(self, company, link, status="Applied", date=None):
+        """Add one entry and return the stored row"""
+        return self.add_many([(company, link, status, date)])[0]
+
+    def add_many(self, entries):
+        """Add several (company, link[, status[, date]]) entries with a single append"""
+        new_rows = []
+        with self.lock:
+            self._ensure_loaded()
+            next_id = self.next_id
+            for entry in entries:
+                company, link = entry[0], entry[1]
+                status = entry[2] if len(entry) > 2 and entry[2] else "Applied"
+                date = entry[3] if len(entry) > 3 and entry[3] else datetime.now().strftime(DATE_FORMAT)
+                if not company or not link:
+                    raise ValueError("Company name and job link are both required")
+                check_status(status)
+                new_rows.append([str(next_id), date, company, link, status] + self.schema.defaults[len(HEADER):])
+                next_id += 1
+            offsets = self._append(self.csv_file, new_rows, header=self.schema.columns)
+            for row, offset in zip(new_rows, offsets):
+                self.index[row[0]] = offset
+                self.rows[row[0]] = row
+                self.view.add(row)
+            self.next_id = next_id
+            self._changed([row[0] for row in new_rows], base=len(new_rows))
+        for row in new_rows:
+            self._notify({"type": "insert", "row": list(row)})
+        return [list(row) for row in new_rows]
+
+    def merge(self, updates, inserts, deletes=()):
+        """Apply rows from another copy of the log. `updates` maps ID -> [date,
+        company, link, status]; `inserts` is a list of the same and gets fresh
+        IDs; `deletes` are IDs to drop. Returns the inserted rows."""
+        events = []
+        with self.lock:
+            self._ensure_loaded()
+            records = []
+            status_changes = []
+            for row_id, fields in updates.items():
+                old = self._row(row_id)
+                if old is None:
+                    continue
+                # Only the HEADER columns are synced; optional ones stay as they are here
+                row = [row_id] + list(fields[:len(HEADER) - 1]) + old[len(HEADER):]
+                self.rows[row_id] = row
+                self.view.remove(old)
+                self.view.add(row)
+                if old[4] != row[4]:
+                    self.changed_status[row_id] = row[4]
+                    status_changes.append((row_id, old[4], row[4]))
+                    events.append({"type": "status", "id": row_id, "old": old[4], "status": row[4]})
+                if old[1:4] != row[1:4]:
+                    records.append(['put'] + row)
+                    events.append({"type": "edit", "row": self.schema.pad(row)})
+            for row_id in deletes:
+                old = self._drop(row_id)
+                if old is not None:
+                    records.append(['del', row_id])
+                    events.append({"type": "delete", "id": row_id})
+            if records:
+                self._journal(records)
+            if status_changes:
+                self._record_statuses(status_changes)
+        new_rows = self.add_many([(f[1], f[2], f[3], f[0]) for f in inserts]) if inserts else []
+        for event in events:
+            self._notify(event)
+        return new_rows
+
+    def get(self, row_id):
+        with self.lock:
+            self._ensure_loaded()
+            row = self._row(str(row_id))
+            return self.schema.pad(row) if row else None
+
+    def _drop(self, row_id):
+        """Take a row out of the index and the view; returns it, or None if there's no such row"""
+        old = self._row(row_id)
+        if old is not None:
+            del self.index[row_id]
+            self.rows.pop(row_id, None)
+            self.changed_status.pop(row_id, None)
+            self.view.remove(old)
+        return old
+
+    def _put(self, row_id, change):
+        """Overwrite one row via the journal; returns (old, new) or None if the ID isn't in the log"""
+        with self.lock:
+            self._ensure_loaded()
+            old = self._row(str(row_id))
+            if old is None:
+                return None
+            row = self.schema.pad(old)
+            change(row)
+            self.rows[row[0]] = row
+            self.view.remove(old)
+            self.view.add(row)
+            self._journal([['put'] + row])
+        return old, list(row)
+
+    def set_status(self, row_id, new_status):
+        """Change the status of one row by appending a status event; returns
+        False if the ID isn't in the log"""
+        check_status(new_status)
+        row_id = str(row_id)
+        with self.lock:
+            self._ensure_loaded()
+            row = self._row(row_id)
+            if row is None:
+                return False
+            old_status = row[4]
+            self.rows[row_id] = row[:4] + [new_status] + row[5:]
+            self.changed_status[row_id] = new_status
+            self.view.change_status(old_status, new_status, row_id)
+            self._record_statuses([(row_id, old_status, new_status)])
+        self._notify({"type": "status", "id": row_id, "old": old_status, "status": new_status})
+        return True
+
+    def edit(self, row_id, company=None, link=None, fields=None):
+        """Change the company name, job link and/or optional columns (`fields`,
+        column name -> value) of one row; returns the new row, or None"""
+        if (company is not None and not company) or (link is not None and not link):
+            raise ValueError("Company name and job link can't be empty")
+        positions = {}
+        for name in fields or ():
+            positions[name] = self.schema.position(name)
+            if positions[name] < len(HEADER):
+                raise ValueError(f"{name!r} isn't an optional column")
+
+        def change(row):
+            if company is not None:
+                row[2] = company
+            if link is not None:
+                row[3] = link
+            for name, position in positions.items():
+                row[position] = str(fields[name])
+
+        result = self._put(row_id, change)
+        if result is None:
+            return None
+        self._notify({"type": "edit", "row": result[1]})
+        return result[1]
+
+    def rename_companies(self, names, canonical):
+        """Give every row whose company is one of `names` (case-insensitive) the
+        canonical name, in one journal append; returns the changed rows"""
+        if not canonical:
+            raise ValueError("Company name can't be empty")
+        changed = []
+        with self.lock:
+            self._ensure_loaded()
+            ids = set()
+            companies = self.companies()
+            for name in names:
+                ids.update(companies.get(name.lower(), ()))
+            for row_id in sorted(ids, key=int):
+                old = self._row(row_id)
+                if old[2] == canonical:
+                    continue
+                row = old[:2] + [canonical] + old[3:]
+                self.rows[row_id] = row
+                self.view.remove(old)
+                self.view.add(row)
+                changed.append(row)
+            if changed:
+                self._journal([['put'] + row for row in changed])
+        for row in changed:
+            self._notify({"type": "edit", "row": self.schema.pad(row)})
+        return [self.schema.pad(row) for row in changed]
+
+    def add_column(self, name, default=""):
+        """Add an optional column; existing rows read back with `default` until
+        they're next written, so nothing is rewritten now"""
+        with self.lock:
+            self._ensure_loaded()
+            self.schema.add(name, default)
+            self.version += 1
+        return self.schema.columns
+
+    def company_counts(self):
+        """Company names exactly as typed -> number of rows"""
+        with self.lock:
+            self._ensure_loaded()
+            self._load_rows()
+            return Counter(self.rows[row_id][2] for row_id in self.index)
+
+    def delete(self, row_id):
+        """Drop one row with a tombstone record; returns False if the ID isn't in the log"""
+        row_id = str(row_id)
+        with self.lock:
+            self._ensure_loaded()
+            if self._drop(row_id) is None:
+                return False
+            self._journal([['del', row_id]])
+        self._notify({"type": "delete", "id": row_id})
+        return True
+
+    def dead_ratio(self):
+        """Share of records on disk that no longer describe a live row"""
+        with self.lock:
+            self._ensure_loaded()
+            total = self.base_records + self.journal_records + self.pending_events
+            return (total - len(self.index)) / total if total else 0.0
+
+    def _maybe_compact(self):
+        if self.compacting is not None or self.dead_ratio() <= self.compact_ratio:
+            return
+        if self.background:
+            # Not a daemon, so a short-lived CLI process finishes the rewrite before exiting
+            thread = threading.Thread(target=self.compact, name="compactor")
+            thread.start()
+        else:
+            self.compact()
+
+    def compact(self):
+        """Rewrite the CSV with every live row and start a fresh journal.
+        Writers keep going while the new CSV is written; whatever they touch
+        in the meantime is carried over into the new journal, including what
+        other processes append, which is replayed before the files are
+        swapped. One process compacts a log at a time, and if another
+        process rewrote the files meanwhile, this compaction is dropped.
+        Returns whether the files were compacted."""
+        with exclusive_lock(self.compact_lock_file) as locked:
+            if not locked:
+                logging.info(f"Not compacting {self.csv_file}: another process is compacting it")
+                return False
+            return self._compact()
+
+    def _compact(self):
+        with self.lock:
+            self._ensure_loaded()
+            if self.compacting is not None:
+                return False
+            rows = self.read()
+            columns = self.schema.columns
+            events_offset = os.path.getsize(self.events_file) if os.path.exists(self.events_file) else 0
+            events_folded = self.pending_events
+            loads = self.loads
+            self.compacting = set()
+        csv_temp = journal_temp = None
+        try:
+            lines = csv_lines([columns] + rows)
+            fd, journal_temp = temp_file(self.journal_file)
+            os.close(fd)
+            fd, csv_temp = temp_file(self.csv_file)
+            with os.fdopen(fd, 'wb') as file:
+                file.writelines(lines)
+                fsync_file(file)
+            locations = {}
+            offset = len(lines[0])
+            for row, line in zip(rows, lines[1:]):
+                locations[row[0]] = offset
+                offset += len(line)
+            del lines
+            with self.lock:
+                while True:
+                    # Replays whatever other processes appended, which adds the
+                    # rows it touched to self.compacting
+                    self._ensure_loaded()
+                    if self.loads != loads:
+                        logging.info(f"Not compacting {self.csv_file}: another process rewrote it meanwhile")
+                        os.remove(csv_temp)
+                        os.remove(journal_temp)
+                        return False
+                    records = [['put'] + self._row(row_id) if row_id in self.index else ['del', row_id]
+                               for row_id in sorted(self.compacting, key=int)]
+                    if self.next_id > max([int(row_id) for row_id in list(self.index)[-1:]] + [0]) + 1:
+                        # Keep deleted IDs from being handed out again
+                        records.insert(0, ['next', str(self.next_id)])
+                    journal_lines = csv_lines(records)
+                    with open(journal_temp, 'wb') as file:
+                        file.writelines(journal_lines)
+                        fsync_file(file)
+                    # Checked as late as possible: only an append landing between
+                    # here and the renames below can still be missed
+                    if self._signature() == self.signature:
+                        break
+                durable_replace(csv_temp, self.csv_file)
+                # Events before this offset are now in the CSV. If we stop before
+                # the checkpoint is written they are simply replayed again.
+                with atomic_write(self.checkpoint_file, encoding='utf-8') as file:
+                    json.dump({"events_offset": events_offset}, file)
+                if records:
+                    durable_replace(journal_temp, self.journal_file)
+                else:
+                    os.remove(journal_temp)
+                    if os.path.exists(self.journal_file):
+                        os.remove(self.journal_file)
+                self.sums.update([self.csv_file, self.journal_file], rewritten=True)
+                # Every row is now at its place in the new CSV, or the new
+                # journal if it was carried over, with its current status
+                self.index = {row_id: locations.get(row_id) for row_id in self.index}
+                offset = 0
+                for record, line in zip(records, journal_lines):
+                    if record[0] == 'put':
+                        self.index[record[1]] = ~offset
+                    offset += len(line)
+                self.changed_status = {}
+                self.base_records = len(rows)
+                self.journal_records = len(records)
+                self.pending_events -= events_folded
+                self.checkpoint = events_offset
+                self.signature = self._signature()
+                self.files = self._file_states()
+                logging.info(f"Compacted {self.csv_file}: {len(rows)} rows, {len(records)} carried over")
+            # The old snapshot can't be resumed from a rewritten CSV
+            self.save_snapshot()
+            return True
+        except OSError as e:
+            logging.error(f"Error compacting {self.csv_file}: {e}")
+            for temp in (csv_temp, journal_temp):
+                if temp is not None and os.path.exists(temp):
+                    os.remove(temp)
+            return False
+        finally:
+            self.compacting = None
+
+    def query(self, company=None, status=None, limit=None):
+        """Rows whose company contains `company` (case-insensitive) and whose status
+        matches, newest first. The company match runs over the distinct names in
+        the view's company index rather than over every row."""
+        matches = []
+        with self.lock:
+            self._ensure_loaded()
+            if company:
+                needle = company.lower()
+                ids = [row_id for name, name_ids in self.companies().items() if needle in name
+                       for row_id in name_ids]
+                rows = (self._row(row_id) for row_id in sorted(ids, key=int, reverse=True))
+            else:
+                if not limit:
+                    self._load_rows()  # One pass rather than a read per row
+                rows = (self._row(row_id) for row_id in reversed(self.index))
+            for row in rows:
+                if status and row[4] != status:
+                    continue
+                matches.append(self.schema.pad(row))
+                if limit and len(matches) >= limit:
+                    break
+        return matches
+
+    def stats(self, today=None, days=5):
+        """Same figures as the report's stats panel, from the running counters"""
+        with self.lock:
+            self._ensure_loaded()
+            return self.view.result(today, days)
+
+
+def read_records(file, offset=0):
+    """(byte offset, record) for each CSV record of a binary file from offset
+    on, up to its last complete line. csv.reader takes one line at a time,
+    only as many as a record needs, so the lines handed to it so far tell
+    where the next record starts."""
+    file.seek(offset)
+    end = offset
+
+    def lines():
+        nonlocal end
+        for line in file:
+            if not line.endswith(b'\n'):
+                return  # Another process's append, still being written
+            end += len(line)
+            yield line.decode(TEXT_ENCODING)
+
+    start = offset
+    for record in csv.reader(lines()):
+        yield start, record
+        start = end
+
+
+def csv_lines(records):
+    """Each record as its own encoded CSV line, the way the files are written"""
+    buffer = io.StringIO(newline='')
+    writer = csv.writer(buffer)
+    lines = []
+    for record in records:
+        writer.writerow(record)
+        lines.append(buffer.getvalue().encode(TEXT_ENCODING))
+        buffer.seek(0)
+        buffer.truncate()
+    return lines
+
+
+def valid_row(row):
+    """Whether a record read back from the CSV or the journal is a whole row"""
+    return len(row) >= len(HEADER) and row[0].isdigit() and row[4] in STATUSES
+
+
+def check_status(status):
+    if status not in STATUSES:
+        raise ValueError(f"Unknown status {status!r}, expected one of {', '.join(STATUSES)}")
+
+
+def resolve_date(day_month, today):
+    """Dates are stored as DD-MM; take the latest such date that isn't in the future"""
+    day, month = (int(part) for part in day_month.split('-'))
+    try:
+        resolved = date(today.year, month, day)
+    except ValueError:  # 29-02 outside a leap year
+        resolved = date(today.year, month, 28)
+    if resolved > today:
+        resolved = resolved.replace(year=resolved.year - 1, day=min(day, 28) if month == 2 else day)
+    return resolved
+
+
+class StatsView:
+    """Running counters behind the stats panel, plus the company search index
+    and per-status and per-day bitmaps of row IDs for filtering: updated per
+    insert, status change and delete, so reading the stats never rescans the
+    log. The company index isn't part of the snapshot state; it's None until
+    index_companies() builds it."""
+
+    def __init__(self, rows=()):
+        self.total = 0
+        self.statuses = Counter()
+        self.per_day = Counter()
+        self.companies = {}  # Lowercased company name -> IDs; None when restored from a snapshot
+        self.status_bits = {}  # Status -> Bitmap of IDs
+        self.day_bits = {}  # DD-MM -> Bitmap of IDs
+        for row in rows:
+            self.add(row)
+
+    @classmethod
+    def from_state(cls, state):
+        view = cls()
+        view.total = state['total']
+        view.statuses = Counter(state['statuses'])
+        view.per_day = Counter(state['per_day'])
+        view.companies = None
+        view.status_bits = {status: Bitmap.from_state(bits) for status, bits in state['status_bits'].items()}
+        view.day_bits = {day: Bitmap.from_state(bits) for day, bits in state['day_bits'].items()}
+        return view
+
+    def state(self):
+        """JSON-ready counters and indexes, for the snapshot"""
+        return {
+            'total': self.total,
+            'statuses': dict(self.statuses),
+            'per_day': dict(self.per_day),
+            'status_bits': {status: bits.to_state() for status, bits in self.status_bits.items()},
+            'day_bits': {day: bits.to_state() for day, bits in self.day_bits.items()},
+        }
+
+    def add(self, row, sign=1):
+        self.total += sign
+        self.statuses[row[4]] += sign
+        self.per_day[row[1]] += sign
+        name = row[2].lower()
+        if sign > 0:
+            if self.companies is not None:
+                self.companies.setdefault(name, set()).add(row[0])
+            self.status_bits.setdefault(row[4], Bitmap()).add(row[0])
+            self.day_bits.setdefault(row[1], Bitmap()).add(row[0])
+        else:
+            if self.companies is not None and name in self.companies:
+                self.companies[name].discard(row[0])
+                if not self.companies[name]:
+                    del self.companies[name]
+            self._unset(self.status_bits, row[4], row[0])
+            self._unset(self.day_bits, row[1], row[0])
+
+    def index_companies(self, rows):
+        self.companies = {}
+        for row in rows:
+            self.companies.setdefault(row[2].lower(), set()).add(row[0])
+
+    @staticmethod
+    def _unset(bitmaps, key, row_id):
+        bits = bitmaps.get(key)
+        if bits is not None:
+            bits.discard(row_id)
+            if not bits:
+                del bitmaps[key]
+
+    def remove(self, row):
+        self.add(row, -1)
+
+    def change_status(self, old, new, row_id):
+        self.statuses[old] -= 1
+        self.statuses[new] += 1
+        self._unset(self.status_bits, old, row_id)
+        self.status_bits.setdefault(new, Bitmap()).add(row_id)
+
+    def live(self):
+        """Bitmap of every row ID in the log"""
+        return Bitmap.union(self.status_bits.values())
+
+    def result(self, today=None, days=5):
+        today = today or datetime.now()
+        day_labels = [(today - timedelta(days=i)).strftime(DATE_FORMAT) for i in range(days - 1, -1, -1)]
+        status_counts = {status: self.statuses[status] for status in STATUSES}
+        responses = status_counts["Interview"] + status_counts["Accepted"]
+        return {
+            "today": self.per_day[day_labels[-1]],
+            "total": self.total,
+            "statuses": status_counts,
+            "response_rate": round(responses / self.total * 100) if self.total else 0,
+            "last_days": [{"date": label, "count": self.per_day[label]} for label in day_labels],
+        }
+
+
+def compute_stats(rows, today=None, days=5):
+    return StatsView(rows).result(today, days)
+
+
+class RenderScheduler:
+    """Coalesces report renders. Writes call mark_dirty(); the first render
+    after a quiet spell starts right away, and after that at most one runs per
+    interval however many writes come in. flush() renders now. An interval of
+    0 renders inline on every mark_dirty()."""
+
+    def __init__(self, render, interval=RENDER_INTERVAL):
+        self.render = render
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.timer = None
+        self.dirty = False
+        self.last_run = float('-inf')
+
+    def mark_dirty(self):
+        with self.lock:
+            self.dirty = True
+            if self.timer is not None:
+                return
+            if self.interval > 0:
+                delay = max(0.0, self.last_run + self.interval - time.monotonic())
+                # Not a daemon: a pending render still lands if the program exits
+                self.timer = threading.Timer(delay, self._run)
+                self.timer.name = "render"
+                self.timer.start()
+                return
+        self._run()
+
+    def flush(self, force=False):
+        """Render now if a render is pending, or regardless with force; the
+        render itself still skips logs the report already shows"""
+        with self.lock:
+            if self.timer is not None:
+                self.timer.cancel()
+                self.timer = None
+            if force:
+                self.dirty = True
+        self._run()
+
+    def _run(self):
+        with self.lock:
+            self.timer = None
+            if not self.dirty:
+                return
+            self.dirty = False
+            self.last_run = time.monotonic()
+        try:
+            self.render()
+        except Exception as e:
+            logging.error(f"Error rendering report: {e}")
+
+
+class RapidLoggerCore:
+    """Log storage plus the HTML report; shared by the GUI, the CLI and the HTTP server"""
+
+    def __init__(self, csv_file="data_log.csv", html_file="data_log.html", name=None,
+                 api_base=DEFAULT_API_BASE, render_interval=RENDER_INTERVAL):
+        self.store = LogStore(csv_file)
+        self.csv_file = csv_file
+        self.html_file = html_file
+        self.name = name  # Profile name, None for the default log
+        self.api_base = api_base  # Where the report page sends status updates
+        # Writes mark the report file dirty; it's regenerated at most once per interval
+        self.scheduler = RenderScheduler(self.render_if_changed, render_interval)
+        self.render_lock = threading.RLock()  # One report render at a time; writers don't wait for it
+        # What the report file shows (see _report_stamp), also kept next to it
+        # so other processes can tell too
+        self.stamp_file = os.path.splitext(html_file)[0] + ".rendered.json"
+        self.rendered = None
+        self._analytics = None
+        self._clusters = None
+        self._tags = None
+        self._reminders = None
+        self._notes = None
+
+    @property
+    def tags(self):
+        """The log's TagStore (see tags.py), opened on first use"""
+        if self._tags is None:
+            from tags import TagStore
+            self._tags = TagStore(self.store)
+        return self._tags
+
+    @property
+    def notes(self):
+        """The log's NoteStore (see notes.py); notes are only read when asked for"""
+        if self._notes is None:
+            from notes import NoteStore
+            self._notes = NoteStore(self.store)
+        return self._notes
+
+    @property
+    def reminders(self):
+        """The log's follow-up Reminders (see reminders.py), built on first use"""
+        if self._reminders is None:
+            from reminders import Reminders
+            self._reminders = Reminders(self.store)
+        return self._reminders
+
+    def current_version(self):
+        """Changes whenever the rows or their tags do: both counters only ever
+        go up, so their sum moves when either one does"""
+        with self.store.lock:
+            return self.store.current_version() + self.tags.current_version()
+
+    def data_files(self):
+        """Every append-only file of the log, as covered by checksums (see durable.BlockSums)"""
+        return self.store.data_files() + [self.tags.path, self.notes.path]
+
+    def analytics(self, top_companies=50):
+        """Funnel, time-to-response, cohort and per-company figures (see analytics.py)"""
+        if self._analytics is None:
+            from analytics import Analytics
+            self._analytics = Analytics(self.store)
+        return self._analytics.summary(top_companies)
+
+    def company_clusters(self):
+        """Groups of company names that look like the same company (see clusters.py)"""
+        if self._clusters is None:
+            from clusters import CompanyClusters
+            self._clusters = CompanyClusters(self.store)
+        return self._clusters.get()
+
+    def initialize_files(self):
+        self.store.initialize()
+        if not os.path.exists(self.html_file):
+            self.update_html_file()
+
+    def add_entry(self, company, link, tags=()):
+        row = self.store.add(company, link)
+        if tags:
+            self.tags.set_tags(row[0], tags)
+        self.scheduler.mark_dirty()
+        return row
+
+    def add_entries(self, entries, tags=()):
+        rows = self.store.add_many(entries)
+        for row in rows if tags else ():
+            self.tags.set_tags(row[0], tags)
+        self.scheduler.mark_dirty()
+        return rows
+
+    def update_status(self, row_id, new_status):
+        """Update the status in the CSV file"""
+        try:
+            success = self.store.set_status(row_id, new_status)
+            if success:
+                self.scheduler.mark_dirty()
+            return success
+        except Exception as e:
+            logging.error(f"Error updating status: {e}")
+            return False
+
+    def edit_entry(self, row_id, company=None, link=None, fields=None):
+        """Change an entry's company name, link and/or optional columns; returns False if that fails"""
+        try:
+            success = self.store.edit(row_id, company, link, fields) is not None
+            if success:
+                self.scheduler.mark_dirty()
+            return success
+        except Exception as e:
+            logging.error(f"Error editing entry: {e}")
+            return False
+
+    def set_tags(self, row_id, tags):
+        """Replace an entry's tags; returns False if there's no such entry or the tags are invalid"""
+        try:
+            success = self.tags.set_tags(row_id, tags)
+            if success:
+                self.scheduler.mark_dirty()
+            return success
+        except Exception as e:
+            logging.error(f"Error tagging entry: {e}")
+            return False
+
+    def set_note(self, row_id, text):
+        """Replace an entry's note ('' removes it); returns False if there's no such entry"""
+        try:
+            return self.notes.set(row_id, text)
+        except Exception as e:
+            logging.error(f"Error saving note: {e}")
+            return False
+
+    def add_column(self, name, default=""):
+        """Add an optional column to the log (see Schema); returns the columns"""
+        columns = self.store.add_column(name, default)
+        self.scheduler.mark_dirty()
+        return columns
+
+    def filter_entries(self, statuses=(), tags=(), any_tags=(), days=None, company=None, limit=None):
+        """(number of matches, up to `limit` matching rows newest first) for
+        rows matching every given criterion (see TagStore.filter)"""
+        with self.store.lock:
+            ids = self.tags.filter(statuses, tags, any_tags, days)
+            if company:
+                needle = company.lower()
+                ids &= Bitmap([row_id for name, name_ids in self.store.companies().items()
+                               if needle in name for row_id in name_ids])
+            rows = []
+            for row_id in reversed(ids):
+                rows.append(self.store.get(row_id))
+                if limit and len(rows) >= limit:
+                    break
+            return len(ids), rows
+
+    def merge_companies(self, names, canonical):
+        """Rename every entry under `names` to `canonical`; returns False if nothing changed"""
+        try:
+            success = bool(self.store.rename_companies(names, canonical))
+            if success:
+                self.scheduler.mark_dirty()
+            return success
+        except Exception as e:
+            logging.error(f"Error merging companies: {e}")
+            return False
+
+    def delete_entry(self, row_id):
+        try:
+            success = self.store.delete(row_id)
+            if success:
+                self.scheduler.mark_dirty()
+            return success
+        except Exception as e:
+            logging.error(f"Error deleting entry: {e}")
+            return False
+
+    def _report_stamp(self, api_base):
+        """The state a report is rendered from, comparable across processes:
+        size and mtime of the log's files, its schema and its tags, and the
+        API base. Call with the store lock held, right after reading them."""
+        return json.dumps([self.store.signature, self.store.schema.file.signature, self.tags.file.signature, api_base])
+
+    def _report_source(self):
+        """(columns, rows, tags, api_base, stamp) as of one moment; only this
+        is done under the store lock, so writes carry on while a page renders"""
+        with self.store.lock:
+            rows = self.store.read()
+            tags = self.tags.mapping()
+            api_base = self.api_base
+            return self.store.schema.columns, rows, tags, api_base, self._report_stamp(api_base)
+
+    def update_html_file(self, path=None, workers=None):
+        """Regenerate the report now; large logs are rendered in parallel (see render.render_body)"""
+        from render import write_html
+        with self.render_lock:
+            columns, rows, tags, api_base, stamp = self._report_source()
+            write_html(path or self.html_file, columns, rows, api_base, workers, tags)
+            if path is None or path == self.html_file:
+                with atomic_write(self.stamp_file, encoding='utf-8') as file:
+                    file.write(stamp)
+                self.rendered = stamp
+
+    def render_if_changed(self):
+        """Regenerate the report file unless it already shows this state of the
+        log, whichever process rendered it"""
+        with self.render_lock:
+            with self.store.lock:
+                self.current_version()
+                stamp = self._report_stamp(self.api_base)
+            if stamp != self.rendered and os.path.exists(self.stamp_file):
+                with open(self.stamp_file, 'r', encoding='utf-8') as file:
+                    self.rendered = file.read()
+            if stamp == self.rendered and os.path.exists(self.html_file):
+                return
+            self.update_html_file()
+
+    def flush_report(self, force=False):
+        """Render a pending report change now instead of waiting for the
+        scheduler; with force, also pick up what other processes wrote"""
+        self.scheduler.flush(force)
+
+    def render_report(self, assets=None):
+        """(store version, report page as bytes) rendered in memory; see render_html for assets"""
+        from render import render_html
+        with self.store.lock:
+            version = self.current_version()
+            columns, rows, tags, api_base, stamp = self._report_source()
+        html = render_html(columns, rows, api_base, assets, tags=tags)
+        return version, html.encode('utf-8')
+
+
+def profile_paths(name, root_dir=PROFILES_DIR):
+    """(csv, html) paths for a named profile"""
+    if not PROFILE_NAME.match(name or ''):
+        raise ValueError(f"Invalid profile name {name!r}: use letters, digits, '-' and '_'")
+    folder = os.path.join(root_dir, name)
+    return os.path.join(folder, "data_log.csv"), os.path.join(folder, "data_log.html")
+
+
+class ProfileRegistry:
+    """Several named logs hosted by one process. Each profile keeps its own
+    files under profiles/<name>/ and its own store (and so its own caches and
+    indexes); profiles are opened on first use and then kept."""
+
+    def __init__(self, default=None, root_dir=PROFILES_DIR, base_url=DEFAULT_API_BASE,
+                 render_interval=RENDER_INTERVAL):
+        self.default = default
+        self.root_dir = root_dir
+        self.base_url = base_url
+        self.render_interval = render_interval
+        self.profiles = {}
+        self.lock = threading.Lock()
+        # Called with (name, core) whenever a profile is opened
+        self.listeners = []
+        if default is not None:
+            default.api_base = base_url
+
+    def set_base_url(self, base_url):
+        with self.lock:
+            self.base_url = base_url
+            if self.default is not None:
+                self.default.api_base = base_url
+            for name, core in self.profiles.items():
+                core.api_base = self.profile_url(name)
+
+    def profile_url(self, name):
+        return f"{self.base_url}/p/{name}"
+
+    def names(self):
+        """Profiles with a folder on disk"""
+        if not os.path.isdir(self.root_dir):
+            return []
+        return sorted(name for name in os.listdir(self.root_dir)
+                      if PROFILE_NAME.match(name) and os.path.isdir(os.path.join(self.root_dir, name)))
+
+    def get(self, name=None, create=False):
+        """The core for a profile (None for the default log); returns None for
+        unknown profiles unless create is set"""
+        if name is None:
+            return self.default
+        csv_file, html_file = profile_paths(name, self.root_dir)
+        with self.lock:
+            core = self.profiles.get(name)
+            if core is not None:
+                return core
+            if not create and not os.path.isdir(os.path.dirname(csv_file)):
+                return None
+            os.makedirs(os.path.dirname(csv_file), exist_ok=True)
+            core = RapidLoggerCore(csv_file, html_file, name, self.profile_url(name), self.render_interval)
+            core.initialize_files()
+            self.profiles[name] = core
+            listeners = list(self.listeners)
+        for listener in listeners:
+            listener(name, core)
+        return core
+
+    def opened(self):
+        """(name, core) pairs for the default log and every open profile"""
+        with self.lock:
+            pairs = list(self.profiles.items())
+        if self.default is not None:
+            pairs.insert(0, (None, self.default))
+        return pairs
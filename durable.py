@@ -0,0 +1,336 @@
+import json
+import logging
+import os
+import tempfile
+import zlib
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+CHECKSUM_BLOCK = 65536  # Bytes covered by each checksum
+TAIL_SCAN = 4096  # Bytes read at a time while looking for the last complete line
+
+_tails_checked = set()  # Files recover_tail_once has looked at in this process
+
+
+class Superseded(Exception):
+    """Raised inside an atomic_write block to drop the rewrite, typically
+    because another process appended to the file while it was being written"""
+
+
+def fsync_file(file):
+    """Push a file's buffered writes all the way to disk"""
+    file.flush()
+    os.fsync(file.fileno())
+
+
+def fsync_dir(path):
+    """Make a rename or a new file in path's directory survive a crash; a no-op
+    where directories can't be opened (Windows)"""
+    try:
+        fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def durable_replace(temp, path):
+    """Rename a written and fsynced temp file over path"""
+    os.replace(temp, path)
+    fsync_dir(path)
+
+
+def temp_file(path):
+    """Create a temp file next to path, with a name no other writer (thread or
+    process) gets, and with path's permissions if it exists; returns (fd, name)"""
+    directory, name = os.path.split(os.path.abspath(path))
+    fd, temp = tempfile.mkstemp(prefix=name + ".", suffix=".tmp", dir=directory)
+    try:
+        os.chmod(temp, os.stat(path).st_mode & 0o777)
+    except OSError:
+        pass  # New file: mkstemp's owner-only permissions it is
+    return fd, temp
+
+
+@contextmanager
+def atomic_write(path, mode='w', **kwargs):
+    """Open a temp file next to path; once the block finishes it's fsynced and
+    renamed over path, so a crash or a reader sees the old file or the new
+    one, never half of either. If the block raises, path is left alone.
+    Each call gets its own temp file, so concurrent writers never share one."""
+    fd, temp = temp_file(path)
+    try:
+        with os.fdopen(fd, mode, **kwargs) as file:
+            yield file
+            fsync_file(file)
+        durable_replace(temp, path)
+    except BaseException:
+        try:
+            os.remove(temp)
+        except OSError:
+            pass
+        raise
+
+
+@contextmanager
+def exclusive_lock(path):
+    """Lock the file at path against every other process (and every other
+    open of it in this one) for the block, without waiting; yields whether
+    the lock was taken. The OS lets go of it if the process dies, so a crash
+    never leaves it held."""
+    with open(path, 'a+b') as file:
+        try:
+            if fcntl is not None:
+                fcntl.flock(file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                file.seek(0)
+                msvcrt.locking(file.fileno(), msvcrt.LK_NBLCK, 1)
+        except OSError:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            if fcntl is not None:
+                fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+            else:
+                file.seek(0)
+                msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class WatchedFile:
+    """A small file that other processes may append to or rewrite, such as
+    the tags, notes or schema file: remembers its size and mtime as of our
+    last read or write, so the owner reloads only once it has changed, and
+    only rewrites it if nobody else has written to it since."""
+
+    def __init__(self, path):
+        self.path = path
+        self.signature = None  # (size, mtime) as of seen(); None if missing or not seen yet
+
+    def _stat(self):
+        try:
+            stat = os.stat(self.path)
+            return stat.st_size, stat.st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def changed(self):
+        """Whether the file differs from when seen() was last called"""
+        return self._stat() != self.signature
+
+    def seen(self):
+        """Take the file as it is now to be what we have in memory. Called
+        before reading it, a write landing mid-read still shows as a change."""
+        self.signature = self._stat()
+
+    def rewrite(self, write, mode='w', **kwargs):
+        """Replace the file with what write(file) writes, via atomic_write,
+        unless another process has written to it since seen(); returns
+        whether it was replaced"""
+        try:
+            with atomic_write(self.path, mode, **kwargs) as file:
+                write(file)
+                if self.changed():
+                    raise Superseded(self.path)
+        except Superseded:
+            logging.info(f"Not rewriting {self.path}: another process wrote to it meanwhile")
+            return False
+        self.seen()
+        return True
+
+
+def append_durably(path, data):
+    """Append bytes to path in a single write and fsync them. Starts on a fresh
+    line if the file doesn't end with one; returns the offset data landed at."""
+    with open(path, 'a+b') as file:
+        offset = file.seek(0, os.SEEK_END)
+        if offset:
+            file.seek(offset - 1)
+            if file.read(1) != b'\n':
+                data = b'\r\n' + data
+                offset += 2
+        file.write(data)
+        fsync_file(file)
+    return offset
+
+
+def complete_size(file, size=None):
+    """Bytes of an open binary file up to the end of its last complete line:
+    its size, unless it ends in a line without a newline"""
+    if size is None:
+        size = file.seek(0, os.SEEK_END)
+    end = size
+    while end > 0:
+        start = max(end - TAIL_SCAN, 0)
+        file.seek(start)
+        chunk = file.read(end - start)
+        if end == size and chunk.endswith(b'\n'):
+            return size
+        newline = chunk.rfind(b'\n')
+        if newline >= 0:
+            return start + newline + 1
+        end = start
+    return 0
+
+
+def recover_tail(path, complete=None):
+    """Startup check of a line-oriented, append-only file, reading only its end:
+    a last line without a newline is a write that was cut short, unless
+    complete(line) says it's a whole record (say, typed in by hand), in which
+    case it just gets its newline. A torn line is moved to <path>.torn and the
+    file truncated to its last complete line. Returns the number of bytes moved."""
+    try:
+        with open(path, 'r+b') as file:
+            size = file.seek(0, os.SEEK_END)
+            cut = complete_size(file, size)
+            if cut == size:
+                return 0
+            file.seek(cut)
+            torn = file.read()
+            if complete is not None and complete(torn):
+                file.seek(0, os.SEEK_END)
+                file.write(b'\r\n')
+                fsync_file(file)
+                return 0
+            with open(path + ".torn", 'ab') as aside:
+                aside.write(torn + b'\n')
+                fsync_file(aside)
+            file.truncate(cut)
+            fsync_file(file)
+    except FileNotFoundError:
+        return 0
+    logging.warning(f"{path} ended in an incomplete record ({len(torn)} bytes); moved it to {path}.torn")
+    return len(torn)
+
+
+def recover_tail_once(path, complete=None):
+    """recover_tail() on the first load of path in this process only. A last
+    line without a newline found on a later load is another process's append
+    still being written, not a crash: it's left alone, and readers skip it
+    until it's complete (see complete_size)."""
+    key = os.path.abspath(path)
+    if key in _tails_checked:
+        return 0
+    _tails_checked.add(key)
+    return recover_tail(path, complete)
+
+
+class BlockSums:
+    """Optional CRC32 per CHECKSUM_BLOCK bytes of the log's append-only files,
+    kept in <name>.sums.json once `verify` has created it. An append only
+    rechecksums the block it ended in plus the new ones, and the startup
+    check only reads each file's last recorded block; verify_all() reads
+    everything."""
+
+    def __init__(self, path):
+        self.path = path
+
+    def enabled(self):
+        return os.path.exists(self.path)
+
+    def _read(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as file:
+                return json.load(file)
+        except (OSError, ValueError) as e:
+            logging.warning(f"Rebuilding unreadable checksums {self.path}: {e}")
+            return {}
+
+    def _write(self, sums):
+        with atomic_write(self.path, encoding='utf-8') as file:
+            json.dump(sums, file)
+
+    @staticmethod
+    def _blocks(path, start_block=0):
+        """CRCs of path's blocks from start_block on, and its size"""
+        crcs = []
+        with open(path, 'rb') as file:
+            file.seek(start_block * CHECKSUM_BLOCK)
+            while True:
+                block = file.read(CHECKSUM_BLOCK)
+                if not block:
+                    break
+                crcs.append(zlib.crc32(block))
+            return crcs, file.tell()
+
+    def _entry(self, path, entry=None):
+        """Checksums for path, reusing the complete blocks of `entry` if it has
+        only been appended to since"""
+        if not os.path.exists(path):
+            return None
+        start = 0
+        if entry is not None and os.path.getsize(path) >= entry['size']:
+            start = entry['size'] // CHECKSUM_BLOCK
+        crcs, size = self._blocks(path, start)
+        return {'size': size, 'blocks': (entry['blocks'][:start] if start else []) + crcs}
+
+    def update(self, paths, rewritten=False):
+        """Bring the checksums of paths up to date after appending to them, or
+        after rewriting them when `rewritten` is set"""
+        if not self.enabled():
+            return
+        sums = self._read()
+        for path in paths:
+            key = os.path.basename(path)
+            entry = self._entry(path, None if rewritten else sums.get(key))
+            if entry is None:
+                sums.pop(key, None)
+            else:
+                sums[key] = entry
+        self._write(sums)
+
+    def enable(self, paths):
+        """Start keeping checksums, taking the files as they are now to be good"""
+        sums = {}
+        for path in paths:
+            entry = self._entry(path)
+            if entry is not None:
+                sums[os.path.basename(path)] = entry
+        self._write(sums)
+
+    def disable(self):
+        if self.enabled():
+            os.remove(self.path)
+
+    def verify_tail(self, paths):
+        """Check only the last recorded block of each file; returns problems as strings"""
+        return self._verify(paths, tail=True)
+
+    def verify_all(self, paths):
+        return self._verify(paths, tail=False)
+
+    def _verify(self, paths, tail):
+        if not self.enabled():
+            return []
+        sums = self._read()
+        problems = []
+        for path in paths:
+            entry = sums.get(os.path.basename(path))
+            if entry is None:
+                continue
+            if not os.path.exists(path):
+                problems.append(f"{path} is missing")
+                continue
+            if os.path.getsize(path) < entry['size']:
+                problems.append(f"{path} is {entry['size'] - os.path.getsize(path)} bytes shorter than recorded")
+                continue
+            blocks = entry['blocks']
+            first = max(len(blocks) - 1, 0) if tail else 0
+            with open(path, 'rb') as file:
+                file.seek(first * CHECKSUM_BLOCK)
+                for number in range(first, len(blocks)):
+                    length = min(CHECKSUM_BLOCK, entry['size'] - number * CHECKSUM_BLOCK)
+                    if zlib.crc32(file.read(length)) != blocks[number]:
+                        problems.append(f"{path}: block {number} (bytes {number * CHECKSUM_BLOCK}-"
+                                        f"{number * CHECKSUM_BLOCK + length}) doesn't match its checksum")
+        return problems
@@ -0,0 +1,636 @@
+import time
+import threading
+import logging
+import tkinter as tk
+from tkinter import ttk
+
+from core import HEADER, ProfileRegistry, RapidLoggerCore
+
+REMINDER_FIRST_CHECK_MS = 5000  # After startup, once the background thread has built the reminder heap
+REMINDER_RECHECK_MS = 60 * 60 * 1000  # Longest sleep between looks at the top of the heap
+
+
+class Colors:
+    """Color constants for the application theme"""
+    BG = '#000000'
+    FG = '#ffffff'
+    ENTRY_BG = '#3b3b3b'
+    BUTTON_BG = '#404040'
+    BUTTON_HOVER = '#505050'
+    TITLE_BG = '#000000'
+    BUTTON_ACTIVE_BG = '#505050'
+    BUTTON_ACTIVE_FG = '#ffffff'
+    CLOSE_HOVER = '#bf0000'
+
+class StartupTimer:
+    """Records named checkpoints during startup and reports where the time went"""
+    def __init__(self, enabled=False, start=None):
+        self.enabled = enabled
+        self.start = start if start is not None else time.perf_counter()
+        self.marks = []
+        self.lock = threading.Lock()
+        self.pending = {'first frame', 'background'}
+
+    def mark(self, name):
+        if not self.enabled:
+            return
+        with self.lock:
+            self.marks.append((name, time.perf_counter(), threading.current_thread().name))
+
+    def done(self, phase):
+        """Flag a startup phase as finished and report once all phases are in"""
+        if not self.enabled:
+            return
+        with self.lock:
+            self.pending.discard(phase)
+            finished = not self.pending
+        if finished:
+            self.report()
+
+    def report(self):
+        lines = ["Startup timing (ms since rapidlogger was imported):"]
+        previous = self.start
+        for name, stamp, thread_name in sorted(self.marks, key=lambda m: m[1]):
+            lines.append(f"  {(stamp - self.start) * 1000:8.1f}  +{(stamp - previous) * 1000:7.1f}  {name} [{thread_name}]")
+            previous = stamp
+        report = "\n".join(lines)
+        logging.info(report)
+        print(report)
+
+
+class RapidLogger:
+    def __init__(self, root, timer=None, core=None, registry=None):
+        self.root = root
+        self.root.title("RapidLogger")
+        self.timer = timer or StartupTimer()
+        
+        # Storage and rendering; the store's lock guards the CSV/HTML files,
+        # which are touched from the UI, the startup thread and the HTTP thread
+        self.core = core or RapidLoggerCore()
+        # The server started by this window hosts every profile, not just ours
+        self.registry = registry or ProfileRegistry(self.core)
+        self.server = None
+        self.core.store.listeners.append(self.on_store_event)
+        self.reminder_job = None
+        
+        # Make window appear in taskbar and Alt+Tab
+        self.root.wm_attributes('-toolwindow', 0)
+        
+        # File paths (the files themselves are validated in the background)
+        self.csv_file = self.core.csv_file
+        self.html_file = self.core.html_file
+        
+        # Configure the root window
+        self.root.configure(bg=Colors.BG)
+        
+        # Remove default title bar and make window transparent and always on top
+        self.root.overrideredirect(True)
+        self.root.attributes('-alpha', 0.95)
+        self.root.attributes('-topmost', True)
+        
+        # Create and configure style for dark theme
+        self.style = ttk.Style()
+        self.style.configure('Dark.TFrame', background=Colors.BG)
+        self.style.configure('Dark.TLabel', 
+                           background=Colors.BG, 
+                           foreground=Colors.FG)
+        
+        self._create_title_bar()
+        self._create_main_frame()
+        self._create_input_fields()
+        self._create_buttons()
+        
+        # Setup keyboard shortcuts
+        self.root.bind('<Return>', self.handle_return)
+        self.root.bind('<Escape>', lambda e: self.minimize_window())
+        
+        # Initial window position (bottom right)
+        self.position_window()
+        self.timer.mark("ui built")
+        
+        # Server bind and file validation run once the first frame is up
+        self.root.after(0, self._on_first_frame)
+        
+    def _on_first_frame(self):
+        # Flush pending redraws so the window is on screen before we mark it
+        self.root.update_idletasks()
+        self.timer.mark("first frame")
+        self.timer.done('first frame')
+        thread = threading.Thread(target=self._background_startup, name="startup")
+        thread.daemon = True
+        thread.start()
+        self.reminder_job = self.root.after(REMINDER_FIRST_CHECK_MS, self.check_reminders)
+
+    def _background_startup(self):
+        """Deferred startup work: bind the server, validate files, warm the report"""
+        self.start_http_server()
+        self.timer.mark("http server bound")
+        self.initialize_files()
+        self.timer.mark("files validated")
+        self.core.reminders.next_due()
+        self.timer.mark("reminders scheduled")
+        self.timer.done('background')
+        
+    def _create_title_bar(self):
+        """Create the custom title bar"""
+        self.title_bar = tk.Frame(self.root, bg=Colors.TITLE_BG, height=30)
+        self.title_bar.pack(fill=tk.X)
+        self.title_bar.bind('<Button-1>', self.start_move)
+        self.title_bar.bind('<B1-Motion>', self.on_move)
+        
+        # Add title label
+        title = f"RapidLogger - {self.core.name}" if self.core.name else "RapidLogger"
+        self.title_label = tk.Label(self.title_bar, text=title, 
+                                  bg=Colors.TITLE_BG, fg=Colors.FG)
+        self.title_label.pack(side=tk.LEFT, padx=10)
+        self.title_label.bind('<Button-1>', self.start_move)
+        self.title_label.bind('<B1-Motion>', self.on_move)
+        
+        # Create close button
+        self.close_button = tk.Button(self.title_bar, text='✕', 
+                                    command=self.root.quit, 
+                                    bg=Colors.TITLE_BG, 
+                                    fg=Colors.FG,
+                                    bd=0, padx=10,
+                                    activebackground=Colors.CLOSE_HOVER,
+                                    activeforeground=Colors.FG)
+        self.close_button.pack(side=tk.RIGHT)
+        self.close_button.bind('<Enter>', lambda e: e.widget.config(bg=Colors.CLOSE_HOVER))
+        self.close_button.bind('<Leave>', lambda e: e.widget.config(bg=Colors.TITLE_BG))
+
+    def _create_main_frame(self):
+        """Create the main application frame"""
+        self.main_frame = ttk.Frame(self.root, padding="10", style='Dark.TFrame')
+        self.main_frame.pack(fill=tk.BOTH, expand=True)
+
+    def _create_input_fields(self):
+        """Create the input fields with labels"""
+        # First input frame
+        self.input_frame = ttk.Frame(self.main_frame, style='Dark.TFrame')
+        self.input_frame.pack(fill=tk.X, pady=5)
+        
+        self.input1_label = ttk.Label(self.input_frame, text="Comp:", 
+                                    style='Dark.TLabel', width=6, anchor='w')
+        self.input1_label.pack(side=tk.LEFT, padx=(0, 10))
+        self.input1 = tk.Entry(self.input_frame, width=30,
+                             bg=Colors.ENTRY_BG,
+                             fg=Colors.FG,
+                             insertbackground=Colors.FG)
+        self.input1.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        
+        # Second input frame
+        self.input2_frame = ttk.Frame(self.main_frame, style='Dark.TFrame')
+        self.input2_frame.pack(fill=tk.X, pady=5)
+        
+        self.input2_label = ttk.Label(self.input2_frame, text="Link:",
+                                    style='Dark.TLabel', width=6, anchor='w')
+        self.input2_label.pack(side=tk.LEFT, padx=(0, 10))
+        self.input2 = tk.Entry(self.input2_frame, width=30,
+                             bg=Colors.ENTRY_BG,
+                             fg=Colors.FG,
+                             insertbackground=Colors.FG)
+        self.input2.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        
+        # Optional tags, comma-separated
+        self.input3_frame = ttk.Frame(self.main_frame, style='Dark.TFrame')
+        self.input3_frame.pack(fill=tk.X, pady=5)
+        
+        self.input3_label = ttk.Label(self.input3_frame, text="Tags:",
+                                    style='Dark.TLabel', width=6, anchor='w')
+        self.input3_label.pack(side=tk.LEFT, padx=(0, 10))
+        self.input3 = tk.Entry(self.input3_frame, width=30,
+                             bg=Colors.ENTRY_BG,
+                             fg=Colors.FG,
+                             insertbackground=Colors.FG)
+        self.input3.pack(side=tk.LEFT, fill=tk.X, expand=True)
+
+    def _create_button(self, parent, text, command):
+        """Create a standardized button with hover effects"""
+        button = tk.Button(parent, text=text,
+                         command=command,
+                         bg=Colors.BUTTON_BG,
+                         fg=Colors.FG,
+                         activebackground=Colors.BUTTON_ACTIVE_BG,
+                         activeforeground=Colors.BUTTON_ACTIVE_FG,
+                         relief='flat',
+                         width=10,
+                         borderwidth=1)
+        button.bind('<Enter>', lambda e: e.widget.config(bg=Colors.BUTTON_HOVER))
+        button.bind('<Leave>', lambda e: e.widget.config(bg=Colors.BUTTON_BG))
+        return button
+
+    def _create_buttons(self):
+        """Create all action buttons"""
+        self.button_frame = ttk.Frame(self.main_frame, style='Dark.TFrame')
+        self.button_frame.pack(fill=tk.X, pady=10)
+        
+        # Create buttons using the helper method
+        self.send_button = self._create_button(self.button_frame, "Send", self.save_data)
+        self.send_button.pack(side=tk.LEFT, padx=5, expand=True)
+        
+        self.refresh_button = self._create_button(self.button_frame, "Refresh", self.refresh_view)
+        self.refresh_button.pack(side=tk.LEFT, padx=5, expand=True)
+        
+        self.edit_button = self._create_button(self.button_frame, "Edit", self.open_edit_dialog)
+        self.edit_button.pack(side=tk.LEFT, padx=5, expand=True)
+        
+        self.merge_button = self._create_button(self.button_frame, "Merge", self.open_merge_dialog)
+        self.merge_button.pack(side=tk.LEFT, padx=5, expand=True)
+
+    def position_window(self):
+        # Get screen width and height
+        screen_width = self.root.winfo_screenwidth()
+        screen_height = self.root.winfo_screenheight()
+        
+        # Calculate window size
+        self.root.update_idletasks()
+        window_width = self.root.winfo_width()
+        window_height = self.root.winfo_height()
+        
+        # Position window in middle-right with padding
+        x = screen_width - window_width - 30
+        y = (screen_height - window_height) // 2  # Center vertically
+        
+        self.root.geometry(f"+{x}+{y}")
+    
+    def handle_return(self, event):
+        # If focus is on company field, move to link field
+        if self.root.focus_get() == self.input1:
+            self.input2.focus_set()
+        # If focus is on the link or tags field, save the data and flash the send button
+        elif self.root.focus_get() in (self.input2, self.input3):
+            self.flash_button(self.send_button)
+            self.save_data()
+            # Return focus to company field for next entry
+            self.input1.focus_set()
+    
+    def minimize_window(self):
+        self.root.iconify()
+        
+    def start_move(self, event):
+        self.x = event.x
+        self.y = event.y
+
+    def on_move(self, event):
+        deltax = event.x - self.x
+        deltay = event.y - self.y
+        x = self.root.winfo_x() + deltax
+        y = self.root.winfo_y() + deltay
+        self.root.geometry(f"+{x}+{y}")
+
+    def initialize_files(self):
+        self.core.initialize_files()
+
+    def refresh_view(self):
+        """Open the report in the browser"""
+        import webbrowser
+        if self.server is not None:
+            # Served from memory with cacheable assets and an ETag, so a repeat
+            # view costs a 304 instead of re-reading the whole HTML file
+            webbrowser.open(self.core.api_base + '/')
+            return
+        self.update_html_file()
+        webbrowser.open(self.html_file)
+
+    def update_html_file(self):
+        """Bring the report up to date now rather than on the scheduler's next tick"""
+        self.core.flush_report(force=True)
+
+    def save_data(self):
+        input1_value = self.input1.get()
+        input2_value = self.input2.get()
+        input3_value = self.input3.get()
+        
+        if not input1_value or not input2_value:
+            return
+        
+        try:
+            from tags import parse_tags
+            tags = parse_tags(input3_value)
+        except ValueError as e:
+            logging.error(f"Not saving entry: {e}")
+            self.input3.config(bg=Colors.CLOSE_HOVER)
+            self.root.after(600, lambda: self.input3.config(bg=Colors.ENTRY_BG))
+            return
+        
+        self.core.add_entry(input1_value, input2_value, tags)
+        self.schedule_reminders()
+        
+        # Clear input fields (tags stay, they're often the same for a batch)
+        self.input1.delete(0, tk.END)
+        self.input2.delete(0, tk.END)
+
+    def check_reminders(self):
+        """Show reminders that have come due, then sleep until the next one"""
+        self.reminder_job = None
+        try:
+            due = self.core.reminders.pop_due()
+        except Exception as e:
+            logging.error(f"Error checking reminders: {e}")
+            due = []
+        if due:
+            if getattr(self, 'reminder_dialog', None) and self.reminder_dialog.window.winfo_exists():
+                self.reminder_dialog.add(due)
+            else:
+                self.reminder_dialog = ReminderDialog(self, due)
+        self.schedule_reminders()
+
+    def schedule_reminders(self):
+        """(Re)arm the timer for the earliest pending reminder; a peek at the heap, not a scan"""
+        if self.reminder_job is not None:
+            self.root.after_cancel(self.reminder_job)
+        from datetime import datetime
+        delay = REMINDER_RECHECK_MS
+        try:
+            due = self.core.reminders.next_due()
+        except Exception as e:
+            logging.error(f"Error scheduling reminders: {e}")
+            due = None
+        if due is not None:
+            delay = min(delay, max(0, int((due - datetime.now()).total_seconds() * 1000)))
+        self.reminder_job = self.root.after(delay, self.check_reminders)
+
+    def open_edit_dialog(self):
+        """Open the dialog for editing or deleting an existing entry"""
+        if getattr(self, 'edit_dialog', None) and self.edit_dialog.window.winfo_exists():
+            self.edit_dialog.window.lift()
+            return
+        self.edit_dialog = EditDialog(self)
+
+    def open_merge_dialog(self):
+        """Open the dialog that merges spellings of the same company"""
+        if getattr(self, 'merge_dialog', None) and self.merge_dialog.window.winfo_exists():
+            self.merge_dialog.window.lift()
+            return
+        self.merge_dialog = MergeDialog(self)
+
+    def flash_button(self, button):
+        """Creates a quick flash effect on the button"""
+        original_color = button.cget('bg')
+        button.config(bg='#606060')
+        self.root.after(100, lambda: button.config(bg=original_color))
+
+    def start_http_server(self):
+        """Start the HTTP server in a separate thread"""
+        try:
+            from server import AsyncServer
+            server = AsyncServer(self.registry, 'localhost', 8000)
+            server.start_in_thread()
+            self.server = server  # Only once bound; refresh_view falls back to the file otherwise
+            logging.info("RapidLogger HTTP server started successfully on port 8000")
+        except Exception as e:
+            logging.error(f"Error starting HTTP server: {e}")
+            logging.error("The application will continue to run, but status updates may not work")
+
+    def on_store_event(self, event):
+        """Store listener: a status change, wherever it came from (the report
+        page goes through the server thread), can move the next reminder, so
+        the timer is re-armed on the Tk thread"""
+        if event.get("type") == "status":
+            self.root.after(0, self.schedule_reminders)
+
+
+class EditDialog:
+    """Small window to change the company/link, tags, optional columns and note
+    of an entry by ID, or delete it"""
+    def __init__(self, app):
+        self.app = app
+        self.window = tk.Toplevel(app.root)
+        self.window.title("Edit entry")
+        self.window.configure(bg=Colors.BG)
+        self.window.attributes('-topmost', True)
+        
+        frame = ttk.Frame(self.window, padding="10", style='Dark.TFrame')
+        frame.pack(fill=tk.BOTH, expand=True)
+        
+        # The log's optional columns (see core.Schema) get a field each
+        self.columns = app.core.store.schema.columns[len(HEADER):]
+        labels = ["ID:", "Comp:", "Link:", "Tags:"] + [f"{name}:" for name in self.columns]
+        width = max(6, *(len(label) for label in labels))
+        self.entries = {}
+        for label in labels:
+            row = ttk.Frame(frame, style='Dark.TFrame')
+            row.pack(fill=tk.X, pady=5)
+            ttk.Label(row, text=label, style='Dark.TLabel', width=width, anchor='w').pack(side=tk.LEFT, padx=(0, 10))
+            entry = tk.Entry(row, width=30, bg=Colors.ENTRY_BG, fg=Colors.FG, insertbackground=Colors.FG)
+            entry.pack(side=tk.LEFT, fill=tk.X, expand=True)
+            self.entries[label] = entry
+        
+        # Notes live outside the CSV and are only read once an entry is loaded
+        row = ttk.Frame(frame, style='Dark.TFrame')
+        row.pack(fill=tk.X, pady=5)
+        ttk.Label(row, text="Notes:", style='Dark.TLabel', width=width, anchor='nw').pack(side=tk.LEFT, padx=(0, 10))
+        self.notes = tk.Text(row, width=30, height=4, wrap='word', bg=Colors.ENTRY_BG, fg=Colors.FG,
+                             insertbackground=Colors.FG)
+        self.notes.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        
+        self.loaded = None  # (ID, company, link, fields, tags, note) as last loaded or saved
+        self.message = ttk.Label(frame, text="Enter an ID and press Enter", style='Dark.TLabel')
+        self.message.pack(fill=tk.X)
+        
+        buttons = ttk.Frame(frame, style='Dark.TFrame')
+        buttons.pack(fill=tk.X, pady=10)
+        app._create_button(buttons, "Save", self.save).pack(side=tk.LEFT, padx=5, expand=True)
+        app._create_button(buttons, "Delete", self.delete).pack(side=tk.LEFT, padx=5, expand=True)
+        
+        self.entries["ID:"].bind('<Return>', lambda e: self.load())
+        self.window.bind('<Escape>', lambda e: self.window.destroy())
+        self.entries["ID:"].focus_set()
+
+    def load(self):
+        row = self.app.core.store.get(self.entries["ID:"].get().strip())
+        if row is None:
+            self.message.config(text="No entry with that ID")
+            return
+        tags = self.app.core.tags.tags_of(row[0])
+        fields = dict(zip(self.columns, row[len(HEADER):]))
+        note = self.app.core.notes.get(row[0])
+        values = [("Comp:", row[2]), ("Link:", row[3]), ("Tags:", ", ".join(tags))]
+        values += [(f"{name}:", value) for name, value in fields.items()]
+        for label, value in values:
+            self.entries[label].delete(0, tk.END)
+            self.entries[label].insert(0, value)
+        self.notes.delete('1.0', tk.END)
+        self.notes.insert('1.0', note)
+        # What save() compares against, so it only writes what was changed
+        self.loaded = (row[0], row[2], row[3], fields, tags, note)
+        self.message.config(text=f"Editing #{row[0]} ({row[4]})")
+        self.entries["Comp:"].focus_set()
+
+    def save(self):
+        row_id = self.entries["ID:"].get().strip()
+        company = self.entries["Comp:"].get().strip()
+        link = self.entries["Link:"].get().strip()
+        if not row_id or not company or not link:
+            self.message.config(text="ID, company and link are all required")
+            return
+        try:
+            from tags import parse_tags
+            tags = parse_tags(self.entries["Tags:"].get())
+        except ValueError as e:
+            self.message.config(text=str(e))
+            return
+        fields = {name: self.entries[f"{name}:"].get().strip() for name in self.columns}
+        note = self.notes.get('1.0', tk.END).strip()
+        core = self.app.core
+        # An untouched Save writes nothing: every write appends a record,
+        # and superseded records are what set off a compaction
+        loaded = self.loaded if self.loaded and self.loaded[0] == row_id else (row_id, None, None, None, None, None)
+        saved = True
+        if (company, link, fields) != loaded[1:4]:
+            saved = core.edit_entry(row_id, company, link, fields)
+        if saved and tags != loaded[4]:
+            saved = core.set_tags(row_id, tags)
+        if saved and note != loaded[5]:
+            saved = core.set_note(row_id, note)
+        if saved:
+            self.loaded = (row_id, company, link, fields, tags, note)
+            self.message.config(text=f"Saved #{row_id}")
+        else:
+            self.message.config(text="No entry with that ID")
+
+    def delete(self):
+        row_id = self.entries["ID:"].get().strip()
+        if self.app.core.delete_entry(row_id):
+            self.message.config(text=f"Deleted #{row_id}")
+            for entry in self.entries.values():
+                entry.delete(0, tk.END)
+            self.notes.delete('1.0', tk.END)
+            self.entries["ID:"].focus_set()
+        else:
+            self.message.config(text="No entry with that ID")
+
+
+class MergeDialog:
+    """Lists company names that look like the same company and renames a group
+    to one canonical name"""
+    def __init__(self, app):
+        self.app = app
+        self.groups = []
+        self.window = tk.Toplevel(app.root)
+        self.window.title("Merge companies")
+        self.window.configure(bg=Colors.BG)
+        self.window.attributes('-topmost', True)
+        
+        frame = ttk.Frame(self.window, padding="10", style='Dark.TFrame')
+        frame.pack(fill=tk.BOTH, expand=True)
+        
+        self.listbox = tk.Listbox(frame, width=50, height=8, bg=Colors.ENTRY_BG, fg=Colors.FG,
+                                  selectbackground=Colors.BUTTON_HOVER, activestyle='none')
+        self.listbox.pack(fill=tk.BOTH, expand=True)
+        self.listbox.bind('<<ListboxSelect>>', lambda e: self.select())
+        
+        row = ttk.Frame(frame, style='Dark.TFrame')
+        row.pack(fill=tk.X, pady=5)
+        ttk.Label(row, text="Name:", style='Dark.TLabel', width=6, anchor='w').pack(side=tk.LEFT, padx=(0, 10))
+        self.name = tk.Entry(row, width=30, bg=Colors.ENTRY_BG, fg=Colors.FG, insertbackground=Colors.FG)
+        self.name.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        
+        self.message = ttk.Label(frame, text="", style='Dark.TLabel')
+        self.message.pack(fill=tk.X)
+        
+        buttons = ttk.Frame(frame, style='Dark.TFrame')
+        buttons.pack(fill=tk.X, pady=10)
+        app._create_button(buttons, "Merge", self.merge).pack(side=tk.LEFT, padx=5, expand=True)
+        
+        self.name.bind('<Return>', lambda e: self.merge())
+        self.window.bind('<Escape>', lambda e: self.window.destroy())
+        self.load()
+
+    def load(self):
+        self.groups = self.app.core.company_clusters()
+        self.listbox.delete(0, tk.END)
+        for group in self.groups:
+            others = ", ".join(entry["name"] for entry in group["names"][1:])
+            self.listbox.insert(tk.END, f'{group["canonical"]} \u2190 {others} ({group["count"]})')
+        self.message.config(text=f"{len(self.groups)} companies with several spellings" if self.groups
+                            else "No look-alike company names")
+
+    def select(self):
+        selection = self.listbox.curselection()
+        if not selection:
+            return
+        self.name.delete(0, tk.END)
+        self.name.insert(0, self.groups[selection[0]]["canonical"])
+
+    def merge(self):
+        selection = self.listbox.curselection()
+        canonical = self.name.get().strip()
+        if not selection or not canonical:
+            self.message.config(text="Pick a group and a name to merge it into")
+            return
+        names = [entry["name"] for entry in self.groups[selection[0]]["names"]]
+        if self.app.core.merge_companies(names, canonical):
+            self.message.config(text=f"Merged into {canonical}")
+        self.load()
+
+
+class ReminderDialog:
+    """Lists reminders that have come due. Done marks one finished; Later (or
+    just closing the window) brings it back in a day."""
+    def __init__(self, app, reminders):
+        self.app = app
+        self.reminders = []
+        self.window = tk.Toplevel(app.root)
+        self.window.title("Reminders")
+        self.window.configure(bg=Colors.BG)
+        self.window.attributes('-topmost', True)
+        
+        frame = ttk.Frame(self.window, padding="10", style='Dark.TFrame')
+        frame.pack(fill=tk.BOTH, expand=True)
+        
+        self.listbox = tk.Listbox(frame, width=60, height=8, bg=Colors.ENTRY_BG, fg=Colors.FG,
+                                  selectbackground=Colors.BUTTON_HOVER, activestyle='none',
+                                  selectmode=tk.EXTENDED)
+        self.listbox.pack(fill=tk.BOTH, expand=True)
+        self.listbox.bind('<Double-Button-1>', lambda e: self.open_link())
+        
+        self.message = ttk.Label(frame, text="", style='Dark.TLabel')
+        self.message.pack(fill=tk.X)
+        
+        buttons = ttk.Frame(frame, style='Dark.TFrame')
+        buttons.pack(fill=tk.X, pady=10)
+        app._create_button(buttons, "Done", self.done).pack(side=tk.LEFT, padx=5, expand=True)
+        app._create_button(buttons, "Later", self.later).pack(side=tk.LEFT, padx=5, expand=True)
+        app._create_button(buttons, "Open", self.open_link).pack(side=tk.LEFT, padx=5, expand=True)
+        
+        self.window.bind('<Escape>', lambda e: self.window.destroy())
+        self.add(reminders)
+
+    def add(self, reminders):
+        known = {reminder["id"] for reminder in self.reminders}
+        self.reminders += [reminder for reminder in reminders if reminder["id"] not in known]
+        self.load()
+        self.window.lift()
+
+    def load(self):
+        self.listbox.delete(0, tk.END)
+        for reminder in self.reminders:
+            self.listbox.insert(tk.END, f'#{reminder["id"]} {reminder["message"]}')
+        self.message.config(text=f"{len(self.reminders)} to follow up (double-click opens the job link)")
+
+    def selected(self):
+        """The selected reminders, or all of them if none is selected"""
+        selection = self.listbox.curselection()
+        return [self.reminders[i] for i in selection] if selection else list(self.reminders)
+
+    def done(self):
+        self._finish(self.app.core.reminders.dismiss)
+
+    def later(self):
+        self._finish(self.app.core.reminders.snooze)
+
+    def _finish(self, action):
+        for reminder in self.selected():
+            action(reminder["id"])
+            self.reminders.remove(reminder)
+        if not self.reminders:
+            self.window.destroy()
+            return
+        self.load()
+        self.app.schedule_reminders()
+
+    def open_link(self):
+        import webbrowser
+        for reminder in self.selected()[:1]:
+            webbrowser.open(reminder["link"])
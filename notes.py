@@ -0,0 +1,114 @@
+import json
+import os
+
+from durable import WatchedFile, append_durably, recover_tail_once
+
+NOTES_COMPACT_RATIO = 0.5  # Superseded records / all records before the notes file is rewritten
+
+
+class NoteStore:
+    """Free-text notes, at most one per row, kept out of the CSV in
+    <name>.notes.jsonl as ["id", "text"] lines, where the last line for an ID
+    wins and ["id"] removes its note. Only ID -> (offset, length) is held in
+    memory, built on first use; a note's text is read from disk when it's
+    asked for, so long notes cost nothing until someone opens one."""
+
+    def __init__(self, store):
+        self.store = store
+        self.path = os.path.splitext(store.csv_file)[0] + ".notes.jsonl"
+        self.lock = store.lock
+        self.offsets = None  # ID -> (byte offset, length) of its latest record; loaded on first use
+        self.records = 0
+        self.file = WatchedFile(self.path)
+
+    def _ensure_loaded(self):
+        # Another process may have written a note since we last looked
+        if self.offsets is None or self.file.changed():
+            self._load()
+
+    def _load(self):
+        """Index the file without decoding any note: the ID is the first string on each
+        line. A torn last line is cut off on the first load in this process only."""
+        offsets = {}
+        self.records = 0
+        recover_tail_once(self.path)
+        self.file.seen()
+        if os.path.exists(self.path):
+            with open(self.path, 'rb') as file:
+                offset = 0
+                for line in file:
+                    if not line.endswith(b'\n'):
+                        break  # Another process's note, still being written
+                    end = line.find(b'"', 2) if line.startswith(b'["') else -1
+                    if end > 0:
+                        self.records += 1
+                        row_id = line[2:end].decode('ascii')
+                        if line.rstrip() == line[:end + 1] + b']':
+                            offsets.pop(row_id, None)
+                        else:
+                            offsets[row_id] = (offset, len(line))
+                    offset += len(line)
+        self.offsets = offsets
+
+    def ids(self):
+        """IDs of the rows that have a note"""
+        with self.lock:
+            self._ensure_loaded()
+            return set(self.offsets)
+
+    def get(self, row_id):
+        """The row's note, or '' if it has none"""
+        with self.lock:
+            self._ensure_loaded()
+            location = self.offsets.get(str(row_id))
+            if location is None:
+                return ""
+            with open(self.path, 'rb') as file:
+                file.seek(location[0])
+                return json.loads(file.read(location[1]))[1]
+
+    def set(self, row_id, text):
+        """Replace the note of one row ('' removes it); returns False if the ID isn't in the log"""
+        row_id = str(row_id)
+        text = text.strip()
+        with self.lock:
+            if self.store.get(row_id) is None:
+                return False
+            self._ensure_loaded()
+            if not text and row_id not in self.offsets:
+                return True
+            # ASCII-only JSON, so a note is always exactly one line
+            line = (json.dumps([row_id, text] if text else [row_id]) + "\n").encode('ascii')
+            offset = append_durably(self.path, line)
+            self.store.sums.update([self.path])
+            self.records += 1
+            if text:
+                self.offsets[row_id] = (offset, len(line))
+            else:
+                del self.offsets[row_id]
+            self.file.seen()
+            if self.records - len(self.offsets) > NOTES_COMPACT_RATIO * self.records:
+                self._compact()
+        return True
+
+    def _compact(self):
+        """Rewrite the notes file with one record per row still in the log;
+        skipped if another process appends to it in the meantime"""
+        self._ensure_loaded()
+        self.store.current_version()
+        live = self.store.view.live()
+        offsets = {}
+
+        def write(target):
+            with open(self.path, 'rb') as source:
+                for row_id, (offset, length) in sorted(self.offsets.items(), key=lambda item: int(item[0])):
+                    if int(row_id) not in live:
+                        continue
+                    source.seek(offset)
+                    offsets[row_id] = (target.tell(), length)
+                    target.write(source.read(length))
+
+        if self.file.rewrite(write, 'wb'):
+            self.store.sums.update([self.path], rewritten=True)
+            self.offsets = offsets
+            self.records = len(offsets)
@@ -0,0 +1,187 @@
+import heapq
+import json
+import logging
+import os
+from datetime import date, datetime, timedelta
+
+from core import resolve_date
+from durable import atomic_write
+
+# Status -> (days in that status before a reminder, what to do about it)
+REMINDER_RULES = {
+    "Applied": (7, "follow up on the application"),
+    "Interview": (3, "ask how the interview went"),
+}
+SNOOZE = timedelta(days=1)  # How long a reminder that was shown but not marked done stays quiet
+
+
+class Reminders:
+    """Follow-up reminders for one log: a min-heap of (time, ID, status), one
+    live entry per row whose status has a rule in REMINDER_RULES. Inserts,
+    status changes and deletes made through the store push or invalidate a
+    single entry, so finding what is due only looks at the top of the heap.
+    Superseded heap entries are skipped when they surface rather than removed.
+
+    Reminders that were shown are kept in <name>.reminders.json as ID ->
+    [status, quiet until], or null for until once marked done, so they don't
+    come back on the next start. A status change starts a fresh reminder."""
+
+    def __init__(self, store, rules=REMINDER_RULES):
+        self.store = store
+        self.rules = rules
+        self.path = os.path.splitext(store.csv_file)[0] + ".reminders.json"
+        self.lock = store.lock
+        self.heap = []
+        self.entries = None  # ID -> (time, status) of its current heap entry; built on first use
+        self.handled = self._read_handled()
+        self.seen = None  # Store version the entries reflect
+        store.listeners.append(self._on_event)
+
+    def _read_handled(self):
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as file:
+                return json.load(file)['handled']
+        except (OSError, KeyError, TypeError, ValueError) as e:
+            logging.warning(f"Ignoring malformed reminders file {self.path}: {e}")
+            return {}
+
+    def _save_handled(self):
+        with atomic_write(self.path, encoding='utf-8') as file:
+            json.dump({"handled": self.handled}, file)
+
+    def _ensure_built(self):
+        # Writes from other processes arrive without an event: rebuild from the log
+        if self.entries is None or self.store.current_version() != self.seen:
+            self._build()
+
+    def _build(self):
+        """One pass over the log and the status events: each row's reminder is
+        due a rule's number of days after it entered its current status"""
+        rows = self.store.read()
+        changed = {}  # ID -> (status, time) of its latest status event
+        for row_id, old, new, stamp in self.store.status_events():
+            changed[row_id] = (new, stamp)
+        today = date.today()
+        self.entries = {}
+        self.heap = []
+        for row in rows:
+            since = None
+            if row[0] in changed and changed[row[0]][0] == row[4]:
+                try:
+                    since = datetime.fromisoformat(changed[row[0]][1])
+                except ValueError:
+                    pass
+            self._schedule(row[0], row[4], since or self._added(row, today), push=False)
+        heapq.heapify(self.heap)
+        self.seen = self.store.version
+
+    @staticmethod
+    def _added(row, today=None):
+        try:
+            return datetime.combine(resolve_date(row[1], today or date.today()), datetime.min.time())
+        except ValueError:
+            return datetime.now()
+
+    def _schedule(self, row_id, status, since, push=True):
+        rule = self.rules.get(status)
+        handled = self.handled.get(row_id)
+        if handled is not None and handled[0] == status:
+            when = None if handled[1] is None else datetime.fromisoformat(handled[1])
+        else:
+            when = since + timedelta(days=rule[0]) if rule else None
+        if when is None:
+            self.entries.pop(row_id, None)
+            return
+        self.entries[row_id] = (when, status)
+        item = (when, int(row_id), status)
+        if push:
+            heapq.heappush(self.heap, item)
+        else:
+            self.heap.append(item)
+
+    def _on_event(self, event):
+        with self.lock:
+            if self.entries is None:
+                return
+            if event['type'] == 'insert':
+                self._schedule(event['row'][0], event['row'][4], self._added(event['row']))
+            elif event['type'] == 'status':
+                if self.handled.pop(event['id'], None) is not None:
+                    self._save_handled()
+                self._schedule(event['id'], event['status'], datetime.now())
+            elif event['type'] == 'delete':
+                self.entries.pop(event['id'], None)
+                if self.handled.pop(event['id'], None) is not None:
+                    self._save_handled()
+            self.seen = self.store.version
+
+    def _top(self):
+        """The heap's earliest live entry, dropping superseded ones on the way"""
+        while self.heap:
+            when, row_id, status = self.heap[0]
+            if self.entries.get(str(row_id)) == (when, status):
+                return self.heap[0]
+            heapq.heappop(self.heap)
+        return None
+
+    def _reminder(self, row_id, status, when):
+        row = self.store.get(row_id)
+        days, advice = self.rules[status]
+        return {"id": row_id, "company": row[2], "link": row[3], "status": status,
+                "at": when.isoformat(timespec='minutes'),
+                "message": f"{row[2]}: {status} for {days}+ days, {advice}"}
+
+    def next_due(self):
+        """When the earliest pending reminder is due, or None if there are none"""
+        with self.lock:
+            self._ensure_built()
+            top = self._top()
+            return top[0] if top else None
+
+    def pop_due(self, now=None):
+        """Reminders due by `now`, earliest first. Each is put off by SNOOZE
+        until dismiss() marks it done."""
+        now = now or datetime.now()
+        due = []
+        with self.lock:
+            self._ensure_built()
+            while True:
+                top = self._top()
+                if top is None or top[0] > now:
+                    break
+                when, row_id, status = heapq.heappop(self.heap)
+                row_id = str(row_id)
+                due.append(self._reminder(row_id, status, when))
+                self.handled[row_id] = [status, (now + SNOOZE).isoformat(timespec='seconds')]
+                self._schedule(row_id, status, None)
+            if due:
+                self._save_handled()
+        return due
+
+    def snooze(self, row_id, delay=SNOOZE):
+        """Show a reminder again after `delay`"""
+        self._handle(str(row_id), (datetime.now() + delay).isoformat(timespec='seconds'))
+
+    def dismiss(self, row_id):
+        """Mark a reminder done; the row gets a new one when its status changes"""
+        self._handle(str(row_id), None)
+
+    def _handle(self, row_id, until):
+        with self.lock:
+            self._ensure_built()
+            entry = self.entries.get(row_id)
+            status = entry[1] if entry else self.handled.get(row_id, [None])[0]
+            if status is None:
+                return
+            self.handled[row_id] = [status, until]
+            self._schedule(row_id, status, None)
+            self._save_handled()
+
+    def pending(self):
+        """Every scheduled reminder, earliest first, without changing any of them"""
+        with self.lock:
+            self._ensure_built()
+            return [self._reminder(row_id, status, when)
+                    for row_id, (when, status) in sorted(self.entries.items(), key=lambda item: item[1])]
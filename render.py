@@ -0,0 +1,990 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from html import escape
+
+from core import DEFAULT_API_BASE, HEADER, STATUSES
+from durable import atomic_write
+
+# Static parts of the report page, shared by every profile. The server address
+# and the table header and body are filled in by render_html between these pieces.
+# The stylesheet and script are inlined into the report file, and served as
+# separate cacheable assets (see ASSETS) when the server hosts the page.
+PAGE_START = """
+        <html>
+        <head>
+            <meta charset="UTF-8">
+"""
+
+STYLESHEET = """\
+                body {
+                    font-family: Arial, sans-serif;
+                    margin: 20px;
+                    background-color: #FFF8E7;
+                    color: #333;
+                }
+                .stats-panel {
+                    display: grid;
+                    grid-template-columns: repeat(auto-fit, minmax(160px, 1fr));
+                    gap: 10px;
+                    margin-bottom: 16px;
+                }
+                .stat-card {
+                    background: white;
+                    padding: 12px;
+                    border-radius: 10px;
+                    box-shadow: 0 2px 4px rgba(0,0,0,0.05);
+                    border: 1px solid rgba(226, 232, 240, 0.8);
+                    position: relative;
+                    overflow: hidden;
+                }
+                .stat-card::before {
+                    content: '';
+                    position: absolute;
+                    top: 0;
+                    left: 0;
+                    right: 0;
+                    height: 3px;
+                }
+                /* Card top borders colors */
+                .stat-card:nth-child(1)::before {
+                    background: #60A5FA;  /* Blue */
+                }
+                .stat-card:nth-child(2)::before {
+                    background: #A78BFA;  /* Purple */
+                }
+                .stat-card:nth-child(3)::before {
+                    background: #34D399;  /* Teal */
+                }
+                .stat-card:nth-child(4)::before {
+                    background: #FB923C;  /* Orange */
+                }
+                .stat-card:nth-child(5)::before {
+                    background: #60A5FA;  /* Blue */
+                }
+                /* Value colors matching the borders */
+                #todayCount {
+                    color: #60A5FA;  /* Blue */
+                }
+                #totalCount {
+                    color: #A78BFA;  /* Purple */
+                }
+                #interviewCount {
+                    color: #34D399;  /* Teal */
+                }
+                #responseRate {
+                    color: #FB923C;  /* Orange */
+                }
+                .stat-header {
+                    display: flex;
+                    align-items: center;
+                    gap: 5px;
+                    margin-bottom: 8px;
+                }
+                .stat-icon {
+                    width: 14px;
+                    height: 14px;
+                    opacity: 0.8;
+                }
+                .stat-title {
+                    color: #475569;
+                    font-size: 12px;
+                    font-weight: 600;
+                    letter-spacing: 0.2px;
+                }
+                .stat-value {
+                    font-size: 24px;
+                    font-weight: 600;
+                    margin: 3px 0;
+                    font-family: 'Segoe UI', system-ui, sans-serif;
+                    letter-spacing: -0.3px;
+                }
+                .stat-subtext {
+                    color: #94A3B8;
+                    font-size: 11px;
+                    line-height: 1.3;
+                }
+                .trend-card {
+                    background: white;
+                    padding: 12px;
+                    border-radius: 10px;
+                    box-shadow: 0 2px 4px rgba(0,0,0,0.05);
+                    border: 1px solid rgba(226, 232, 240, 0.8);
+                    position: relative;
+                    overflow: hidden;
+                }
+                .trend-card::before {
+                    content: '';
+                    position: absolute;
+                    top: 0;
+                    left: 0;
+                    right: 0;
+                    height: 3px;
+                    background: #60A5FA;  /* Blue */
+                }
+                .trend-title {
+                    color: #475569;
+                    font-size: 13px;
+                    font-weight: 600;
+                    margin-bottom: 8px;
+                    letter-spacing: 0.3px;
+                }
+                .trend-bars {
+                    display: flex;
+                    align-items: flex-end;
+                    gap: 3px;
+                    height: 25px;
+                    margin-top: 12px;
+                }
+                .trend-bar {
+                    flex: 1;
+                    background: #e2e8f0;
+                    border-radius: 3px;
+                    position: relative;
+                    min-height: 3px;
+                    transition: all 0.3s ease;
+                }
+                .trend-bar-fill {
+                    position: absolute;
+                    bottom: 0;
+                    left: 0;
+                    width: 100%;
+                    background: #2563eb;
+                    border-radius: 3px;
+                    transition: height 0.3s ease;
+                }
+                .trend-bar-count {
+                    position: absolute;
+                    top: -14px;
+                    left: 50%;
+                    transform: translateX(-50%);
+                    font-size: 10px;
+                    color: #475569;
+                    font-weight: 600;
+                }
+                .trend-dates {
+                    display: flex;
+                    justify-content: space-between;
+                    margin-top: 4px;
+                    color: #64748b;
+                    font-size: 9px;
+                }
+                .controls {
+                    padding: 0 0 10px 0;
+                    display: flex;
+                    gap: 20px;
+                    align-items: center;
+                }
+                .pagination {
+                    display: flex;
+                    justify-content: center;
+                    align-items: center;
+                    margin: 20px 0;
+                    gap: 10px;
+                }
+                .pagination button {
+                    padding: 8px 12px;
+                    border: 2px solid #E2E8F0;
+                    background: white;
+                    color: #2c3e50;
+                    border-radius: 8px;
+                    cursor: pointer;
+                    font-size: 14px;
+                    transition: all 0.2s ease;
+                }
+                .pagination button:hover {
+                    border-color: #6D9DC5;
+                    background: #F8FAFC;
+                }
+                .pagination button:disabled {
+                    opacity: 0.5;
+                    cursor: not-allowed;
+                    border-color: #E2E8F0;
+                }
+                .pagination-info {
+                    color: #64748B;
+                    font-size: 14px;
+                }
+                .search-container {
+                    flex: 1;
+                    position: relative;
+                }
+                .search-container::before {
+                    content: '';
+                    position: absolute;
+                    left: 12px;
+                    top: 50%;
+                    transform: translateY(-50%);
+                    width: 16px;
+                    height: 16px;
+                    background-image: url("data:image/svg+xml,%3Csvg xmlns='http://www.w3.org/2000/svg' width='16' height='16' viewBox='0 0 24 24' fill='none' stroke='%23475569' stroke-width='2' stroke-linecap='round' stroke-linejoin='round'%3E%3Ccircle cx='11' cy='11' r='8'%3E%3C/circle%3E%3Cline x1='21' y1='21' x2='16.65' y2='16.65'%3E%3C/line%3E%3C/svg%3E");
+                    background-repeat: no-repeat;
+                    background-position: center;
+                    opacity: 0.8;
+                }
+                .search-box {
+                    width: 100%;
+                    padding: 10px 10px 10px 35px;
+                    border: 2px solid #E2E8F0;
+                    border-radius: 20px;
+                    font-size: 14px;
+                    outline: none;
+                    transition: all 0.2s ease;
+                    background-color: white;
+                    color: #2c3e50;
+                }
+                .search-box::placeholder {
+                    color: #94A3B8;
+                    opacity: 0.7;
+                }
+                .search-box:hover {
+                    border-color: #CBD5E1;
+                }
+                .search-box:focus {
+                    border-color: #6D9DC5;
+                    box-shadow: 0 2px 8px rgba(109, 157, 197, 0.15);
+                }
+                .filter-select {
+                    padding: 10px 35px 10px 15px;
+                    border: 2px solid #E2E8F0;
+                    border-radius: 20px;
+                    font-size: 14px;
+                    outline: none;
+                    min-width: 140px;
+                    cursor: pointer;
+                    background-color: white;
+                    color: #2c3e50;
+                    transition: all 0.2s ease;
+                    appearance: none;
+                    background-image: url("data:image/svg+xml,%3Csvg xmlns='http://www.w3.org/2000/svg' width='24' height='24' viewBox='0 0 24 24' fill='none' stroke='%2394A3B8' stroke-width='2' stroke-linecap='round' stroke-linejoin='round'%3E%3Cpolyline points='6 9 12 15 18 9'%3E%3C/polyline%3E%3C/svg%3E");
+                    background-repeat: no-repeat;
+                    background-position: right 10px center;
+                    background-size: 16px;
+                }
+                .filter-select:hover {
+                    border-color: #CBD5E1;
+                }
+                .filter-select:focus {
+                    border-color: #6D9DC5;
+                    box-shadow: 0 2px 8px rgba(109, 157, 197, 0.15);
+                }
+                table {
+                    width: 100%;
+                    border-collapse: separate;
+                    border-spacing: 0;
+                    background-color: white;
+                    box-shadow: 0 2px 15px rgba(0,0,0,0.1);
+                    margin-top: 10px;
+                    border-radius: 8px;
+                    overflow: hidden;
+                    font-size: 13px;
+                }
+                th, td {
+                    padding: 10px 15px;
+                    text-align: center;
+                    border-bottom: 1px solid #E2E8F0;
+                    transition: background-color 0.2s ease;
+                }
+                th {
+                    background-color: #2A4365;
+                    color: white;
+                    font-weight: 600;
+                    font-size: 13px;
+                    text-transform: uppercase;
+                    letter-spacing: 0.5px;
+                    padding: 12px 15px;
+                }
+                tr:last-child td {
+                    border-bottom: none;
+                }
+                tr:hover td {
+                    background-color: #F5F6F7;
+                }
+                td:first-child {
+                    width: 50px;
+                    font-weight: 600;
+                    color: #2c3e50;
+                }
+                td:nth-child(2) {
+                    width: 80px;
+                    color: #666;
+                }
+                td:nth-child(3) {
+                    min-width: 150px;
+                }
+                td:nth-child(4) {
+                    min-width: 200px;
+                }
+                td:nth-child(5) {
+                    width: 120px;
+                }
+                td.row-actions {
+                    width: 60px;
+                    white-space: nowrap;
+                }
+                .row-actions button {
+                    border: none;
+                    background: none;
+                    color: #94A3B8;
+                    cursor: pointer;
+                    font-size: 14px;
+                    padding: 2px 4px;
+                }
+                .row-actions button:hover {
+                    color: #2c3e50;
+                }
+                .tag {
+                    display: inline-block;
+                    background: #E2E8F0;
+                    color: #475569;
+                    border-radius: 8px;
+                    font-size: 11px;
+                    padding: 1px 6px;
+                    margin-right: 4px;
+                }
+                a {
+                    color: #3498db;
+                    text-decoration: none;
+                    transition: color 0.2s ease;
+                    display: inline-block;
+                    max-width: 300px;
+                    overflow: hidden;
+                    text-overflow: ellipsis;
+                    white-space: nowrap;
+                    font-size: 13px;
+                }
+                a:hover {
+                    color: #2980b9;
+                    text-decoration: none;
+                }
+                .status-select {
+                    width: 100%;
+                    padding: 6px 10px;
+                    border-radius: 15px;
+                    border: none;
+                    font-size: 13px;
+                    color: white;
+                    cursor: pointer;
+                    transition: all 0.2s ease;
+                    outline: none;
+                    box-shadow: 0 1px 3px rgba(0,0,0,0.1);
+                }
+                .status-select:hover {
+                    box-shadow: 0 4px 8px rgba(0,0,0,0.15);
+                }
+                .status-select option {
+                    background-color: white;
+                    color: #333;
+                    padding: 10px;
+                }
+                .Applied { background-color: #6D9DC5; }
+                .Interview { background-color: #9D8EC7; }
+                .Rejected { background-color: #FF7F6B; }
+                .Accepted { background-color: #5CBDB9; }
+"""
+
+SCRIPT = """\
+                // Search and filter functionality
+                function filterTable() {
+                    const searchText = document.getElementById('searchBox').value.toLowerCase();
+                    const statusFilter = document.getElementById('statusFilter').value;
+                    const rows = document.querySelectorAll('tbody tr');
+                    let visibleRows = [];
+                    
+                    rows.forEach(row => {
+                        const companyName = row.cells[2].textContent.toLowerCase();
+                        const tags = (row.dataset.tags || '').split(' ');
+                        const statusSelect = row.cells[4].querySelector('select');
+                        const status = statusSelect ? statusSelect.value : '';
+                        const matchesSearch = companyName.includes(searchText) || tags.includes(searchText);
+                        const matchesStatus = statusFilter === 'All' || status === statusFilter;
+                        
+                        if (matchesSearch && matchesStatus) {
+                            visibleRows.push(row);
+                        }
+                        row.style.display = 'none';
+                    });
+
+                    // Update pagination
+                    currentPage = 1;
+                    totalPages = Math.ceil(visibleRows.length / rowsPerPage);
+                    showPage(visibleRows);
+                    updatePaginationControls(visibleRows.length);
+                }
+
+                let currentPage = 1;
+                const rowsPerPage = 50;
+                let totalPages = 1;
+
+                function showPage(visibleRows) {
+                    const start = (currentPage - 1) * rowsPerPage;
+                    const end = start + rowsPerPage;
+                    
+                    visibleRows.forEach((row, index) => {
+                        if (index >= start && index < end) {
+                            row.style.display = '';
+                        } else {
+                            row.style.display = 'none';
+                        }
+                    });
+                }
+
+                function updatePaginationControls(totalRows) {
+                    const paginationInfo = document.getElementById('paginationInfo');
+                    const prevButton = document.getElementById('prevPage');
+                    const nextButton = document.getElementById('nextPage');
+                    
+                    totalPages = Math.ceil(totalRows / rowsPerPage);
+                    
+                    paginationInfo.textContent = `Page ${currentPage} of ${totalPages} (${totalRows} entries)`;
+                    prevButton.disabled = currentPage === 1;
+                    nextButton.disabled = currentPage === totalPages || totalRows === 0;
+                }
+
+                function changePage(delta) {
+                    const newPage = currentPage + delta;
+                    if (newPage >= 1 && newPage <= totalPages) {
+                        currentPage = newPage;
+                        filterTable();
+                    }
+                }
+
+                function calculateStats() {
+                    const rows = document.querySelectorAll('tbody tr');
+                    const today = new Date();
+                    
+                    // Initialize counters
+                    let todayCount = 0;
+                    let totalCount = 0;
+                    let statusCounts = {
+                        'Applied': 0,
+                        'Interview': 0,
+                        'Accepted': 0,
+                        'Rejected': 0
+                    };
+                    
+                    // Initialize past 10 days counts
+                    let pastDaysCounts = Array(10).fill(0);
+                    let pastDaysLabels = Array(10).fill('');
+                    
+                    // Calculate dates for past 10 days
+                    for(let i = 0; i < 10; i++) {
+                        const date = new Date(today);
+                        date.setDate(date.getDate() - i);
+                        pastDaysLabels[9-i] = date.getDate() + '/' + (date.getMonth() + 1);
+                    }
+                    
+                    rows.forEach(row => {
+                        const dateCell = row.cells[1].textContent;
+                        const statusSelect = row.cells[4].querySelector('select');
+                        const status = statusSelect ? statusSelect.value : '';
+                        
+                        // Count today's applications
+                        const [day, month] = dateCell.split('-').map(Number);
+                        const currentDate = new Date();
+                        
+                        // Check for applications in past 10 days
+                        for(let i = 0; i < 10; i++) {
+                            const checkDate = new Date(today);
+                            checkDate.setDate(checkDate.getDate() - i);
+                            if(day === checkDate.getDate() && month === checkDate.getMonth() + 1) {
+                                pastDaysCounts[9-i]++;
+                                if(i === 0) todayCount++;
+                                break;
+                            }
+                        }
+                        
+                        // Count by status
+                        if (status in statusCounts) {
+                            statusCounts[status]++;
+                        }
+                        
+                        totalCount++;
+                    });
+                    
+                    // Calculate response rate
+                    const responseRate = totalCount > 0 
+                        ? Math.round((statusCounts['Interview'] + statusCounts['Accepted']) / totalCount * 100) 
+                        : 0;
+                    
+                    // Update stats in the DOM
+                    document.getElementById('todayCount').textContent = todayCount;
+                    document.getElementById('totalCount').textContent = totalCount;
+                    document.getElementById('interviewCount').textContent = statusCounts['Interview'];
+                    document.getElementById('responseRate').textContent = responseRate + '%';
+                    
+                    // Update trend bars
+                    const maxCount = Math.max(...pastDaysCounts.slice(-5), 1);
+                    const trendBars = document.querySelectorAll('.trend-bar');
+                    const trendDates = document.querySelectorAll('.trend-date');
+                    
+                    trendBars.forEach((bar, index) => {
+                        const count = pastDaysCounts[pastDaysCounts.length - 5 + index];
+                        const height = (count / maxCount) * 100;
+                        const fill = bar.querySelector('.trend-bar-fill');
+                        const countElement = bar.querySelector('.trend-bar-count');
+                        
+                        fill.style.height = `${Math.max(height, 4)}%`;
+                        countElement.textContent = count;
+                        
+                        // Update date labels
+                        trendDates[index].textContent = pastDaysLabels[pastDaysLabels.length - 5 + index];
+                    });
+                }
+
+                // Stats maintained by the server, pushed with every live update
+                function applyStats(stats) {
+                    document.getElementById('todayCount').textContent = stats.today;
+                    document.getElementById('totalCount').textContent = stats.total;
+                    document.getElementById('interviewCount').textContent = stats.statuses['Interview'];
+                    document.getElementById('responseRate').textContent = stats.response_rate + '%';
+
+                    const days = stats.last_days.slice(-5);
+                    const maxCount = Math.max(...days.map(day => day.count), 1);
+                    const trendDates = document.querySelectorAll('.trend-date');
+                    document.querySelectorAll('.trend-bar').forEach((bar, index) => {
+                        const [day, month] = days[index].date.split('-').map(Number);
+                        bar.querySelector('.trend-bar-fill').style.height = `${Math.max(days[index].count / maxCount * 100, 4)}%`;
+                        bar.querySelector('.trend-bar-count').textContent = days[index].count;
+                        trendDates[index].textContent = day + '/' + month;
+                    });
+                }
+
+                function refreshStats(data) {
+                    if (data.stats) {
+                        applyStats(data.stats);
+                    } else {
+                        calculateStats();
+                    }
+                }
+
+                // Initialize pagination and filtering
+                document.addEventListener('DOMContentLoaded', function() {
+                    // Add input handlers for filtering
+                    document.getElementById('searchBox').addEventListener('input', filterTable);
+                    document.getElementById('statusFilter').addEventListener('change', filterTable);
+                    
+                    // Initial calculations
+                    calculateStats();
+                    filterTable();
+                    connectLiveUpdates();
+                });
+
+                // Live updates pushed by the local server; without them the
+                // page falls back to recalculating after each of its own updates
+                let liveUpdates = false;
+
+                function connectLiveUpdates() {
+                    if (!window.EventSource) return;
+                    const source = new EventSource(API_BASE + '/events');
+                    let dropped = false;
+                    source.onopen = () => {
+                        // Anything could have changed while we were disconnected
+                        if (dropped) location.reload();
+                        liveUpdates = true;
+                    };
+                    source.onerror = () => {
+                        dropped = true;
+                        liveUpdates = false;
+                    };
+                    source.addEventListener('insert', event => {
+                        const data = JSON.parse(event.data);
+                        if (document.querySelector(`tr[data-id="${data.row[0]}"]`)) return;
+                        document.querySelector('tbody').insertAdjacentHTML('afterbegin', data.html);
+                        refreshStats(data);
+                        filterTable();
+                    });
+                    source.addEventListener('edit', event => {
+                        const data = JSON.parse(event.data);
+                        const row = document.querySelector(`tr[data-id="${data.row[0]}"]`);
+                        if (row) row.outerHTML = data.html;
+                        filterTable();
+                    });
+                    source.addEventListener('delete', event => {
+                        const data = JSON.parse(event.data);
+                        const row = document.querySelector(`tr[data-id="${data.id}"]`);
+                        if (row) row.remove();
+                        refreshStats(data);
+                        filterTable();
+                    });
+                    source.addEventListener('status', event => {
+                        const data = JSON.parse(event.data);
+                        const select = document.querySelector(`select[data-id="${data.id}"]`);
+                        if (select) {
+                            select.value = data.status;
+                            select.className = 'status-select ' + data.status;
+                        }
+                        refreshStats(data);
+                        filterTable();
+                    });
+                }
+
+                function updateStatus(selectElement) {
+                    const id = selectElement.getAttribute('data-id');
+                    const newStatus = selectElement.value;
+                    selectElement.className = 'status-select ' + newStatus;
+                    
+                    // Send update to server
+                    fetch(API_BASE + '/update_status', {
+                        method: 'POST',
+                        headers: {
+                            'Content-Type': 'application/json',
+                        },
+                        body: JSON.stringify({
+                            id: id,
+                            status: newStatus
+                        })
+                    })
+                    .then(response => response.json())
+                    .then(data => {
+                        if (!data.success) {
+                            alert('Failed to update status');
+                        }
+                        // The pushed status event refreshes the page when live
+                        if (!liveUpdates) {
+                            calculateStats();
+                            filterTable();
+                        }
+                    })
+                    .catch(error => {
+                        console.error('Error:', error);
+                        alert('Error updating status');
+                    });
+                }
+
+                function postAction(path, body) {
+                    return fetch(API_BASE + path, {
+                        method: 'POST',
+                        headers: {'Content-Type': 'application/json'},
+                        body: JSON.stringify(body)
+                    }).then(response => response.json());
+                }
+
+                function editEntry(button) {
+                    const row = button.closest('tr');
+                    const company = prompt('Company name', row.cells[2].textContent);
+                    if (company === null) return;
+                    const link = prompt('Job link', row.cells[3].textContent);
+                    if (link === null) return;
+                    postAction('/edit', {id: row.dataset.id, company: company, link: link})
+                    .then(data => {
+                        if (!data.success) {
+                            alert('Failed to edit entry');
+                        } else if (!liveUpdates) {
+                            row.cells[2].textContent = company;
+                            const anchor = row.cells[3].querySelector('a');
+                            anchor.href = link;
+                            anchor.textContent = link;
+                            filterTable();
+                        }
+                    })
+                    .catch(error => {
+                        console.error('Error:', error);
+                        alert('Error editing entry');
+                    });
+                }
+
+                function deleteEntry(button) {
+                    const row = button.closest('tr');
+                    if (!confirm(`Delete the ${row.cells[2].textContent} entry?`)) return;
+                    postAction('/delete', {id: row.dataset.id})
+                    .then(data => {
+                        if (!data.success) {
+                            alert('Failed to delete entry');
+                        } else if (!liveUpdates) {
+                            row.remove();
+                            calculateStats();
+                            filterTable();
+                        }
+                    })
+                    .catch(error => {
+                        console.error('Error:', error);
+                        alert('Error deleting entry');
+                    });
+                }
+"""
+
+# Served by the HTTP server: path -> (content type, body)
+ASSETS = {
+    '/assets/report.css': ('text/css; charset=utf-8', STYLESHEET.encode('utf-8')),
+    '/assets/report.js': ('application/javascript; charset=utf-8', SCRIPT.encode('utf-8')),
+}
+# Goes into the asset URLs, so browsers can cache them for good and still pick
+# up a new version after an upgrade
+ASSET_VERSION = hashlib.sha1(b"".join(body for _, body in ASSETS.values())).hexdigest()[:12]
+
+# Starts by closing the <head>, after the per-profile API_BASE script
+PAGE_BODY_START = """
+        </head>
+        <body>
+            <div class="stats-panel">
+                <div class="stat-card">
+                    <div class="stat-info">
+                        <div class="stat-header">
+                            <svg class="stat-icon" fill="none" stroke="#60A5FA" viewBox="0 0 24 24">
+                                <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M9 12h6m-6 4h6m2 5H7a2 2 0 01-2-2V5a2 2 0 012-2h5.586a1 1 0 01.707.293l5.414 5.414a1 1 0 01.293.707V19a2 2 0 01-2 2z"/>
+                            </svg>
+                            <div class="stat-title">Today's Applications</div>
+                        </div>
+                        <div class="stat-value" id="todayCount">0</div>
+                        <div class="stat-subtext">Applications submitted today</div>
+                    </div>
+                </div>
+                <div class="stat-card">
+                    <div class="stat-info">
+                        <div class="stat-header">
+                            <svg class="stat-icon" fill="none" stroke="#A78BFA" viewBox="0 0 24 24">
+                                <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M19 11H5m14 0a2 2 0 012 2v6a2 2 0 01-2 2H5a2 2 0 01-2-2v-6a2 2 0 012-2m14 0V9a2 2 0 00-2-2M5 11V9a2 2 0 012-2m0 0V5a2 2 0 012-2h6a2 2 0 012 2v2M7 7h10"/>
+                            </svg>
+                            <div class="stat-title">Total Applications</div>
+                        </div>
+                        <div class="stat-value" id="totalCount">0</div>
+                        <div class="stat-subtext">Total jobs applied</div>
+                    </div>
+                </div>
+                <div class="stat-card">
+                    <div class="stat-info">
+                        <div class="stat-header">
+                            <svg class="stat-icon" fill="none" stroke="#34D399" viewBox="0 0 24 24">
+                                <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M16 7a4 4 0 11-8 0 4 4 0 018 0zM12 14a7 7 0 00-7 7h14a7 7 0 00-7-7z"/>
+                            </svg>
+                            <div class="stat-title">Interviews</div>
+                        </div>
+                        <div class="stat-value" id="interviewCount">0</div>
+                        <div class="stat-subtext">Interview invitations</div>
+                    </div>
+                </div>
+                <div class="stat-card">
+                    <div class="stat-info">
+                        <div class="stat-header">
+                            <svg class="stat-icon" fill="none" stroke="#FB923C" viewBox="0 0 24 24">
+                                <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M13 7h8m0 0v8m0-8l-8 8-4-4-6 6"/>
+                            </svg>
+                            <div class="stat-title">Response Rate</div>
+                        </div>
+                        <div class="stat-value" id="responseRate">0%</div>
+                        <div class="stat-subtext">Interview/Acceptance rate</div>
+                    </div>
+                </div>
+                <div class="trend-card">
+                    <div class="stat-header">
+                        <svg class="stat-icon" fill="none" stroke="#60A5FA" viewBox="0 0 24 24">
+                            <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M9 19v-6a2 2 0 00-2-2H5a2 2 0 00-2 2v6a2 2 0 002 2h2a2 2 0 002-2zm0 0V9a2 2 0 012-2h2a2 2 0 012 2v10m-6 0a2 2 0 002 2h2a2 2 0 002-2m0 0V5a2 2 0 012-2h2a2 2 0 012 2v14a2 2 0 01-2 2h-2a2 2 0 01-2-2z"/>
+                        </svg>
+                        <div class="stat-title">Last 5 Days Applications</div>
+                    </div>
+                    <div class="trend-bars">
+                        <div class="trend-bar">
+                            <div class="trend-bar-count">0</div>
+                            <div class="trend-bar-fill"></div>
+                        </div>
+                        <div class="trend-bar">
+                            <div class="trend-bar-count">0</div>
+                            <div class="trend-bar-fill"></div>
+                        </div>
+                        <div class="trend-bar">
+                            <div class="trend-bar-count">0</div>
+                            <div class="trend-bar-fill"></div>
+                        </div>
+                        <div class="trend-bar">
+                            <div class="trend-bar-count">0</div>
+                            <div class="trend-bar-fill"></div>
+                        </div>
+                        <div class="trend-bar">
+                            <div class="trend-bar-count">0</div>
+                            <div class="trend-bar-fill"></div>
+                        </div>
+                    </div>
+                    <div class="trend-dates">
+                        <span class="trend-date"></span>
+                        <span class="trend-date"></span>
+                        <span class="trend-date"></span>
+                        <span class="trend-date"></span>
+                        <span class="trend-date"></span>
+                    </div>
+                </div>
+            </div>
+            <div class="controls">
+                <div class="search-container">
+                    <input type="text" id="searchBox" class="search-box" placeholder="Search by company name...">
+                </div>
+                <select id="statusFilter" class="filter-select">
+                    <option value="All">All Status</option>
+                    <option value="Applied">Applied</option>
+                    <option value="Interview">Interview</option>
+                    <option value="Accepted">Accepted</option>
+                    <option value="Rejected">Rejected</option>
+                </select>
+            </div>
+            <table>
+                <thead>
+                    <tr>
+"""
+
+TABLE_BODY_START = """
+                    </tr>
+                </thead>
+                <tbody>
+"""
+
+PAGE_FOOT = """
+                </tbody>
+            </table>
+            <div class="pagination">
+                <button id="prevPage" onclick="changePage(-1)">&lt; Previous</button>
+                <span id="paginationInfo" class="pagination-info">Page 1 of 1</span>
+                <button id="nextPage" onclick="changePage(1)">Next &gt;</button>
+            </div>
+        </body>
+        </html>
+"""
+
+
+def _status_cell_parts(current_status):
+    """The status dropdown split around its row ID, for one selected status"""
+    options = "".join(
+        f'\n                                <option value="{status}" {"selected" if current_status == status else ""}>{status}</option>'
+        for status in STATUSES
+    )
+    status_class = escape(current_status)
+    return (f'''
+                        <td>
+                            <select class="status-select {status_class}" data-id="''',
+            f'''" onchange="updateStatus(this)">{options}
+                            </select>
+                        </td>''')
+
+
+# Pre-rendered dropdowns, so a row only costs its ID being dropped in
+STATUS_CELLS = {status: _status_cell_parts(status) for status in STATUSES}
+
+
+def render_status_cell(row_id, current_status):
+    """Status dropdown that posts changes back to the local server"""
+    before, after = STATUS_CELLS.get(current_status) or _status_cell_parts(current_status)
+    return before + escape(row_id) + after
+
+
+ROW_BUTTONS = ('<button title="Edit" onclick="editEntry(this)">&#9998;</button>'
+               '<button title="Delete" onclick="deleteEntry(this)">&#10005;</button></td>')
+ROW_ACTIONS = '<td class="row-actions">' + ROW_BUTTONS
+
+SHARD_SIZE = 5000  # Rows per worker task
+PARALLEL_MIN_ROWS = 20000  # Below this a process pool costs more than it saves
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def render_link_cell(row_id, link):
+    link = escape(link)
+    return f'<td><a href="{link}" target="_blank">{link}</a></td>'
+
+
+# Columns that aren't plain text, by name; anything else is an escaped <td>
+CELL_RENDERERS = {
+    "Applied Job Link": render_link_cell,
+    "Status": render_status_cell,
+}
+
+
+def render_row(row, tags=(), header=HEADER):
+    row_id = escape(row[0])
+    if tags:
+        tag_list = escape(" ".join(tags))
+        html = f'<tr data-id="{row_id}" data-tags="{tag_list}">'
+    else:
+        html = f'<tr data-id="{row_id}">'
+    for name, cell in zip(header, row):
+        render = CELL_RENDERERS.get(name)
+        html += render(row[0], cell) if render else f"<td>{escape(cell)}</td>"
+    if tags:
+        chips = "".join(f'<span class="tag">{escape(tag)}</span>' for tag in tags)
+        return html + '<td class="row-actions">' + chips + ROW_BUTTONS + "</tr>"
+    return html + ROW_ACTIONS + "</tr>"
+
+
+def render_rows(rows, tags=None, header=HEADER):
+    """One shard of the table body; tags maps IDs to their tags"""
+    tags = tags or {}
+    return "".join(render_row(row, tags.get(row[0], ()), header) for row in rows)
+
+
+def _get_pool(workers=None):
+    # Started on first use and kept, so regenerating the report doesn't pay
+    # for spawning interpreters every time
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=workers)
+        return _pool
+
+
+def render_body(rows, workers=None, tags=None, header=HEADER):
+    """Yield the table body in order, one shard at a time. Large row sets are
+    rendered across a process pool; workers=1 keeps everything in-process."""
+    tags = tags or {}
+    shards = [rows[i:i + SHARD_SIZE] for i in range(0, len(rows), SHARD_SIZE)]
+    # Each shard only carries the tags of its own rows to its worker
+    shard_tags = [{row[0]: tags[row[0]] for row in shard if row[0] in tags} for shard in shards]
+    done = 0  # Shards already yielded
+    if workers != 1 and len(rows) >= PARALLEL_MIN_ROWS and (workers or os.cpu_count() or 1) > 1:
+        try:
+            for html in _get_pool(workers).map(render_rows, shards, shard_tags, [header] * len(shards)):
+                yield html
+                done += 1
+            return
+        except (OSError, BrokenProcessPool) as e:
+            # No subprocesses here (or a worker died); render the rest in-process
+            logging.warning(f"Rendering in-process, process pool unavailable: {e}")
+            _shutdown_pool()
+    for shard, shard_tag in zip(shards[done:], shard_tags[done:]):
+        yield render_rows(shard, shard_tag, header)
+
+
+def _shutdown_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False)
+            _pool = None
+
+
+def page_head(assets=None):
+    """The <head> contents; inline styles and script unless an asset URL prefix is given"""
+    if assets is None:
+        return f"{PAGE_START}            <style>\n{STYLESHEET}            </style>\n" \
+               f"            <script>\n{SCRIPT}            </script>\n"
+    return (f'{PAGE_START}            <link rel="stylesheet" href="{assets}/assets/report.css?v={ASSET_VERSION}">\n'
+            f'            <script src="{assets}/assets/report.js?v={ASSET_VERSION}"></script>\n')
+
+
+def iter_html(header, rows, api_base=DEFAULT_API_BASE, assets=None, workers=None, tags=None):
+    """The report page in pieces, in order; see render_html"""
+    yield page_head(assets)
+    yield f"<script>const API_BASE = {json.dumps(api_base)};</script>"
+    yield PAGE_BODY_START
+    yield "".join(f"<th>{escape(cell)}</th>" for cell in header)
+    yield "<th></th>"  # Edit/delete buttons
+    yield TABLE_BODY_START
+    yield from render_body(rows, workers, tags, header)
+    yield PAGE_FOOT
+
+
+def render_html(header, rows, api_base=DEFAULT_API_BASE, assets=None, workers=None, tags=None):
+    """Render the full report page for the given header and data rows (and
+    tags, ID -> list). With assets set, the stylesheet and script are linked
+    from that URL prefix instead of inlined."""
+    return "".join(iter_html(header, rows, api_base, assets, workers, tags))
+
+
+def write_html(path, header, rows, api_base=DEFAULT_API_BASE, workers=None, tags=None):
+    """Stream the report to path shard by shard, without building the whole
+    page in memory first. It goes to a temp file that replaces the old report
+    once complete, so a browser or a crash never sees half a page."""
+    with atomic_write(path, encoding='utf-8') as file:
+        for part in iter_html(header, rows, api_base, workers=workers, tags=tags):
+            file.write(part)
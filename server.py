@@ -0,0 +1,468 @@
+import asyncio
+import gzip
+import json
+import logging
+import threading
+import uuid
+from collections import OrderedDict
+from datetime import date
+from http.server import HTTPServer, BaseHTTPRequestHandler
+from urllib.parse import parse_qs, urlsplit
+
+from core import HEADER
+from render import ASSET_VERSION, ASSETS
+
+
+class StatusUpdateHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        # Redirect server logs to our log file
+        logging.info(format%args)
+
+    def do_POST(self):
+        if self.path in POST_ACTIONS:
+            content_length = int(self.headers['Content-Length'])
+            post_data = self.rfile.read(content_length)
+            try:
+                data = json_object(post_data)
+                success = POST_ACTIONS[self.path](self.server.app, data)
+            except (ValueError, KeyError, TypeError) as e:
+                self.send_response(400)
+                self.send_header('Access-Control-Allow-Origin', '*')
+                self.end_headers()
+                self.wfile.write(str(e).encode('utf-8'))
+                return
+
+            self.send_response(200)
+            self.send_header('Content-type', 'application/json')
+            self.send_header('Access-Control-Allow-Origin', '*')
+            self.end_headers()
+
+            response = json.dumps({'success': success})
+            self.wfile.write(response.encode('utf-8'))
+
+    def do_OPTIONS(self):
+        self.send_response(200)
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Access-Control-Allow-Methods', 'POST, OPTIONS')
+        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+        self.end_headers()
+
+
+def json_object(body):
+    """The JSON object a POST body holds; ValueError for anything else, such as
+    a list or null, which the actions would otherwise choke on"""
+    data = json.loads(body.decode('utf-8'))
+    if not isinstance(data, dict):
+        raise ValueError("Expected a JSON object")
+    return data
+
+
+# JSON POST endpoints shared by both servers: path -> action(core, data) -> success
+POST_ACTIONS = {
+    '/update_status': lambda core, data: core.update_status(data['id'], data['status']),
+    '/edit': lambda core, data: core.edit_entry(data['id'], data.get('company'), data.get('link'),
+                                                data.get('fields')),
+    '/delete': lambda core, data: core.delete_entry(data['id']),
+    '/merge_companies': lambda core, data: core.merge_companies(data['names'], data['canonical']),
+    '/set_tags': lambda core, data: core.set_tags(data['id'], data['tags']),
+}
+
+
+def create_server(app, host='localhost', port=8000):
+    """Bind the status update server and attach the owning app to it"""
+    server = HTTPServer((host, port), StatusUpdateHandler)
+    server.app = app  # Store reference to app instance
+    return server
+
+
+REASONS = {200: 'OK', 204: 'No Content', 304: 'Not Modified', 400: 'Bad Request', 404: 'Not Found',
+           405: 'Method Not Allowed'}
+CORS_HEADERS = [('Access-Control-Allow-Origin', '*')]
+MAX_HEADER_LINES = 100
+MAX_BODY = 1024 * 1024
+IDLE_TIMEOUT = 30         # Seconds a keep-alive connection may sit idle
+SSE_HEARTBEAT = 15        # Seconds between comment pings on an idle event stream
+SSE_QUEUE_SIZE = 1000     # Events buffered per client before it is dropped as too slow
+ASSET_MAX_AGE = 365 * 24 * 3600  # Asset URLs carry a content hash, so they never go stale
+GZIP_MIN_SIZE = 1024      # Smaller bodies aren't worth compressing
+GZIP_CACHE_SIZE = 32      # Compressed responses kept, least recently used dropped first
+
+
+class Request:
+    def __init__(self, method, path, version, headers, body, query=''):
+        self.method = method
+        self.path = path
+        self.version = version
+        self.headers = headers
+        self.body = body
+        self.query = query  # Raw query string
+
+    def params(self):
+        return parse_qs(self.query)
+
+    @property
+    def keep_alive(self):
+        connection = self.headers.get('connection', '').lower()
+        if self.version == 'HTTP/1.0':
+            return connection == 'keep-alive'
+        return connection != 'close'
+
+
+class GzipCache:
+    """Small LRU of gzipped response bodies, keyed by whatever identifies their
+    content (the path and ETag for data responses)"""
+
+    def __init__(self, size=GZIP_CACHE_SIZE):
+        self.size = size
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            body = self.entries.get(key)
+            if body is not None:
+                self.entries.move_to_end(key)
+            return body
+
+    def put(self, key, body):
+        with self.lock:
+            self.entries[key] = body
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.size:
+                self.entries.popitem(last=False)
+
+
+def accepts_gzip(request):
+    return 'gzip' in request.headers.get('accept-encoding', '').lower()
+
+
+def etag_matches(request, etag):
+    tags = request.headers.get('if-none-match', '')
+    return tags.strip() == '*' or etag in (tag.strip() for tag in tags.split(','))
+
+
+class AsyncServer:
+    """asyncio HTTP/1.1 server with keep-alive, many concurrent clients and a
+    server-sent-events stream (/events) pushing inserts, edits, deletes and
+    status changes.
+
+    One listener serves every profile in the registry: /p/<name>/... routes to
+    that profile, anything else to the default log.
+
+    The report's stylesheet and script are served pre-gzipped under
+    /assets/ with long-lived cache headers. The report page and the JSON
+    views (/analytics, /companies) carry an ETag made from the store version, answer a matching
+    If-None-Match with 304, and are gzipped once per version."""
+
+    def __init__(self, registry, host='localhost', port=8000):
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self.loop = None
+        self.server = None
+        self.subscribers = {}  # Profile name -> set of client queues
+        self.publishers = {}  # Profile name -> store listener
+        # Versions restart at zero with the process, so ETags carry a per-run token
+        self.boot = uuid.uuid4().hex[:8]
+        self.gzip_cache = GzipCache()
+        registry.set_base_url(f"http://{host}:{port}")
+
+    async def start(self):
+        self.loop = asyncio.get_running_loop()
+        self.server = await asyncio.start_server(self.handle_connection, self.host, self.port)
+        self.registry.listeners.append(self.attach)
+        for name, core in self.registry.opened():
+            self.attach(name, core)
+        logging.info(f"RapidLogger async HTTP server listening on {self.host}:{self.port}")
+
+    def attach(self, name, core):
+        """Forward a profile's store events to its subscribers, along with the
+        stats from the store's running counters"""
+        def publisher(event):
+            extra = {'stats': core.store.stats()}
+            if 'row' in event:
+                extra['tags'] = core.tags.tags_of(event['row'][0])
+                extra['header'] = core.store.schema.columns
+            self.publish(name, dict(event, **extra))
+
+        self.publishers[name] = (core, publisher)
+        core.store.listeners.append(publisher)
+
+    async def serve(self):
+        await self.start()
+        try:
+            await self.server.serve_forever()
+        finally:
+            self.registry.listeners.remove(self.attach)
+            for core, publisher in self.publishers.values():
+                core.store.listeners.remove(publisher)
+
+    def serve_forever(self):
+        asyncio.run(self.serve())
+
+    def start_in_thread(self):
+        """Run the server on its own event loop in a daemon thread; returns once bound"""
+        bound = threading.Event()
+        errors = []
+
+        def run():
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+            try:
+                loop.run_until_complete(self.start())
+            except Exception as e:
+                errors.append(e)
+                return
+            finally:
+                bound.set()
+            loop.run_forever()
+
+        thread = threading.Thread(target=run, name="http")
+        thread.daemon = True  # Thread will close when main program exits
+        thread.start()
+        bound.wait()
+        if errors:
+            raise errors[0]
+        return thread
+
+    # Push channel
+
+    def publish(self, name, event):
+        """Store listener; may be called from any thread"""
+        if self.loop is not None and not self.loop.is_closed():
+            self.loop.call_soon_threadsafe(self._broadcast, name, event)
+
+    def _broadcast(self, name, event):
+        subscribers = self.subscribers.get(name, set())
+        for queue in list(subscribers):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # Too far behind; end its stream and let the page reload
+                subscribers.discard(queue)
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(None)
+
+    def format_event(self, event):
+        if event['type'] in ('insert', 'edit'):
+            from render import render_row
+            html = render_row(event['row'], event.get('tags', ()), event.get('header', HEADER))
+            payload = {'row': event['row'], 'html': html,
+                       'stats': event.get('stats'), 'tags': event.get('tags', [])}
+        else:
+            payload = {key: value for key, value in event.items() if key != 'type'}
+        return f"event: {event['type']}\ndata: {json.dumps(payload)}\n\n".encode('utf-8')
+
+    async def stream_events(self, name, writer):
+        queue = asyncio.Queue(SSE_QUEUE_SIZE)
+        subscribers = self.subscribers.setdefault(name, set())
+        subscribers.add(queue)
+        try:
+            writer.write(self.response_head(200, [
+                ('Content-Type', 'text/event-stream'),
+                ('Cache-Control', 'no-cache'),
+            ] + CORS_HEADERS, None, keep_alive=True))
+            writer.write(b"retry: 3000\n\n")
+            await writer.drain()
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), SSE_HEARTBEAT)
+                except asyncio.TimeoutError:
+                    writer.write(b": ping\n\n")
+                else:
+                    if event is None:
+                        break
+                    writer.write(self.format_event(event))
+                await writer.drain()
+        finally:
+            subscribers.discard(queue)
+
+    # HTTP
+
+    async def read_request(self, reader):
+        try:
+            line = await asyncio.wait_for(reader.readline(), IDLE_TIMEOUT)
+        except asyncio.TimeoutError:
+            return None
+        if not line:
+            return None
+        method, target, version = line.decode('latin-1').split()
+        headers = {}
+        for _ in range(MAX_HEADER_LINES):
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+        else:
+            raise ValueError("Too many headers")
+        length = int(headers.get('content-length', 0))
+        if length > MAX_BODY:
+            raise ValueError("Request body too large")
+        body = await reader.readexactly(length) if length else b''
+        url = urlsplit(target)
+        return Request(method.upper(), url.path, version, headers, body, url.query)
+
+    def response_head(self, status, headers, length, keep_alive):
+        lines = [f"HTTP/1.1 {status} {REASONS.get(status, '')}"]
+        lines += [f"{name}: {value}" for name, value in headers]
+        if length is not None:
+            lines.append(f"Content-Length: {length}")
+        lines.append("Connection: keep-alive" if keep_alive else "Connection: close")
+        return ("\r\n".join(lines) + "\r\n\r\n").encode('latin-1')
+
+    def route(self, path):
+        """Split /p/<name>/rest into (name, core, /rest); core is None for unknown profiles"""
+        if path.startswith('/p/'):
+            name, _, rest = path[3:].partition('/')
+            try:
+                core = self.registry.get(name)
+            except ValueError:
+                core = None
+            return name, core, '/' + rest
+        return None, self.registry.default, path
+
+    async def dispatch(self, request, core):
+        """Returns (status, headers, body bytes)"""
+        if request.path in ASSETS and request.method == 'GET':
+            return self.asset(request)
+        if core is None:
+            return 404, CORS_HEADERS, b''
+        if request.method == 'OPTIONS':
+            return 204, CORS_HEADERS + [
+                ('Access-Control-Allow-Methods', 'GET, POST, OPTIONS'),
+                ('Access-Control-Allow-Headers', 'Content-Type'),
+            ], b''
+        action = POST_ACTIONS.get(request.path)
+        if action is not None:
+            if request.method != 'POST':
+                return 405, CORS_HEADERS, b''
+            data = json_object(request.body)
+            # File writes happen off the event loop
+            success = await self.loop.run_in_executor(None, action, core, data)
+            return 200, [('Content-type', 'application/json')] + CORS_HEADERS, \
+                json.dumps({'success': success}).encode('utf-8')
+        if request.path == '/analytics' and request.method == 'GET':
+            return await self.cached(request, core, 'application/json', self.read_analytics,
+                                     '-' + date.today().isoformat())
+        if request.path == '/tags' and request.method == 'GET':
+            return await self.cached(request, core, 'application/json', self.read_tags)
+        if request.path == '/filter' and request.method == 'GET':
+            params = request.params()
+            produce = lambda core: self.read_filter(core, params)
+            return await self.cached(request, core, 'application/json', produce, '-' + date.today().isoformat())
+        if request.path == '/companies' and request.method == 'GET':
+            return await self.cached(request, core, 'application/json', self.read_clusters)
+        if request.path in ('/', '/report') and request.method == 'GET':
+            return await self.cached(request, core, 'text/html; charset=utf-8', self.read_report)
+        return 404, CORS_HEADERS, b''
+
+    def asset(self, request):
+        content_type, body = ASSETS[request.path]
+        headers = [('Content-Type', content_type),
+                   ('Cache-Control', f'public, max-age={ASSET_MAX_AGE}, immutable'),
+                   ('ETag', f'"{ASSET_VERSION}"'), ('Vary', 'Accept-Encoding')] + CORS_HEADERS
+        if etag_matches(request, f'"{ASSET_VERSION}"'):
+            return 304, headers, b''
+        if accepts_gzip(request):
+            return 200, headers + [('Content-Encoding', 'gzip')], self.compressed(request.path, body)
+        return 200, headers, body
+
+    def compressed(self, key, body):
+        """gzip a body once and keep it in the LRU"""
+        gzipped = self.gzip_cache.get(key)
+        if gzipped is None:
+            gzipped = gzip.compress(body)
+            self.gzip_cache.put(key, gzipped)
+        return gzipped
+
+    async def cached(self, request, core, content_type, produce, extra=''):
+        """Conditional GET for a response that only changes with the store version
+        (and extra): 304 if the client has it, else the body, gzipped from the
+        LRU when the client accepts that. produce(core) -> (version, body)."""
+        version = await self.loop.run_in_executor(None, core.current_version)
+        etag = f'"{self.boot}-{core.name or ""}-{version}{extra}"'
+        headers = [('Content-Type', content_type), ('Cache-Control', 'no-cache'),
+                   ('Vary', 'Accept-Encoding')] + CORS_HEADERS
+        if etag_matches(request, etag):
+            return 304, headers + [('ETag', etag)], b''
+        gzipped = accepts_gzip(request)
+        key = (core.name, request.path, request.query, etag)
+        if gzipped:
+            body = self.gzip_cache.get(key)
+            if body is not None:
+                return 200, headers + [('ETag', etag), ('Content-Encoding', 'gzip')], body
+
+        def render():
+            version, body = produce(core)
+            etag = f'"{self.boot}-{core.name or ""}-{version}{extra}"'
+            if gzipped and len(body) >= GZIP_MIN_SIZE:
+                body = gzip.compress(body)
+                self.gzip_cache.put((core.name, request.path, request.query, etag), body)
+                return etag, body, True
+            return etag, body, False
+
+        etag, body, compressed = await self.loop.run_in_executor(None, render)
+        headers.append(('ETag', etag))
+        if compressed:
+            headers.append(('Content-Encoding', 'gzip'))
+        return 200, headers, body
+
+    def read_report(self, core):
+        # Rendered in memory, linking the shared assets instead of inlining them
+        return core.render_report(assets='')
+
+    def read_tags(self, core):
+        with core.store.lock:
+            return core.current_version(), json.dumps({'tags': core.tags.counts()}).encode('utf-8')
+
+    def read_filter(self, core, params):
+        """?status=S&tag=T&any=T&days=N&company=C&limit=N; status and any may repeat
+        (OR), tag may repeat (AND)"""
+        days = int(params['days'][0]) if 'days' in params else None
+        limit = int(params['limit'][0]) if 'limit' in params else 100
+        with core.store.lock:
+            version = core.current_version()
+            count, rows = core.filter_entries(params.get('status', ()),
+                                              [tag.lower() for tag in params.get('tag', ())],
+                                              [tag.lower() for tag in params.get('any', ())], days,
+                                              params.get('company', [None])[0], limit)
+        return version, json.dumps({'count': count, 'rows': rows}).encode('utf-8')
+
+    def read_clusters(self, core):
+        with core.store.lock:
+            return core.current_version(), json.dumps({'groups': core.company_clusters()}).encode('utf-8')
+
+    def read_analytics(self, core):
+        with core.store.lock:
+            return core.current_version(), json.dumps(core.analytics()).encode('utf-8')
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                request = await self.read_request(reader)
+                if request is None:
+                    break
+                target = request.path
+                name, core, path = self.route(target)
+                if request.method == 'GET' and path == '/events' and core is not None:
+                    await self.stream_events(name, writer)
+                    break
+                request.path = path
+                try:
+                    status, headers, body = await self.dispatch(request, core)
+                except (ValueError, KeyError, TypeError) as e:
+                    status, headers, body = 400, CORS_HEADERS, str(e).encode('utf-8')
+                logging.info(f'"{request.method} {target} {request.version}" {status}')
+                keep_alive = request.keep_alive
+                writer.write(self.response_head(status, headers, len(body), keep_alive) + body)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        except Exception as e:
+            logging.error(f"Error handling HTTP connection: {e}")
+        finally:
+            writer.close()
@@ -0,0 +1,336 @@
+import hashlib
+import json
+import os
+import uuid
+
+from durable import atomic_write
+
+BUCKETS = 256  # Merkle leaves, keyed by the first byte of a row's UID
+
+
+def row_hash(fields):
+    """Content hash of a row's fields; None stands for a deleted row"""
+    if fields is None:
+        return None
+    return hashlib.sha1("\x1f".join(fields).encode('utf-8')).hexdigest()
+
+
+def bucket_of(uid):
+    return int(uid[:2], 16)
+
+
+def stamp_key(stamp):
+    """Stamps are [counter, node]; the higher counter wins and the node ID breaks ties"""
+    return (stamp[0], stamp[1])
+
+
+def make_entry(uid, stamp, status_stamp, fields):
+    """A row's sync entry: [uid, hash of date/company/link, counter, node,
+    status, status counter, status node]; fields of None make a tombstone"""
+    if fields is None:
+        return [uid, None] + list(stamp) + [None] + list(status_stamp)
+    return [uid, row_hash(fields[:3])] + list(stamp) + [fields[3]] + list(status_stamp)
+
+
+class SyncState:
+    """Per-row version stamps and a Merkle summary for one copy of the log.
+
+    Kept next to the CSV in <name>.sync.json: the node ID of this copy, a
+    Lamport clock, and for every local row ID its UID, a hash of its date,
+    company and link with their stamp, and its status with a stamp of its own,
+    so a status change on one copy and an edit on the other both survive.
+    refresh() stamps whatever changed since the last sync, however it was
+    changed, going by what was appended to the store's files since then
+    (their states are kept in the file too). Deleted rows stay behind as
+    tombstones (hash None) so the delete reaches the other copy instead of the
+    row coming back. The Merkle leaves are saved as well, and only the
+    buckets holding a changed row are hashed again."""
+
+    def __init__(self, store):
+        self.store = store
+        self.path = os.path.splitext(store.csv_file)[0] + ".sync.json"
+        self.node = uuid.uuid4().hex[:12]
+        self.clock = 0
+        self.files = None  # The store's file states as of the last refresh; None for a full one
+        self.leaves = [None] * BUCKETS  # None for a bucket that needs hashing again
+        # Local ID -> make_entry(); tombstones for rows this copy never had
+        # are keyed by '~' + uid. Read from the file's second line when first needed.
+        self._rows = None
+        self._by_uid = None
+        self._buckets = None
+        if os.path.exists(self.path):
+            with open(self.path, 'r', encoding='utf-8') as file:
+                data = json.loads(file.readline())
+            self.node = data['node']
+            self.clock = data['clock']
+            if 'rows' in data:
+                # Written before the rows got a line of their own, or
+                # refreshes were incremental: no file states or leaves
+                self._rows = data['rows']
+            else:
+                self.files = data['files']
+                self.leaves = data['leaves']
+        else:
+            self._rows = {}
+        self.dirty = False  # Whether there's anything to save
+
+    @property
+    def rows(self):
+        if self._rows is None:
+            with open(self.path, 'r', encoding='utf-8') as file:
+                file.readline()
+                self._rows = json.loads(file.readline())
+        return self._rows
+
+    @property
+    def by_uid(self):
+        if self._by_uid is None:
+            self._by_uid = {entry[0]: row_id for row_id, entry in self.rows.items()}
+        return self._by_uid
+
+    @property
+    def buckets(self):
+        """Bucket number -> keys of the entries in it"""
+        if self._buckets is None:
+            self._buckets = [set() for _ in range(BUCKETS)]
+            for key, entry in self.rows.items():
+                self._buckets[bucket_of(entry[0])].add(key)
+        return self._buckets
+
+    def _put(self, key, entry):
+        self.rows[key] = entry
+        self.by_uid[entry[0]] = key
+        if self._buckets is not None:
+            self._buckets[bucket_of(entry[0])].add(key)
+        self._touch(entry[0])
+
+    def _remove(self, key):
+        entry = self.rows.pop(key)
+        if self._buckets is not None:
+            self._buckets[bucket_of(entry[0])].discard(key)
+        self._touch(entry[0])
+
+    def save(self):
+        """Write the stamps out, if anything changed since they were read. The
+        clock, file states and leaves go on a line before the rows, so a sync
+        that finds nothing changed never reads the rows."""
+        if not self.dirty:
+            return
+        header = {'node': self.node, 'clock': self.clock, 'files': self.files, 'leaves': self.summary()}
+        with atomic_write(self.path, encoding='utf-8') as file:
+            file.write(json.dumps(header) + "\n")
+            file.write(json.dumps(self.rows) + "\n")
+        self.dirty = False
+
+    def tick(self):
+        self.clock += 1
+        self.dirty = True
+        return [self.clock, self.node]
+
+    def _touch(self, uid):
+        """An entry with this UID was added, changed or removed"""
+        self.leaves[bucket_of(uid)] = None
+        self.dirty = True
+
+    def set_clock(self, clock):
+        if clock != self.clock:
+            self.clock = clock
+            self.dirty = True
+
+    def refresh(self):
+        """Stamp the rows added, changed or deleted since the last refresh.
+        Only rows appended to the store's files since then are looked at,
+        unless this is the first sync or the log was compacted in between,
+        when every row is compared."""
+        files = self.store.file_states()
+        changed = None if self.files is None else self.store.changes_since(self.files)
+        if changed is None:
+            current = {row[0]: row for row in self.store.read()}
+            self._upgrade(current)
+            changed = set(current) | {row_id for row_id in self.rows if not row_id.startswith('~')}
+        else:
+            current = {row_id: self.store.get(row_id) for row_id in changed}
+        for row_id in sorted(changed, key=int):
+            self._stamp(row_id, current.get(row_id))
+        if files != self.files:
+            self.files = files
+            self.dirty = True
+
+    def _upgrade(self, current):
+        for row_id, entry in self.rows.items():
+            if len(entry) == 4:
+                # Written before statuses had a stamp of their own, when the hash
+                # covered the status too: keep the stamp for both if the row
+                # hasn't changed since, so two such copies still agree
+                row = current.get(row_id)
+                if row is not None and entry[1] == row_hash(row[1:5]):
+                    self.rows[row_id] = make_entry(entry[0], entry[2:], entry[2:], row[1:5])
+                else:
+                    entry += [None] + entry[2:4]
+                self._touch(entry[0])
+
+    def _stamp(self, row_id, row):
+        """Give a row's entry new stamps for whatever differs from `row`, its
+        current contents (None once deleted)"""
+        entry = self.rows.get(row_id)
+        if row is None:
+            if entry is not None and entry[1] is not None:
+                entry[1] = entry[4] = None
+                entry[2:4] = self.tick()
+                self._touch(entry[0])
+            return
+        if entry is None:
+            # The UID comes from the row as first seen, so two copies of the
+            # same file agree on it without ever having talked to each other
+            stamp = self.tick()
+            self._put(row_id, make_entry(row_hash(row[:4]), stamp, stamp, row[1:5]))
+            return
+        digest = row_hash(row[1:4])  # The HEADER columns; optional ones aren't synced
+        if entry[1] != digest:
+            entry[1] = digest
+            entry[2:4] = self.tick()
+            self._touch(entry[0])
+        if entry[4] != row[4]:
+            entry[4] = row[4]
+            entry[5:7] = self.tick()
+            self._touch(entry[0])
+
+    def summary(self):
+        """Leaf hashes of the Merkle tree; compare roots first, then leaves"""
+        for number, leaf in enumerate(self.leaves):
+            if leaf is None:
+                lines = sorted(f"{entry[0]}:{entry[2]}:{entry[3]}:{entry[5]}:{entry[6]}"
+                               for entry in (self.rows[key] for key in self.buckets[number]))
+                self.leaves[number] = hashlib.sha1("\n".join(lines).encode('utf-8')).hexdigest()
+        return self.leaves
+
+    def root(self):
+        return hashlib.sha1("".join(self.summary()).encode('utf-8')).hexdigest()
+
+    def entries(self, buckets):
+        """uid -> (entry, [date, company, link, status] or None if deleted) for
+        rows in the given buckets"""
+        found = {key: self.rows[key] for number in buckets for key in self.buckets[number]}
+        live = [row_id for row_id, entry in found.items() if entry[1] is not None]
+        if len(live) * 8 > len(self.rows):
+            # Most of the log: one pass over it beats reading rows one by one
+            rows = {row[0]: row for row in self.store.read()}
+        else:
+            rows = {row_id: self.store.get(row_id) for row_id in live}
+        return {entry[0]: (entry, fields_of(rows, row_id)) for row_id, entry in found.items()}
+
+    def adopt(self, uid, stamp, status_stamp):
+        """Take the merged stamps for a row whose content already matches"""
+        entry = self.rows[self.by_uid[uid]]
+        entry[2:4] = stamp
+        entry[5:7] = status_stamp
+        self._touch(uid)
+
+    def apply(self, changes):
+        """Merge (uid, stamp, status stamp, fields) changes from the other copy
+        into the store; fields of None delete the row"""
+        if not changes:
+            return
+        updates = {}
+        inserts = []
+        deletes = []
+        for uid, stamp, status_stamp, fields in changes:
+            row_id = self.by_uid.get(uid)
+            if row_id is None:
+                if fields is None:
+                    # Deleted over there before we ever saw it
+                    self._put('~' + uid, make_entry(uid, stamp, status_stamp, None))
+                else:
+                    inserts.append((uid, stamp, status_stamp, fields))
+                continue
+            if fields is None:
+                deletes.append(row_id)
+            elif self.rows[row_id][1] is None:
+                # Deleted here but changed later over there: bring it back
+                inserts.append((uid, stamp, status_stamp, fields))
+                self._remove(row_id)
+                continue
+            else:
+                updates[row_id] = fields
+            self._put(row_id, make_entry(uid, stamp, status_stamp, fields))
+        new_rows = self.store.merge(updates, [fields for *_, fields in inserts], deletes)
+        for row, (uid, stamp, status_stamp, fields) in zip(new_rows, inserts):
+            self._put(row[0], make_entry(uid, stamp, status_stamp, fields))
+
+
+def fields_of(rows, row_id):
+    row = rows.get(row_id)
+    return row[1:5] if row is not None else None
+
+
+def resolve(one, other):
+    """What a row both copies have an entry for should become on both: the
+    date, company and link with the higher stamp, and the status with the
+    higher status stamp. A delete wins only if it's newer than every change
+    made to the row on the other copy. Takes and returns (entry, fields) as
+    from entries(), with the merged stamps in place of the entry."""
+    if one[1] is None:
+        one, other = other, one  # The live copy first, if there is one
+    (entry, fields), (other_entry, other_fields) = one, other
+    stamp = max(entry[2:4], other_entry[2:4], key=stamp_key)
+    status_stamp = max(entry[5:7], other_entry[5:7], key=stamp_key)
+    if fields is None:
+        return (stamp, status_stamp), None
+    if other_fields is None:
+        if stamp_key(other_entry[2:4]) > max(stamp_key(entry[2:4]), stamp_key(entry[5:7])):
+            return (stamp, status_stamp), None
+        return (entry[2:4], entry[5:7]), fields
+    if stamp_key(other_entry[2:4]) > stamp_key(entry[2:4]):
+        fields = other_fields[:3] + fields[3:]
+    if stamp_key(other_entry[5:7]) > stamp_key(entry[5:7]):
+        fields = fields[:3] + other_fields[3:]
+    return (stamp, status_stamp), fields
+
+
+def sync_stores(local, remote):
+    """Two-way sync of two LogStores. Only rows in Merkle buckets that differ are
+    compared, and only rows whose stamps differ are copied; changes and deletes
+    made on both sides resolve the same way on both copies (see resolve()).
+
+    Returns (pulled, pushed, differing buckets)."""
+    with local.lock, remote.lock:
+        ours, theirs = SyncState(local), SyncState(remote)
+        ours.refresh()
+        theirs.refresh()
+        pulled, pushed, differing = [], [], []
+        if ours.root() != theirs.root():
+            differing = [i for i, (a, b) in enumerate(zip(ours.summary(), theirs.summary())) if a != b]
+            our_entries, their_entries = ours.entries(differing), theirs.entries(differing)
+            for uid in sorted(our_entries.keys() | their_entries.keys()):
+                mine, other = our_entries.get(uid), their_entries.get(uid)
+                if mine is None or other is None:
+                    entry, fields = mine or other
+                    (pushed if other is None else pulled).append((uid, entry[2:4], entry[5:7], fields))
+                    continue
+                (stamp, status_stamp), fields = resolve(mine, other)
+                for state, (entry, side_fields), changes in ((ours, mine, pulled), (theirs, other, pushed)):
+                    if side_fields != fields:
+                        changes.append((uid, stamp, status_stamp, fields))
+                    elif entry[2:4] != list(stamp) or entry[5:7] != list(status_stamp):
+                        # Same content, e.g. both copies started from one file:
+                        # settle on the same stamps without moving the row
+                        state.adopt(uid, stamp, status_stamp)
+            ours.apply(pulled)
+            theirs.apply(pushed)
+            # Take in the merges just made, so the next sync doesn't look at those rows again
+            ours.refresh()
+            theirs.refresh()
+        # Lamport clocks: both copies move past everything they have seen
+        clock = max(ours.clock, theirs.clock)
+        ours.set_clock(clock)
+        theirs.set_clock(clock)
+        ours.save()
+        theirs.save()
+    return len(pulled), len(pushed), len(differing)
+
+
+def resolve_peer(path):
+    """A peer is a data CSV, or a directory holding data_log.csv (and maybe data_log.html)"""
+    if os.path.isdir(path):
+        return os.path.join(path, "data_log.csv"), os.path.join(path, "data_log.html")
+    return path, os.path.splitext(path)[0] + ".html"
@@ -0,0 +1,156 @@
+import csv
+import os
+import re
+from datetime import datetime, timedelta
+
+from bitmaps import Bitmap
+from core import DATE_FORMAT, read_records
+from durable import WatchedFile, recover_tail_once
+
+TAG = re.compile(r'^[a-z0-9][a-z0-9_-]{0,31}$')
+TAG_COMPACT_RATIO = 0.5  # Superseded records / all records before the tags file is rewritten
+
+
+def parse_tags(tags):
+    """'remote, Referral' or ['remote', 'referral'] -> sorted, unique, lowercase tags"""
+    parts = re.split(r'[,;\s]+', tags) if isinstance(tags, str) else tags
+    result = sorted({part.strip().lower() for part in parts if part and part.strip()})
+    for tag in result:
+        if not TAG.match(tag):
+            raise ValueError(f"Invalid tag {tag!r}: use letters, digits, '-' and '_'")
+    return result
+
+
+class TagStore:
+    """Tags of the rows in one log, kept next to it in <name>.tags.csv as
+    (id, 'tag;tag') records where the last record for an ID wins, plus a
+    Bitmap of row IDs per tag. Filters combine these with the store's status
+    and day bitmaps, so they're a handful of AND/OR operations whatever the
+    size of the log."""
+
+    def __init__(self, store):
+        self.store = store
+        self.path = os.path.splitext(store.csv_file)[0] + ".tags.csv"
+        self.lock = store.lock  # One lock, so filters see tags and rows at the same point
+        self.tags = None  # ID -> tags; loaded on first use
+        self.bits = {}  # Tag -> Bitmap of IDs
+        self.records = 0
+        self.file = WatchedFile(self.path)
+        self.version = 0  # Bumped whenever tags change
+
+    def _ensure_loaded(self):
+        # Another process may have tagged something since we last looked
+        if self.tags is None or self.file.changed():
+            self._load()
+
+    def _load(self):
+        tags = {}
+        self.records = 0
+        recover_tail_once(self.path)
+        self.file.seen()
+        if os.path.exists(self.path):
+            with open(self.path, 'rb') as file:
+                for _, record in read_records(file):
+                    if len(record) != 2:
+                        continue
+                    self.records += 1
+                    if record[1]:
+                        tags[record[0]] = record[1].split(';')
+                    else:
+                        tags.pop(record[0], None)
+        self.tags = tags
+        self.bits = {}
+        for row_id, row_tags in tags.items():
+            for tag in row_tags:
+                self.bits.setdefault(tag, Bitmap()).add(row_id)
+        self.version += 1
+
+    def current_version(self):
+        with self.lock:
+            self._ensure_loaded()
+            return self.version
+
+    def tags_of(self, row_id):
+        with self.lock:
+            self._ensure_loaded()
+            return list(self.tags.get(str(row_id), ()))
+
+    def mapping(self):
+        """ID -> tags for every tagged row"""
+        with self.lock:
+            self._ensure_loaded()
+            return {row_id: list(row_tags) for row_id, row_tags in self.tags.items()}
+
+    def counts(self):
+        """Tag -> number of rows in the log carrying it"""
+        with self.lock:
+            self._ensure_loaded()
+            self.store.current_version()  # Picks up rows written by other processes
+            live = self.store.view.live()
+            counts = {tag: len(bits & live) for tag, bits in self.bits.items()}
+        return {tag: count for tag, count in sorted(counts.items()) if count}
+
+    def set_tags(self, row_id, tags):
+        """Replace the tags of one row; returns False if the ID isn't in the log"""
+        row_id = str(row_id)
+        tags = parse_tags(tags)
+        with self.lock:
+            row = self.store.get(row_id)
+            if row is None:
+                return False
+            self._ensure_loaded()
+            old = self.tags.get(row_id, [])
+            if old == tags:
+                return True
+            self.store._append(self.path, [[row_id, ";".join(tags)]])
+            self.records += 1
+            for tag in old:
+                self.bits[tag].discard(row_id)
+                if not self.bits[tag]:
+                    del self.bits[tag]
+            for tag in tags:
+                self.bits.setdefault(tag, Bitmap()).add(row_id)
+            if tags:
+                self.tags[row_id] = tags
+            else:
+                self.tags.pop(row_id, None)
+            self.file.seen()
+            self.version += 1
+            if self.records - len(self.tags) > TAG_COMPACT_RATIO * self.records:
+                self._compact()
+        # Lets live report pages redraw the row with its new tags
+        self.store._notify({"type": "edit", "row": row})
+        return True
+
+    def _compact(self):
+        """Rewrite the tags file with one record per tagged row still in the
+        log; skipped if another process appends to it in the meantime"""
+        self._ensure_loaded()
+        self.store.current_version()
+        live = self.store.view.live()
+        self.tags = {row_id: row_tags for row_id, row_tags in self.tags.items() if int(row_id) in live}
+        self.bits = {tag: bits & live for tag, bits in self.bits.items() if bits & live}
+        records = [[row_id, ";".join(row_tags)] for row_id, row_tags in self.tags.items()]
+        if self.file.rewrite(lambda file: csv.writer(file).writerows(records), newline=''):
+            self.store.sums.update([self.path], rewritten=True)
+            self.records = len(records)
+
+    def filter(self, statuses=(), tags=(), any_tags=(), days=None, today=None):
+        """Bitmap of the IDs with any of `statuses`, all of `tags`, any of
+        `any_tags`, and dated within the last `days` days"""
+        with self.lock:
+            self._ensure_loaded()
+            self.store.current_version()
+            view = self.store.view
+            result = view.live()
+            if statuses:
+                result &= Bitmap.union(view.status_bits.get(status, Bitmap()) for status in statuses)
+            for tag in tags:
+                result &= self.bits.get(tag, Bitmap())
+            if any_tags:
+                result &= Bitmap.union(self.bits.get(tag, Bitmap()) for tag in any_tags)
+            if days:
+                today = today or datetime.now()
+                labels = [(today - timedelta(days=i)).strftime(DATE_FORMAT) for i in range(days)]
+                result &= Bitmap.union(view.day_bits.get(label, Bitmap()) for label in labels)
+            return result
@@ -0,0 +1,73 @@
+from datetime import date
+
+import pytest
+
+import analytics as analytics_module
+from analytics import Analytics, Columns, summarize
+from core import LogStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = LogStore(str(tmp_path / "data_log.csv"), background=False)
+    store.initialize()
+    return store
+
+
+def rebuilt(store, today):
+    """The summary a fresh pass over the whole log gives"""
+    return summarize(Columns(store.read()[::-1], store.status_events(), today).frozen())
+
+
+def without_engine(result):
+    return {key: value for key, value in result.items() if key != "engine"}
+
+
+def test_columns_follow_store_events_without_rebuilding(store, monkeypatch):
+    today = date.today()
+    store.add_many([("Acme", "https://acme.example/1"), ("Beta", "https://beta.example/1"),
+                    ("acme ", "https://acme.example/2"), ("Gamma", "https://gamma.example/1")])
+    analytics = Analytics(store)
+    analytics.summary(today=today)
+    columns = analytics.columns
+
+    def no_rebuild(*args):
+        raise AssertionError("the columns were rebuilt from the log")
+
+    monkeypatch.setattr(analytics_module, "Columns", no_rebuild)
+    store.set_status(1, "Interview")
+    store.set_status(2, "Rejected")
+    store.add("Delta", "https://delta.example/1", status="Interview")
+    store.edit(4, company="Beta")
+    store.delete(3)
+    store.set_status(1, "Applied")  # Back to Applied, but it did get an interview
+    result = analytics.summary(today=today)
+    assert analytics.columns is columns
+    monkeypatch.undo()
+    assert without_engine(result) == rebuilt(store, today)
+    assert result["total"] == 4
+    assert [stage["count"] for stage in result["funnel"]] == [4, 3, 2, 0]
+    # Gamma's only row was renamed, so it's not listed with no applications
+    assert [company["company"] for company in result["companies"]] == ["Beta", "Acme", "Delta"]
+
+
+def test_summary_picks_up_other_processes_writes(store, tmp_path):
+    today = date.today()
+    store.add("Acme", "https://acme.example/1")
+    analytics = Analytics(store)
+    assert analytics.summary(today=today)["total"] == 1
+    other = LogStore(str(tmp_path / "data_log.csv"), background=False)
+    other.add("Beta", "https://beta.example/1")
+    other.set_status(1, "Interview")
+    result = analytics.summary(today=today)
+    assert result["total"] == 2
+    assert result["current"]["Interview"] == 1
+
+
+def test_summary_is_cached_until_the_log_changes(store):
+    store.add("Acme", "https://acme.example/1")
+    analytics = Analytics(store)
+    first = analytics.summary()
+    assert analytics.summary() is first
+    store.set_status(1, "Accepted")
+    assert analytics.summary()["funnel"][3]["count"] == 1
@@ -0,0 +1,65 @@
+import json
+import os
+
+import pytest
+
+import rapidlogger
+from durable import exclusive_lock
+
+
+@pytest.fixture
+def log(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # rapidlogger.log goes here
+    csv_file = str(tmp_path / "data_log.csv")
+    html_file = str(tmp_path / "data_log.html")
+
+    def run(*argv):
+        return rapidlogger.main(["--csv", csv_file, "--html", html_file] + list(argv))
+    return run
+
+
+def test_add_set_status_and_list_without_a_display(log, tmp_path, capsys):
+    entries = tmp_path / "entries.csv"
+    entries.write_text("Beta,https://beta.example/1,Interview\nGamma,https://gamma.example/1\n")
+    assert log("add", "Acme", "https://acme.example/1") == 0
+    assert log("add", "--file", str(entries)) == 0
+    assert capsys.readouterr().out.splitlines() == ["Added #1: Acme", "Added #2: Beta", "Added #3: Gamma"]
+    assert log("set-status", "3", "Rejected") == 0
+    assert log("list", "--format", "json") == 0
+    listed = json.loads(capsys.readouterr().out)
+    assert [(row["ID"], row["Company Name"], row["Status"]) for row in listed] == \
+        [("3", "Gamma", "Rejected"), ("2", "Beta", "Interview"), ("1", "Acme", "Applied")]
+    assert log("list", "--status", "Interview", "--format", "csv") == 0
+    assert len(capsys.readouterr().out.splitlines()) == 2
+    assert log("stats", "--json") == 0
+    stats = json.loads(capsys.readouterr().out)
+    assert stats["total"] == 3 and stats["statuses"]["Rejected"] == 1
+    # The report is brought up to date at the end of a command that changed the log
+    assert (tmp_path / "data_log.html").exists()
+
+
+def test_unknown_id_and_bad_status_fail(log, capsys):
+    assert log("add", "Acme", "https://acme.example/1") == 0
+    assert log("set-status", "99", "Interview") == 1
+    assert "No entry with ID 99" in capsys.readouterr().err
+    with pytest.raises(SystemExit):
+        log("set-status", "1", "Hired")  # argparse rejects it
+
+
+def test_compact_reports_success(log, capsys):
+    # Enough rows that one delete doesn't set off a background compaction
+    for i in range(10):
+        assert log("add", f"Company {i}", f"https://example.com/{i}") == 0
+    assert log("delete", "1") == 0
+    assert log("compact") == 0
+    assert "Compacted" in capsys.readouterr().out
+
+
+def test_compact_fails_while_another_process_compacts(log, tmp_path, capsys):
+    assert log("add", "Acme", "https://example.com/acme") == 0
+    with exclusive_lock(str(tmp_path / "data_log.compact.lock")) as locked:
+        assert locked
+        assert log("compact") == 1
+    output = capsys.readouterr()
+    assert "Not compacted" in output.err and "Compacted" not in output.out
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
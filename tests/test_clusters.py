@@ -0,0 +1,78 @@
+import random
+import string
+
+from clusters import (MIN_SIMILARITY, TrigramIndex, bounded_distance, cluster_companies, max_distance,
+                      trigrams)
+
+
+def levenshtein(a, b):
+    previous = list(range(len(b) + 1))
+    for i, char in enumerate(a, 1):
+        current = [i]
+        for j, other in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char != other)))
+        previous = current
+    return previous[-1]
+
+
+def typo(rng, name):
+    position = rng.randrange(len(name))
+    letter = rng.choice(string.ascii_lowercase)
+    kind = rng.randrange(3)
+    if kind == 0:
+        return name[:position] + letter + name[position + 1:]
+    if kind == 1:
+        return name[:position] + letter + name[position:]
+    return name[:position] + name[position + 1:]
+
+
+def names(seed, count=300):
+    """Random names, most with a few misspelled copies"""
+    rng = random.Random(seed)
+    result = set()
+    while len(result) < count:
+        name = "".join(rng.choice("abcdefghilmnorst ") for _ in range(rng.randint(3, 16))).strip()
+        if not name:
+            continue
+        result.add(name)
+        for _ in range(rng.randint(0, 3)):
+            result.add(typo(rng, name))
+    return sorted(result)
+
+
+def test_bounded_distance_agrees_with_levenshtein():
+    rng = random.Random(7)
+    words = names(7, 80)
+    for _ in range(3000):
+        a, b = rng.choice(words), rng.choice(words)
+        limit = rng.randint(0, 3)
+        exact = levenshtein(a, b)
+        bounded = bounded_distance(a, b, limit)
+        assert bounded == exact if exact <= limit else bounded == limit + 1, (a, b, limit)
+
+
+def test_prefix_filter_never_misses_a_match():
+    # Every pair passing both the typo and the similarity test has to come
+    # out of candidates(), however few trigrams were indexed
+    for seed in range(3):
+        keys = [key for key in names(seed) if max_distance(key)]
+        index = TrigramIndex(keys)
+        grams = {key: trigrams(key) for key in keys}
+        for key in keys:
+            found = set(index.candidates(key))
+            for other in keys:
+                if other == key:
+                    continue
+                similar = 2 * len(grams[key] & grams[other]) >= \
+                    MIN_SIMILARITY * (len(grams[key]) + len(grams[other]))
+                if similar and levenshtein(key, other) <= min(max_distance(key), max_distance(other)):
+                    assert other in found, (key, other)
+
+
+def test_spellings_of_one_company_are_grouped():
+    groups = cluster_companies({"Google": 5, "google": 2, "Google LLC": 1, "Gogle": 1, "Meta": 3, "Beta": 2,
+                                "Microsoft": 4, "Mircosoft Corp": 1})
+    assert [(group["canonical"], sorted(name["name"] for name in group["names"])) for group in groups] == [
+        ("Google", ["Gogle", "Google", "Google LLC", "google"]),
+        ("Microsoft", ["Microsoft", "Mircosoft Corp"]),
+    ]
@@ -0,0 +1,64 @@
+import os
+
+import pytest
+
+import durable
+from core import LogStore
+from durable import append_durably, atomic_write, recover_tail
+
+
+def test_atomic_write_gives_each_writer_its_own_temp_file(tmp_path):
+    path = str(tmp_path / "report.html")
+    with atomic_write(path) as first:
+        first.write("first")
+        with atomic_write(path) as second:
+            second.write("second, and longer")
+        # The second writer's rename must not have taken the first one's file
+        first.write(" writer")
+    with open(path) as file:
+        assert file.read() == "first writer"
+    assert os.listdir(tmp_path) == ["report.html"]
+
+
+def test_atomic_write_leaves_the_file_alone_on_failure(tmp_path):
+    path = tmp_path / "data.json"
+    path.write_text("old")
+    with pytest.raises(RuntimeError):
+        with atomic_write(str(path)) as file:
+            file.write("new")
+            raise RuntimeError("interrupted")
+    assert path.read_text() == "old"
+    assert os.listdir(tmp_path) == ["data.json"]
+
+
+def test_recover_tail_keeps_a_whole_hand_typed_line(tmp_path):
+    path = str(tmp_path / "log.csv")
+    append_durably(path, b"a,b\r\n")
+    with open(path, "ab") as file:
+        file.write(b"c,d")
+    assert recover_tail(path, complete=lambda line: line.count(b",") == 1) == 0
+    with open(path, "rb") as file:
+        assert file.read() == b"a,b\r\nc,d\r\n"
+
+
+def test_torn_tail_is_moved_aside_once(tmp_path, monkeypatch):
+    path = tmp_path / "data_log.csv"
+    store = LogStore(str(path), background=False)
+    store.initialize()
+    store.add("Whole", "https://example.com/whole")
+    with open(path, "ab") as file:
+        file.write(b"2,19-10,Torn,https://exa")
+    monkeypatch.setattr(durable, "_tails_checked", set())  # As if the process had restarted
+    recovered = LogStore(str(path), background=False)
+    assert [row[2] for row in recovered.read()] == ["Whole"]
+    with open(str(path) + ".torn", "rb") as file:
+        assert file.read() == b"2,19-10,Torn,https://exa\n"
+
+    # Later in the same process, an unterminated line is an append still in
+    # progress: skipped, left in the file, and read once it's finished
+    with open(path, "ab") as file:
+        file.write(b"2,19-10,Half")
+    assert [row[2] for row in recovered.read()] == ["Whole"]
+    with open(path, "ab") as file:
+        file.write(b"way,https://example.com/half,Applied\r\n")
+    assert [row[2] for row in recovered.read()] == ["Halfway", "Whole"]
@@ -0,0 +1,86 @@
+import os
+
+import pytest
+
+from core import LogStore
+from notes import NoteStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = LogStore(str(tmp_path / "data_log.csv"), background=False)
+    store.initialize()
+    for i in range(4):
+        store.add(f"Company {i}", f"https://example.com/{i}", date="18-10")
+    return store
+
+
+def test_old_rows_read_back_padded_with_the_column_default(store):
+    store.add_column("Contact", default="unknown")
+    assert store.get(1)[5] == "unknown"
+    with open(store.csv_file, "rb") as file:
+        before = file.read()
+    assert b"unknown" not in before  # Nothing was rewritten
+    store.edit(2, fields={"Contact": "Jane"})
+    store.add("New", "https://example.com/new")
+    reopened = LogStore(store.csv_file, background=False)
+    assert [row[5] for row in reversed(reopened.read())] == ["unknown", "Jane", "unknown", "unknown", "unknown"]
+    with pytest.raises(ValueError):
+        store.edit(1, fields={"Status": "Accepted"})
+    with pytest.raises(ValueError):
+        store.add_column(" Contact ")  # Already there
+
+
+def test_column_added_by_another_process_is_picked_up(store):
+    other = LogStore(store.csv_file, background=False)
+    assert len(other.get(1)) == 5
+    store.add_column("Contact")
+    assert len(other.get(1)) == 6 and other.schema.columns[-1] == "Contact"
+
+
+def test_notes_are_read_from_their_offsets(store):
+    notes = NoteStore(store)
+    notes.set(1, "first note")
+    notes.set(2, "línea dos\nwith a newline")
+    notes.set(1, "replaced")
+    assert notes.get(1) == "replaced"
+    assert notes.get(2) == "línea dos\nwith a newline"
+    assert notes.get(3) == ""
+    assert notes.set(99, "no such row") is False
+    reloaded = NoteStore(store)
+    assert reloaded.ids() == {"1", "2"} and reloaded.get(2) == "línea dos\nwith a newline"
+
+
+def test_removing_notes_compacts_the_file(store):
+    notes = NoteStore(store)
+    for i in range(1, 5):
+        notes.set(i, f"note {i}" * 20)
+    for i in range(1, 4):
+        notes.set(i, "")
+    assert notes.records == 1
+    with open(notes.path, "rb") as file:
+        assert file.read().count(b"\n") == 1
+    assert NoteStore(store).get(4) == "note 4" * 20
+
+
+def test_note_from_another_process_is_picked_up_mid_write(store):
+    notes, other = NoteStore(store), NoteStore(store)
+    notes.set(1, "mine")
+    other.set(2, "theirs")
+    assert notes.get(2) == "theirs"
+    with open(notes.path, "ab") as file:
+        file.write(b'["3", "still being wri')
+    assert notes.ids() == {"1", "2"}
+    with open(notes.path, "ab") as file:
+        file.write(b'tten"]\n')
+    assert notes.get(3) == "still being written"
+    assert os.path.getsize(notes.path) == notes.offsets["3"][0] + notes.offsets["3"][1]
+
+
+def test_schema_add_never_overwrites_another_process_column(store):
+    other = LogStore(store.csv_file, background=False)
+    store.schema.add("Contact")
+    with pytest.raises(ValueError):
+        other.schema.add("Salary")  # Its copy of the schema predates Contact
+    assert other.schema.columns[5:] == ["Contact"]
+    assert other.add_column("Salary")[5:] == ["Contact", "Salary"]
@@ -0,0 +1,70 @@
+import os
+import subprocess
+import sys
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from core import LogStore, resolve_date
+from reminders import Reminders
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = LogStore(str(tmp_path / "data_log.csv"), background=False)
+    store.initialize()
+    return store
+
+
+def days_ago(days):
+    return (date.today() - timedelta(days=days)).strftime("%d-%m")
+
+
+def test_importing_reminders_leaves_analytics_unloaded():
+    # Reminders are scheduled at window startup, which mustn't pay for analytics (or numpy)
+    code = "import sys, reminders; print('analytics' in sys.modules)"
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True, cwd=root)
+    assert result.stdout.strip() == "False"
+
+
+def test_resolve_date_never_lands_in_the_future():
+    today = date(2026, 3, 1)
+    assert resolve_date("28-02", today) == date(2026, 2, 28)
+    assert resolve_date("02-03", today) == date(2025, 3, 2)
+    assert resolve_date("29-02", date(2026, 3, 1)) == date(2026, 2, 28)
+
+
+def test_reminder_comes_due_after_its_rule(store):
+    store.add("Old", "https://example.com/old", date=days_ago(10))
+    store.add("New", "https://example.com/new", date=days_ago(1))
+    reminders = Reminders(store)
+    due = reminders.pop_due()
+    assert [reminder["company"] for reminder in due] == ["Old"]
+    # Shown once, it's snoozed rather than shown again right away
+    assert reminders.pop_due() == []
+    assert reminders.pop_due(datetime.now() + timedelta(days=2))[0]["company"] == "Old"
+
+
+def test_status_change_and_delete_invalidate_heap_entries(store):
+    store.add("Changed", "https://example.com/changed", date=days_ago(10))
+    store.add("Deleted", "https://example.com/deleted", date=days_ago(10))
+    store.add("Accepted", "https://example.com/accepted", date=days_ago(10))
+    reminders = Reminders(store)
+    assert reminders.next_due() is not None
+    store.set_status(1, "Interview")  # A fresh reminder, three days from now
+    store.delete(2)
+    store.set_status(3, "Accepted")  # No rule, no reminder
+    assert reminders.pop_due() == []
+    later = reminders.pop_due(datetime.now() + timedelta(days=4))
+    assert [(reminder["company"], reminder["status"]) for reminder in later] == [("Changed", "Interview")]
+
+
+def test_dismissed_reminder_stays_away_until_the_status_changes(store):
+    store.add("Acme", "https://example.com/acme", date=days_ago(10))
+    reminders = Reminders(store)
+    reminders.dismiss(1)
+    assert reminders.pop_due(datetime.now() + timedelta(days=30)) == []
+    assert Reminders(store).pending() == []  # Remembered across restarts
+    store.set_status(1, "Interview")
+    assert Reminders(store).pending()[0]["status"] == "Interview"
@@ -0,0 +1,46 @@
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+import render
+from core import HEADER
+
+
+@pytest.fixture
+def rows():
+    return [[str(i), "18-10", f"Company <{i}>", f"https://example.com/{i}", "Applied"] for i in range(1, 101)]
+
+
+@pytest.fixture
+def small_shards(monkeypatch):
+    monkeypatch.setattr(render, "SHARD_SIZE", 7)
+    monkeypatch.setattr(render, "PARALLEL_MIN_ROWS", 10)
+    yield
+    render._shutdown_pool()
+
+
+def test_parallel_render_matches_in_process(rows, small_shards):
+    tags = {"3": ["remote"], "50": ["referral", "priority"]}
+    in_process = "".join(render.render_body(rows, workers=1, tags=tags))
+    assert "".join(render.render_body(rows, workers=2, tags=tags)) == in_process
+    assert in_process.count("<tr ") == 100 and "Company &lt;3&gt;" in in_process
+    assert 'data-tags="remote"' in in_process
+
+
+def test_broken_pool_falls_back_in_process_without_losing_shards(rows, small_shards, monkeypatch):
+    class DyingPool:
+        def map(self, function, *iterables):
+            for count, args in enumerate(zip(*iterables)):
+                if count == 3:
+                    raise BrokenProcessPool("worker died")
+                yield function(*args)
+
+    monkeypatch.setattr(render, "_get_pool", lambda workers=None: DyingPool())
+    assert "".join(render.render_body(rows, workers=2)) == "".join(render.render_body(rows, workers=1))
+
+
+def test_written_report_matches_rendered_page(rows, tmp_path, small_shards):
+    path = tmp_path / "data_log.html"
+    render.write_html(str(path), HEADER, rows, workers=1)
+    assert path.read_text(encoding='utf-8') == render.render_html(HEADER, rows, workers=1)
+    assert [name for name in path.parent.iterdir() if name.suffix == ".tmp"] == []
@@ -0,0 +1,70 @@
+import threading
+import time
+
+from core import RapidLoggerCore, RenderScheduler
+
+
+class Renders:
+    """A render callback that counts its calls and lets a test wait for them"""
+
+    def __init__(self):
+        self.count = 0
+        self.condition = threading.Condition()
+
+    def __call__(self):
+        with self.condition:
+            self.count += 1
+            self.condition.notify_all()
+
+    def wait_for(self, count, timeout=5):
+        with self.condition:
+            return self.condition.wait_for(lambda: self.count >= count, timeout)
+
+
+def test_burst_of_writes_costs_two_renders():
+    renders = Renders()
+    scheduler = RenderScheduler(renders, interval=0.3)
+    scheduler.mark_dirty()
+    assert renders.wait_for(1)  # The first one after a quiet spell starts right away
+    for _ in range(50):
+        scheduler.mark_dirty()
+    assert renders.count == 1
+    assert renders.wait_for(2)  # The rest coalesce into one at the end of the interval
+    time.sleep(0.4)
+    assert renders.count == 2
+
+
+def test_flush_renders_a_pending_change_once():
+    renders = Renders()
+    scheduler = RenderScheduler(renders, interval=60)
+    scheduler.last_run = time.monotonic()  # As if it had just rendered
+    scheduler.mark_dirty()
+    scheduler.mark_dirty()
+    scheduler.flush()
+    assert renders.count == 1 and scheduler.timer is None
+    scheduler.flush()
+    assert renders.count == 1  # Nothing pending
+    scheduler.flush(force=True)
+    assert renders.count == 2
+
+
+def test_zero_interval_renders_inline():
+    renders = Renders()
+    scheduler = RenderScheduler(renders, interval=0)
+    for _ in range(3):
+        scheduler.mark_dirty()
+    assert renders.count == 3
+
+
+def test_report_showing_the_log_is_not_rendered_again(tmp_path):
+    csv_file, html_file = str(tmp_path / "data_log.csv"), str(tmp_path / "data_log.html")
+    core = RapidLoggerCore(csv_file, html_file, render_interval=0)
+    core.initialize_files()
+    core.add_entry("Acme", "https://acme.example/1")
+    core.flush_report(force=True)
+    written = (tmp_path / "data_log.html").stat().st_mtime_ns
+    # Another process with the same log sees the report is current
+    RapidLoggerCore(csv_file, html_file, render_interval=0).flush_report(force=True)
+    assert (tmp_path / "data_log.html").stat().st_mtime_ns == written
+    core.update_status(1, "Interview")
+    assert 'value="Interview" selected' in (tmp_path / "data_log.html").read_text(encoding='utf-8')
@@ -0,0 +1,174 @@
+import asyncio
+import gzip
+import http.client
+import json
+import os
+import socket
+
+import pytest
+
+from core import ProfileRegistry, RapidLoggerCore
+from render import ASSET_VERSION, ASSETS
+from server import AsyncServer
+
+
+@pytest.fixture
+def server(tmp_path):
+    core = RapidLoggerCore(str(tmp_path / "data_log.csv"), str(tmp_path / "data_log.html"), render_interval=0)
+    core.initialize_files()
+    registry = ProfileRegistry(core, root_dir=str(tmp_path / "profiles"), render_interval=0)
+    server = AsyncServer(registry, 'localhost', 0)
+    thread = server.start_in_thread()
+    server.port = server.server.sockets[0].getsockname()[1]
+    yield server
+
+    async def shut_down():
+        server.server.close()
+        tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    asyncio.run_coroutine_threadsafe(shut_down(), server.loop).result(5)
+    server.loop.call_soon_threadsafe(server.loop.stop)
+    thread.join(5)
+    server.loop.close()
+
+
+def post(connection, path, data):
+    connection.request('POST', path, json.dumps(data), {'Content-Type': 'application/json'})
+    response = connection.getresponse()
+    return response.status, json.loads(response.read())
+
+
+def read_event(stream):
+    """The next `event:`/`data:` block of a server-sent-events stream"""
+    fields = {}
+    for line in stream:
+        line = line.decode('utf-8').rstrip('\r\n')
+        if not line:
+            if 'event' in fields:
+                return fields['event'], json.loads(fields['data'])
+            fields = {}
+        elif not line.startswith(':'):
+            name, _, value = line.partition(': ')
+            fields[name] = value
+    raise AssertionError("the event stream ended")
+
+
+def subscribe(server, path='/events'):
+    sock = socket.create_connection(('localhost', server.port), timeout=5)
+    sock.sendall(f"GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode('latin-1'))
+    stream = sock.makefile('rb')
+    assert stream.readline().startswith(b"HTTP/1.1 200")
+    while stream.readline() not in (b'\r\n', b''):
+        pass
+    assert stream.readline() == b"retry: 3000\n"
+    stream.readline()
+    return sock, stream
+
+
+def test_requests_share_one_keep_alive_connection(server):
+    server.registry.default.add_entry("Acme", "https://acme.example/1")
+    connection = http.client.HTTPConnection('localhost', server.port, timeout=5)
+    assert post(connection, '/update_status', {'id': 1, 'status': 'Interview'}) == (200, {'success': True})
+    sock = connection.sock
+    assert post(connection, '/update_status', {'id': 99, 'status': 'Interview'}) == (200, {'success': False})
+    assert connection.sock is sock
+    connection.request('POST', '/update_status', '[1, 2]')
+    response = connection.getresponse()
+    assert response.status == 400
+    response.read()
+    connection.request('GET', '/nowhere')
+    assert connection.getresponse().status == 404
+    assert server.registry.default.store.get(1)[4] == "Interview"
+
+
+def test_event_stream_pushes_inserts_and_status_changes(server):
+    sock, stream = subscribe(server)
+    try:
+        core = server.registry.default
+        core.add_entry("Acme", "https://acme.example/1")
+        event, data = read_event(stream)
+        assert event == 'insert'
+        assert data['row'][2] == "Acme" and "acme.example" in data['html']
+        assert data['stats']['total'] == 1
+        connection = http.client.HTTPConnection('localhost', server.port, timeout=5)
+        post(connection, '/update_status', {'id': 1, 'status': 'Rejected'})
+        event, data = read_event(stream)
+        assert event == 'status'
+        assert (data['id'], data['old'], data['status']) == ("1", "Applied", "Rejected")
+    finally:
+        sock.close()
+
+
+def test_profiles_are_routed_by_prefix(server):
+    alice = server.registry.get("alice", create=True)
+    alice.add_entry("Alice Corp", "https://alice.example/1")
+    server.registry.default.add_entry("Default Corp", "https://default.example/1")
+    sock, stream = subscribe(server, '/p/alice/events')
+    try:
+        connection = http.client.HTTPConnection('localhost', server.port, timeout=5)
+        assert post(connection, '/update_status', {'id': 1, 'status': 'Rejected'})[0] == 200
+        assert post(connection, '/p/alice/update_status', {'id': 1, 'status': 'Interview'})[0] == 200
+        # Only alice's change reaches alice's stream
+        event, data = read_event(stream)
+        assert (event, data['status']) == ('status', "Interview")
+        assert alice.store.get(1)[4] == "Interview"
+        assert server.registry.default.store.get(1)[4] == "Rejected"
+        for path in ('/p/bob/analytics', '/p/not%20a%20name/analytics'):
+            connection.request('GET', path)
+            response = connection.getresponse()
+            response.read()
+            assert response.status == 404
+        assert not os.path.exists(os.path.join(server.registry.root_dir, "bob"))  # Not created by asking
+    finally:
+        sock.close()
+
+
+def get(connection, path, headers=None):
+    connection.request('GET', path, headers=headers or {})
+    response = connection.getresponse()
+    return response, response.read()
+
+
+def test_report_is_304_until_the_log_changes(server):
+    server.registry.default.add_entry("Acme", "https://acme.example/1")
+    connection = http.client.HTTPConnection('localhost', server.port, timeout=5)
+    response, body = get(connection, '/')
+    assert response.status == 200 and b"Acme" in body
+    etag = response.getheader('ETag')
+    response, body = get(connection, '/', {'If-None-Match': etag})
+    assert (response.status, body) == (304, b'')
+    server.registry.default.update_status(1, "Interview")
+    response, body = get(connection, '/', {'If-None-Match': etag})
+    assert response.status == 200 and response.getheader('ETag') != etag
+    for path in ('/analytics', '/companies'):
+        response, body = get(connection, path)
+        response, again = get(connection, path, {'If-None-Match': response.getheader('ETag')})
+        assert response.status == 304
+
+
+def test_responses_are_gzipped_for_clients_that_accept_it(server):
+    core = server.registry.default
+    for i in range(30):
+        core.add_entry(f"Company {i}", f"https://example.com/{i}")
+    connection = http.client.HTTPConnection('localhost', server.port, timeout=5)
+    plain = get(connection, '/')[1]
+    response, body = get(connection, '/', {'Accept-Encoding': 'gzip'})
+    assert response.getheader('Content-Encoding') == 'gzip'
+    assert gzip.decompress(body) == plain
+    # The same version comes from the compressed cache
+    assert get(connection, '/', {'Accept-Encoding': 'gzip'})[1] == body
+
+
+def test_assets_are_cached_for_good(server):
+    connection = http.client.HTTPConnection('localhost', server.port, timeout=5)
+    response, body = get(connection, '/assets/report.css', {'Accept-Encoding': 'gzip'})
+    assert response.status == 200
+    assert 'immutable' in response.getheader('Cache-Control')
+    assert gzip.decompress(body) == ASSETS['/assets/report.css'][1]
+    response, body = get(connection, '/assets/report.css', {'If-None-Match': f'"{ASSET_VERSION}"'})
+    assert (response.status, body) == (304, b'')
+    # The page links the assets by version, so a new build gets fetched afresh
+    assert f"/assets/report.css?v={ASSET_VERSION}".encode() in get(connection, '/')[1]
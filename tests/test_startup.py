@@ -0,0 +1,38 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_importing_rapidlogger_defers_the_heavy_modules():
+    # The window is drawn before the server and the report code are loaded
+    code = ("import sys, rapidlogger; print(sorted(m for m in ('tkinter', 'http.server', 'webbrowser', "
+            "'asyncio', 'server', 'render', 'analytics') if m in sys.modules))")
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True, cwd=ROOT)
+    assert result.stdout.strip() == "[]"
+
+
+def test_startup_timer_reports_once_every_phase_is_done(capsys):
+    gui = pytest.importorskip("gui")  # Needs tkinter
+    timer = gui.StartupTimer(enabled=True)
+    timer.mark("tk root")
+    timer.done("first frame")
+    assert capsys.readouterr().out == ""
+    timer.mark("server bound")
+    timer.done("background")
+    report = capsys.readouterr().out.splitlines()
+    assert report[0].startswith("Startup timing")
+    assert len(report) == 3
+    assert report[1].endswith("tk root [MainThread]") and report[2].endswith("server bound [MainThread]")
+
+
+def test_startup_timer_is_silent_when_off(capsys):
+    gui = pytest.importorskip("gui")
+    timer = gui.StartupTimer()
+    timer.mark("tk root")
+    timer.done("first frame")
+    timer.done("background")
+    assert timer.marks == [] and capsys.readouterr().out == ""
@@ -0,0 +1,139 @@
+import json
+import os
+from datetime import datetime
+
+import pytest
+
+import core
+from core import LogStore
+
+TODAY = datetime(2026, 10, 19)
+
+
+def open_store(path, **kwargs):
+    """A store on path as a freshly started process would open it"""
+    return LogStore(str(path), background=False, **kwargs)
+
+
+def state(store):
+    return store.read(), store.stats(TODAY), store.next_id, store.companies()
+
+
+@pytest.fixture
+def csv_file(tmp_path):
+    store = open_store(tmp_path / "data_log.csv")
+    store.initialize()
+    for i in range(20):
+        store.add(f"Company {i % 7}", f"https://example.com/{i}", date="18-10")
+    store.set_status(3, "Interview")
+    store.set_status(5, "Rejected")
+    store.edit(4, company="Renamed", link="https://example.com/renamed")
+    store.delete(6)
+    store.set_status(4, "Accepted")
+    store.save_snapshot()
+    return tmp_path / "data_log.csv"
+
+
+def test_snapshot_load_matches_rebuild(csv_file):
+    loaded = open_store(csv_file)
+    loaded._ensure_loaded()
+    assert loaded.rows == {}, "rows should be read lazily after a snapshot load"
+    os.remove(loaded.snapshot_file)
+    rebuilt = open_store(csv_file)
+    assert state(loaded) == state(rebuilt)
+    assert loaded.get(4)[1:5] == ["18-10", "Renamed", "https://example.com/renamed", "Accepted"]
+
+
+def test_snapshot_catches_up_on_appends(csv_file):
+    open_store(csv_file).add("Later", "https://example.com/later")
+    loaded = open_store(csv_file)
+    assert loaded.read()[0][2] == "Later"
+    os.remove(loaded.snapshot_file)
+    assert state(loaded) == state(open_store(csv_file))
+
+
+def test_delete_compact_keeps_ids_unused(csv_file):
+    store = open_store(csv_file)
+    store.delete(20)
+    store.delete(19)
+    assert store.compact()
+    assert open_store(csv_file).add("Next", "https://example.com/next")[0] == "21"
+
+
+def test_append_from_another_process_during_compaction(csv_file, monkeypatch):
+    store = open_store(csv_file)
+    # Stands in for a second process: own lock, own index; it mustn't compact
+    # itself, which would rightly make this compaction give up
+    other = open_store(csv_file, compact_ratio=1.0)
+    other._ensure_loaded()
+    fsync_file = core.fsync_file
+    calls = []
+
+    def fsync_then_append(file):
+        fsync_file(file)
+        if not calls:
+            # The new CSV has been written; the other process carries on
+            calls.append(other.compact())  # Has to wait its turn
+            other.add("Meanwhile", "https://example.com/meanwhile")
+            other.edit(1, company="Edited meanwhile")
+            other.delete(2)
+            other.set_status(7, "Interview")
+
+    monkeypatch.setattr(core, "fsync_file", fsync_then_append)
+    assert store.compact()
+    monkeypatch.undo()
+    assert calls == [False]
+    for reader in (store, open_store(csv_file)):
+        assert reader.read()[0][2] == "Meanwhile"
+        assert reader.get(1)[2] == "Edited meanwhile"
+        assert reader.get(2) is None
+        assert reader.get(7)[4] == "Interview"
+    assert sorted(os.listdir(csv_file.parent)) == sorted(
+        ["data_log.csv", "data_log.journal.csv", "data_log.events.csv", "data_log.checkpoint.json",
+         "data_log.snapshot.json", "data_log.compact.lock"])
+    os.remove(store.snapshot_file)
+    assert state(store) == state(open_store(csv_file))
+
+
+def test_status_history_is_kept_through_compaction(tmp_path):
+    store = open_store(tmp_path / "data_log.csv")
+    store.initialize()
+    store.add("Acme", "https://example.com/acme")
+    store.set_status(1, "Interview")
+    store.set_status(1, "Rejected")
+    assert [(event["old"], event["status"]) for event in store.history(1)] == \
+        [("Applied", "Interview"), ("Interview", "Rejected")]
+    assert store.stats(TODAY)["statuses"]["Rejected"] == 1
+    assert store.compact()
+    # The events are folded into the CSV, but the event log itself is never rewritten
+    store.set_status(1, "Accepted")
+    reopened = open_store(tmp_path / "data_log.csv")
+    assert [event["status"] for event in reopened.history(1)] == ["Interview", "Rejected", "Accepted"]
+    assert reopened.get(1)[4] == "Accepted"
+    assert reopened.stats(TODAY)["statuses"] == {"Applied": 0, "Interview": 0, "Accepted": 1, "Rejected": 0}
+
+
+@pytest.mark.parametrize("damage", ["garbage", "old format", "rewritten log"])
+def test_unusable_snapshot_is_rebuilt(csv_file, damage):
+    expected = state(open_store(csv_file))
+    snapshot = str(csv_file.parent / "data_log.snapshot.json")
+    if damage == "garbage":
+        with open(snapshot, 'w') as file:
+            file.write('{"format": ')
+    elif damage == "old format":
+        with open(snapshot) as file:
+            data = json.load(file)
+        data['format'] -= 1
+        with open(snapshot, 'w') as file:
+            json.dump(data, file)
+    else:
+        # Compacted by a process that didn't write a snapshot afterwards
+        with open(snapshot) as file:
+            old = file.read()
+        assert open_store(csv_file).compact()
+        with open(snapshot, 'w') as file:
+            file.write(old)
+    loaded = open_store(csv_file)
+    loaded._ensure_loaded()
+    assert len(loaded.rows) == len(loaded.index), "should have rebuilt from the log"
+    assert state(loaded) == expected
@@ -0,0 +1,115 @@
+import json
+import os
+import shutil
+
+import pytest
+
+from core import LogStore
+from sync import SyncState, sync_stores
+
+
+def rows(store):
+    return sorted((row[2], row[3], row[4]) for row in store.read())
+
+
+@pytest.fixture
+def copies(tmp_path):
+    """Two copies of one log, synced once so both have their stamps"""
+    (tmp_path / "a").mkdir()
+    (tmp_path / "b").mkdir()
+    local = LogStore(str(tmp_path / "a" / "data_log.csv"), background=False)
+    local.initialize()
+    for i in range(1, 6):
+        local.add(f"Company {i}", f"https://example.com/{i}", date="18-10")
+    shutil.copy(local.csv_file, tmp_path / "b" / "data_log.csv")
+    remote = LogStore(str(tmp_path / "b" / "data_log.csv"), background=False)
+    assert sync_stores(local, remote)[:2] == (0, 0)
+    return local, remote
+
+
+def test_edit_and_status_change_on_different_copies_both_survive(copies):
+    local, remote = copies
+    local.edit(1, company="Renamed")
+    remote.set_status(1, "Interview")
+    sync_stores(local, remote)
+    assert local.get(1)[2:5] == remote.get(1)[2:5] == ["Renamed", "https://example.com/1", "Interview"]
+
+
+def test_conflicting_changes_settle_on_one_winner(copies):
+    local, remote = copies
+    local.set_status(2, "Accepted")
+    remote.set_status(2, "Rejected")
+    local.edit(3, link="https://local.example.com")
+    remote.edit(3, link="https://remote.example.com")
+    sync_stores(local, remote)
+    assert rows(local) == rows(remote)
+    assert sync_stores(local, remote) == (0, 0, 0)
+
+
+def test_deletes_and_inserts_cross_over(copies):
+    local, remote = copies
+    local.delete(4)
+    remote.add("Only remote", "https://example.com/remote")
+    local.add("Only local", "https://example.com/local")
+    assert sync_stores(local, remote)[:2] == (1, 2)
+    assert rows(local) == rows(remote)
+    assert {row[0] for row in rows(local)} == {"Company 1", "Company 2", "Company 3", "Company 5",
+                                               "Only remote", "Only local"}
+    assert sync_stores(local, remote) == (0, 0, 0)
+
+
+def test_delete_wins_only_over_older_changes(copies):
+    # Stamps come from Lamport clocks that both copies left equal at the last
+    # sync, and each change since ticks its copy's clock once
+    local, remote = copies
+    local.edit(1, company="First")
+    local.edit(2, company="Second")
+    local.delete(5)  # Stamped after both edits
+    remote.set_status(5, "Interview")  # The first change on this copy
+    sync_stores(local, remote)
+    assert local.get(5) is None and remote.get(5) is None
+
+    local.delete(4)
+    remote.edit(4, company="Edited")
+    remote.set_status(4, "Interview")  # Newer than the delete
+    sync_stores(local, remote)
+    assert rows(local) == rows(remote)
+    assert ("Edited", "https://example.com/4", "Interview") in rows(local)
+
+
+def test_sync_with_nothing_changed_leaves_the_stamps_alone(copies, monkeypatch):
+    local, remote = copies
+    saved = {state: os.path.getmtime(state) for state in
+             (SyncState(local).path, SyncState(remote).path)}
+
+    def no_full_read(*args):
+        raise AssertionError("every row was read")
+
+    monkeypatch.setattr(SyncState, "rows", property(no_full_read))
+    assert sync_stores(local, remote) == (0, 0, 0)
+    assert {state: os.path.getmtime(state) for state in saved} == saved
+
+
+def test_changes_are_picked_up_from_another_process_and_after_compaction(copies):
+    local, remote = copies
+    LogStore(local.csv_file, background=False).set_status(1, "Interview")
+    assert sync_stores(local, remote)[:2] == (0, 1)
+    # A compaction rewrites the files, so the next refresh compares every row
+    remote.edit(2, company="Before compacting")
+    assert remote.compact()
+    assert sync_stores(local, remote)[:2] == (1, 0)
+    assert rows(local) == rows(remote)
+    assert sync_stores(local, remote) == (0, 0, 0)
+
+
+def test_stamps_written_before_incremental_refreshes_still_load(copies):
+    local, remote = copies
+    for store in (local, remote):
+        state = SyncState(store)
+        data = {'node': state.node, 'clock': state.clock, 'rows': state.rows}
+        with open(state.path, 'w', encoding='utf-8') as file:
+            json.dump(data, file)
+    assert sync_stores(local, remote) == (0, 0, 0)
+    local.edit(1, company="Renamed")
+    assert sync_stores(local, remote)[:2] == (0, 1)
+    assert rows(local) == rows(remote)
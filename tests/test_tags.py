@@ -0,0 +1,94 @@
+import random
+
+import pytest
+
+from bitmaps import Bitmap
+from core import LogStore
+from tags import TagStore, parse_tags
+
+# IDs on both sides of several 65536-wide chunk boundaries
+IDS = [0, 1, 65535, 65536, 65537, 131071, 131072, 10 ** 6]
+
+
+def test_bitmap_set_operations_match_python_sets():
+    rng = random.Random(3)
+    for _ in range(50):
+        a = {rng.choice(IDS) + rng.randrange(3) for _ in range(rng.randrange(12))}
+        b = {rng.choice(IDS) + rng.randrange(3) for _ in range(rng.randrange(12))}
+        left, right = Bitmap(a), Bitmap(b)
+        assert list(left & right) == sorted(a & b)
+        assert list(left | right) == sorted(a | b)
+        assert list(left - right) == sorted(a - b)
+        assert list(Bitmap.union([left, right, Bitmap()])) == sorted(a | b)
+        assert list(reversed(left)) == sorted(a, reverse=True)
+        assert len(left) == len(a) and bool(left) == bool(a)
+        assert Bitmap.from_state(left.to_state()) == left
+
+
+def test_bitmap_drops_chunks_that_empty_out():
+    bitmap = Bitmap([65536, 65537])
+    bitmap.discard(65536)
+    assert 65537 in bitmap and 65536 not in bitmap
+    bitmap.discard(65537)
+    assert not bitmap and bitmap.chunks == {}
+    assert (Bitmap([1]) & Bitmap([65537])).chunks == {}
+
+
+def test_parse_tags():
+    assert parse_tags("Remote, referral;remote  Onsite") == ["onsite", "referral", "remote"]
+    with pytest.raises(ValueError):
+        parse_tags("no/slashes")
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = LogStore(str(tmp_path / "data_log.csv"), background=False)
+    store.initialize()
+    for i in range(6):
+        store.add(f"Company {i}", f"https://example.com/{i}", date="18-10")
+    return store
+
+
+def test_filters_combine_tags_and_statuses(store):
+    tags = TagStore(store)
+    tags.set_tags(1, "remote, referral")
+    tags.set_tags(2, "remote")
+    tags.set_tags(3, "referral")
+    store.set_status(2, "Interview")
+    assert list(tags.filter(tags=["remote"])) == [1, 2]
+    assert list(tags.filter(tags=["remote", "referral"])) == [1]
+    assert list(tags.filter(any_tags=["remote", "referral"], statuses=["Applied"])) == [1, 3]
+    store.delete(1)
+    assert list(tags.filter(tags=["remote"])) == [2]
+    assert tags.counts() == {"referral": 1, "remote": 1}
+
+
+def test_tags_written_by_another_process_are_picked_up(store):
+    tags, other = TagStore(store), TagStore(store)
+    tags.set_tags(1, "remote")
+    assert other.tags_of(1) == ["remote"]
+    other.set_tags(1, "onsite")
+    assert tags.tags_of(1) == ["onsite"]
+
+
+def test_compaction_keeps_the_latest_tags(store):
+    tags = TagStore(store)
+    for i in range(10):
+        tags.set_tags(1, f"round-{i}")
+    assert tags.records < 10  # Rewritten along the way
+    assert TagStore(store).mapping() == {"1": ["round-9"]}
+
+
+def test_compaction_is_dropped_if_another_process_wrote_meanwhile(store):
+    tags, other = TagStore(store), TagStore(store)
+    tags.set_tags(1, "remote")
+    tags._ensure_loaded()
+    write = tags.file.rewrite
+
+    def rewrite_after_other_write(*args, **kwargs):
+        other.set_tags(2, "referral")
+        return write(*args, **kwargs)
+
+    tags.file.rewrite = rewrite_after_other_write
+    tags._compact()
+    assert TagStore(store).mapping() == {"1": ["remote"], "2": ["referral"]}